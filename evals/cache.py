@@ -0,0 +1,257 @@
+# SPDX-FileCopyrightText: 2023-2025 Austrian Gas Grid Management AG
+#
+# SPDX-License-Identifier: MIT
+# For license information, see the LICENSE.txt file in the project root.
+"""Persist statistics on disk to reuse them across evaluation runs."""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUBDIRECTORY = "cache/statistics"
+_META = "_statistics_cache"
+
+
+def get_cache_directory(result_path: str | Path | list) -> Path:
+    """
+    Return the statistics cache directory for a result folder.
+
+    Parameters
+    ----------
+    result_path
+        The path to the run results folder, or a list of network
+        file paths as passed by snakemake. The networks are expected
+        to be located in a subdirectory of the results folder.
+
+    Returns
+    -------
+    :
+        The path to the cache directory inside the results folder.
+    """
+    if isinstance(result_path, list):
+        result_path = Path(result_path[0]).parent.parent
+    return Path(result_path) / CACHE_SUBDIRECTORY
+
+
+def _normalise(value: object) -> object:
+    """
+    Convert keyword argument values to JSON serialisable objects.
+
+    Sets are sorted to produce the same key regardless of the
+    iteration order. Other unknown objects use their string
+    representation.
+
+    Parameters
+    ----------
+    value
+        A keyword argument value that json cannot serialise.
+
+    Returns
+    -------
+    :
+        A JSON serialisable representation of the value.
+    """
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=str)
+    if isinstance(value, pd.Index):
+        return value.tolist()
+    return str(value)
+
+
+class StatisticsCache:
+    """
+    A content-addressed on-disk cache for network statistics.
+
+    Statistics are stored as Parquet files. The file name is a hash
+    of the network file content, the statistic name and the
+    normalised keyword arguments. Hence, a modified network file
+    automatically misses the cache. Changes to the statistic
+    implementations do not, i.e. the cache must be cleared
+    explicitly after updating statistic functions.
+
+    The cache is bounded by size. The least recently used entries are
+    removed first if the total size exceeds the limit.
+
+    Parameters
+    ----------
+    directory
+        The directory to store Parquet files in.
+    max_size
+        The maximum cache size in megabytes.
+    """
+
+    def __init__(self, directory: str | Path, max_size: int = 2048) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._file_hashes = {}
+
+    def file_hash(self, file_path: str | Path) -> str:
+        """
+        Return the content hash of a network file.
+
+        The hash is memoized for the file size and modification time,
+        i.e. every file is read at most once per session.
+
+        Parameters
+        ----------
+        file_path
+            The path to the network file.
+
+        Returns
+        -------
+        :
+            The hexadecimal file hash.
+        """
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        memo_key = (file_path, stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._file_hashes:
+            digest = hashlib.blake2b(digest_size=16)
+            with file_path.open("rb") as fh:
+                while chunk := fh.read(2**20):
+                    digest.update(chunk)
+            self._file_hashes[memo_key] = digest.hexdigest()
+        return self._file_hashes[memo_key]
+
+    def key(self, file_path: str | Path, statistic: str, kwargs: dict) -> str:
+        """
+        Build the cache key for a statistic.
+
+        Parameters
+        ----------
+        file_path
+            The path to the network file.
+        statistic
+            The name of the statistic.
+        kwargs
+            The keyword arguments passed to the statistic function.
+
+        Returns
+        -------
+        :
+            The cache key, which is also the file stem.
+        """
+        identity = json.dumps(
+            [self.file_hash(file_path), statistic, kwargs],
+            sort_keys=True,
+            default=_normalise,
+        )
+        return hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    def get(self, key: str) -> pd.DataFrame | pd.Series | None:
+        """
+        Return a cached statistic.
+
+        Parameters
+        ----------
+        key
+            The cache key returned by the key() method.
+
+        Returns
+        -------
+        :
+            The statistic in the same format it was stored or None
+            if the key is not cached.
+        """
+        file_path = self._path(key)
+        try:
+            df = pd.read_parquet(file_path)
+            os.utime(file_path)  # mark as recently used
+        except FileNotFoundError:  # unknown or evicted by another process
+            return None
+        meta = df.attrs.pop(_META)
+        attrs = df.attrs
+
+        if meta["datetime_columns"]:
+            df.columns = pd.DatetimeIndex(df.columns, name=df.columns.name)
+        if meta["series"]:
+            df = df.iloc[:, 0].rename(meta["name"])
+            df.attrs = attrs
+
+        return df
+
+    def put(self, key: str, statistic: pd.DataFrame | pd.Series) -> None:
+        """
+        Store a statistic in the cache.
+
+        Statistics that cannot be encoded to Parquet are skipped
+        silently, because the cache is optional.
+
+        Parameters
+        ----------
+        key
+            The cache key returned by the key() method.
+        statistic
+            The statistic to store.
+        """
+        is_series = isinstance(statistic, pd.Series)
+        df = statistic.to_frame("value") if is_series else statistic.copy()
+        datetime_columns = isinstance(df.columns, pd.DatetimeIndex)
+        if datetime_columns:
+            df.columns = df.columns.astype(str)
+
+        df.attrs = dict(statistic.attrs)
+        df.attrs[_META] = {
+            "series": is_series,
+            "name": statistic.name if is_series else None,
+            "datetime_columns": datetime_columns,
+        }
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, because parallel evaluations
+        # may store the same statistic at the same time
+        tmp_path = self.directory / f"{key}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path)
+        except (ValueError, TypeError, ImportError) as e:
+            logger.debug(f"Skip caching statistic {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        os.replace(tmp_path, self._path(key))
+
+        self.evict()
+
+    def size(self) -> int:
+        """Return the total cache size in bytes."""
+        return sum(p.stat().st_size for p in self.directory.glob("*.parquet"))
+
+    def evict(self) -> None:
+        """Remove least recently used files until the size limit holds."""
+        files = []
+        for file_path in self.directory.glob("*.parquet"):
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, file_path))
+
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        limit = self.max_size * 2**20
+        while files and total > limit:
+            _, size, file_path = files.pop(0)
+            total -= size
+            file_path.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """
+        Remove all cached statistics.
+
+        Returns
+        -------
+        :
+            The number of removed files.
+        """
+        files = list(self.directory.glob("*.parquet"))
+        for file_path in files:
+            file_path.unlink()
+        return len(files)
@@ -5,35 +5,58 @@
 """
 Command Line Interface to run evaluations.
 
-Commands may be run from anywhere as long as the virtual environment is
-activated and the esmtools project is installed.
+Commands are run from the project root with the virtual environment
+activated.
 
 Examples
 --------
 ``` shell
 # run a single evaluation by name
-run_eval "/opt/data/esm/results" -n "eval_capacity_factor"
+python -m evals.cli run_eval "/opt/data/esm/results" -n "eval_capacity_factor"
 ```
 
 ``` shell
 # run multiple evaluations by name
-run_eval "/opt/data/esm/results" -n "eval_capacity_factor" -n "eval_transmission_grid"
+python -m evals.cli run_eval "/opt/data/esm/results" -n "eval_capacity_factor" -n "eval_transmission_grid"
 ```
 
 ``` shell
 # run all evaluations
-run_eval "/opt/data/esm/results"
+python -m evals.cli run_eval "/opt/data/esm/results"
 ```
 
 ``` shell
-# run evaluations as a script and from project root without installing the package
-(but with your virtual env activated of course)
-(pypsa-at)$ PYTHONPATH="./" python evals/cli.py "results/v2025.02/KN2045_Mix" -n "view_balance_heat"
+# load all networks upfront using 4 processes
+python -m evals.cli run_eval "/opt/data/esm/results" -p 4
+```
+
+``` shell
+# run all evaluations in 8 parallel processes
+python -m evals.cli run_eval "/opt/data/esm/results" -j 8
+```
+
+``` shell
+# render the charts of every evaluation in 8 parallel processes
+python -m evals.cli run_eval "/opt/data/esm/results" --plot_jobs 8
+```
+
+``` shell
+# reuse statistics from earlier runs (up to 4 GB on disk) and clear them
+python -m evals.cli run_eval "/opt/data/esm/results" --cache_size 4096
+python -m evals.cli clear_cache "/opt/data/esm/results"
+```
+
+``` shell
+# run evaluations as a script from the project root
+(pypsa-at)$ PYTHONPATH="./" python evals/cli.py run_eval "results/v2025.02/KN2045_Mix" -n "view_balance_heat"
 ```
 """
 
 import logging
+import multiprocessing as mp
+import pickle
 import sys
+from collections.abc import Iterator, Mapping
 from time import time
 
 import click
@@ -68,12 +91,22 @@ logger = logging.getLogger(__name__)
 @click.option(
     "--fail_fast", "-f", type=bool, multiple=False, required=False, default=False
 )
+@click.option("--prefetch", "-p", type=int, multiple=False, required=False, default=0)
+@click.option("--cache_size", type=int, multiple=False, required=False, default=0)
+@click.option("--memo_size", type=int, multiple=False, required=False, default=2048)
+@click.option("--jobs", "-j", type=int, multiple=False, required=False, default=1)
+@click.option("--plot_jobs", type=int, multiple=False, required=False, default=1)
 def run_eval(
     result_path: click.Path,
     sub_directory: str,
     names: list,
     config_override: str,
     fail_fast: bool,
+    prefetch: int,
+    cache_size: int,
+    memo_size: int,
+    jobs: int,
+    plot_jobs: int,
 ) -> None:
     r"""
     Execute evaluation functions from the evals module.
@@ -105,6 +138,27 @@ def run_eval(
     fail_fast
         Whether to raise Exceptions or to run all functions, defaults to
         running all functions.
+    prefetch
+        The number of processes used to load all networks before the
+        first evaluation starts. Defaults to loading networks lazily
+        when an evaluation function accesses them.
+    cache_size
+        The size limit of the on-disk statistics cache in megabytes.
+        Statistics are stored in the "cache" folder inside the result
+        path and reused in later runs. Defaults to 0, which disables
+        the cache.
+    memo_size
+        The memory budget in megabytes for unfiltered statistics that
+        are kept in memory and shared between evaluation functions.
+        Pass 0 to disable the memo.
+    jobs
+        The number of evaluation functions to run in parallel worker
+        processes. All networks are loaded before the workers start.
+        Defaults to running evaluations one after another.
+    plot_jobs
+        The number of processes used to render the charts of an
+        evaluation function. Only effective if evaluation functions
+        run one after another, i.e. jobs is 1.
 
     Returns
     -------
@@ -113,7 +167,9 @@ def run_eval(
         code.
     """
     import evals.views as views
-    from evals.fileio import read_networks, read_views_config
+    from evals.cache import StatisticsCache, get_cache_directory
+    from evals.fileio import Exporter, read_networks
+    from evals.statistic import STATISTICS_MEMO
 
     eval_functions = [
         getattr(views, fn) for fn in views.__all__ if (not names or fn in names)
@@ -124,35 +180,192 @@ def run_eval(
         sys.exit(f"Found no evaluation functions named: {names}")
     logger.info(f"Selected {n_evals} evaluation functions.")
 
-    networks = read_networks(result_path, sub_directory=sub_directory)
+    STATISTICS_MEMO.max_size = memo_size
+    Exporter.plot_processes = plot_jobs
+
+    cache = None
+    if cache_size > 0:
+        cache = StatisticsCache(get_cache_directory(result_path), cache_size)
+
+    networks = read_networks(
+        result_path,
+        sub_directory=sub_directory,
+        prefetch=prefetch > 0,
+        processes=prefetch,
+        cache=cache,
+    )
 
     fails = []
+    timings = {}
     run_start = time()
-    for i, func in enumerate(eval_functions, start=1):
-        logger.info(f"({i}/{n_evals}) Start {func.__name__}...")
-        eval_start = time()
-        try:
-            config = read_views_config(func, config_override)
-            func(result_path=result_path, networks=networks, config=config)
-        except Exception as e:
-            logger.exception(f"Exception during {func.__name__}.", exc_info=True)
-            fails.append(func.__name__)
+    view_names = [func.__name__ for func in eval_functions]
+    if jobs > 1:
+        results = _run_views_parallel(
+            view_names, result_path, networks, config_override, jobs, memo_size
+        )
+    else:
+        results = (
+            _run_view(name, result_path, networks, config_override)
+            for name in view_names
+        )
+
+    for i, (name, duration, error) in enumerate(results, start=1):
+        timings[name] = duration
+        if error is not None:
+            fails.append(name)
             if fail_fast:
-                raise e
+                raise error
         else:
             logger.info(
-                f"Executing {func.__name__} took {time() - eval_start:.2f} seconds."
+                f"({i}/{n_evals}) Executing {name} took {duration:.2f} seconds."
             )
-        finally:
-            logger.info(f"Finished {func.__name__}.")
+        logger.info(f"Finished {name}.")
 
+    timing_summary = "\n".join(
+        f"  {t:8.2f}s {n}" for n, t in sorted(timings.items(), key=lambda x: -x[1])
+    )
     logger.info(
         f"Full run took {time() - run_start:.2f} seconds."
+        f"\nTimings per evaluation:\n{timing_summary}"
         f"\nNumber of Errors: {len(fails)} {fails or ''}"
     )
     sys.exit(len(fails))
 
 
+def _run_view(
+    name: str, result_path: str, networks: Mapping, config_override: str
+) -> tuple[str, float, Exception | None]:
+    """
+    Execute a single evaluation function and catch exceptions.
+
+    Parameters
+    ----------
+    name
+        The evaluation function name in evals.views.
+    result_path
+        The path to the result folder.
+    networks
+        The loaded networks.
+    config_override
+        A path to an optional configuration override file.
+
+    Returns
+    -------
+    :
+        The evaluation name, the execution time in seconds and the
+        raised exception or None, if the evaluation succeeded.
+    """
+    import evals.views as views
+    from evals.fileio import read_views_config
+
+    func = getattr(views, name)
+    logger.info(f"Start {name}...")
+    eval_start = time()
+    try:
+        config = read_views_config(func, config_override)
+        func(result_path=result_path, networks=networks, config=config)
+    except Exception as e:
+        logger.exception(f"Exception during {name}.", exc_info=True)
+        return name, time() - eval_start, e
+
+    return name, time() - eval_start, None
+
+
+# networks in worker processes, either inherited from the parent
+# process (fork) or received once per worker on startup (spawn)
+_WORKER_NETWORKS = None
+
+
+def _init_worker(networks: Mapping, memo_size: int) -> None:
+    """Store the networks and the memo budget in a worker process."""
+    from evals.statistic import STATISTICS_MEMO
+
+    global _WORKER_NETWORKS
+    _WORKER_NETWORKS = networks
+    STATISTICS_MEMO.max_size = memo_size
+
+
+def _run_view_in_worker(args: tuple) -> tuple[str, float, Exception | None]:
+    """Execute an evaluation function in a worker process."""
+    name, duration, error = _run_view(*args[:2], _WORKER_NETWORKS, *args[2:])
+    try:
+        pickle.dumps(error)
+    except Exception:  # exceptions must be sent back to the parent process
+        error = RuntimeError(f"{type(error).__name__}: {error}")
+    return name, duration, error
+
+
+def _run_views_parallel(
+    view_names: list,
+    result_path: str,
+    networks: Mapping,
+    config_override: str,
+    jobs: int,
+    memo_size: int,
+) -> Iterator:
+    """
+    Execute evaluation functions in a process pool.
+
+    All networks are loaded before the pool starts. Worker processes
+    share them copy-on-write if the platform supports forking, or
+    receive a copy once during startup otherwise.
+
+    Parameters
+    ----------
+    view_names
+        The evaluation function names in evals.views.
+    result_path
+        The path to the result folder.
+    networks
+        The network collection returned by read_networks().
+    config_override
+        A path to an optional configuration override file.
+    jobs
+        The number of worker processes.
+    memo_size
+        The memory budget for memoized statistics per worker.
+
+    Yields
+    ------
+    :
+        The evaluation name, the execution time in seconds and the
+        raised exception or None, in order of completion.
+    """
+    if hasattr(networks, "prefetch"):
+        networks.prefetch(jobs)
+
+    methods = mp.get_all_start_methods()
+    context = mp.get_context("fork" if "fork" in methods else "spawn")
+    args = [(name, result_path, config_override) for name in view_names]
+    with context.Pool(
+        processes=min(jobs, len(view_names)),
+        initializer=_init_worker,
+        initargs=(networks, memo_size),
+    ) as pool:
+        yield from pool.imap_unordered(_run_view_in_worker, args)
+
+
+@click.command()
+@click.argument("result_path", type=click.Path(exists=True), required=True)
+def clear_cache(result_path: click.Path) -> None:
+    """
+    Remove all cached statistics from a result folder.
+
+    The statistics cache must be cleared after changing statistic
+    functions, because cache keys only account for the network
+    files and the statistic arguments.
+
+    Parameters
+    ----------
+    result_path
+        The path to the result folder that was passed to run_eval.
+    """
+    from evals.cache import StatisticsCache, get_cache_directory
+
+    cache = StatisticsCache(get_cache_directory(result_path))
+    logger.info(f"Removed {cache.clear()} cached statistics from {cache.directory}.")
+
+
 @click.command()
 def run_tests() -> None:
     """Run test suite in a dev environment."""
@@ -163,7 +376,16 @@ def run_tests() -> None:
     sys.exit(rc)
 
 
+@click.group()
+def cli() -> None:
+    """Run evaluations and manage the statistics cache."""
+
+
+cli.add_command(run_eval, "run_eval")
+cli.add_command(clear_cache, "clear_cache")
+
+
 if __name__ == "__main__":
     # debugging entry point
-    # args = (__file__, "../results/evals-dev", "-n", "view_grid_capacity")
-    run_eval(sys.argv[1:])
+    # args = (__file__, "run_eval", "../results/evals-dev", "-n", "view_grid_capacity")
+    cli(sys.argv[1:])
@@ -87,6 +87,9 @@ class ExcelConfig:
         default_factory=lambda: [DataModel.LOCATION, DataModel.CARRIER]
     )
     pivot_columns: str | list = DataModel.YEAR
+    # write-only mode: stream rows to disk with xlsxwriter instead of
+    # building the workbook in memory with openpyxl
+    streaming: bool = False
 
 
 @dataclass()
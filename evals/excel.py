@@ -7,7 +7,9 @@ from openpyxl.chart import BarChart, Reference
 from openpyxl.chart.marker import DataPoint
 from openpyxl.worksheet.worksheet import Worksheet
 from pandas import ExcelWriter
+from xlsxwriter.chart import Chart as XlsxChart
 from xlsxwriter.utility import xl_col_to_name, xl_rowcol_to_cell
+from xlsxwriter.worksheet import Worksheet as XlsxWorksheet
 
 from evals.configs import ExcelConfig
 from evals.constants import ALIAS_COUNTRY_REV, ALIAS_REGION_REV, DataModel
@@ -47,11 +49,19 @@ def export_excel_countries(
         aggfunc="sum",
     )
 
+    write_sheet = (
+        _stream_excel_sheet if excel_defaults.streaming else _write_excel_sheet
+    )
     for country, data in df.groupby(DataModel.LOCATION):
         data = data.droplevel(DataModel.LOCATION)
-        _write_excel_sheet(data, excel_defaults, writer, str(country))
+        write_sheet(data, excel_defaults, writer, str(country))
 
-    _write_categories_sheet(categories, carrier, writer, sheet_name="Categories")
+    write_categories = (
+        _stream_categories_sheet
+        if excel_defaults.streaming
+        else _write_categories_sheet
+    )
+    write_categories(categories, carrier, writer, sheet_name="Categories")
 
 
 def export_excel_regions_at(
@@ -87,9 +97,21 @@ def export_excel_regions_at(
         aggfunc="sum",
     )
 
+    regions_sheet, regions_position = "Regions AT", 3
+    write_sheet = (
+        _stream_excel_sheet if excel_defaults.streaming else _write_excel_sheet
+    )
+    if excel_defaults.streaming:
+        # sheets cannot be moved in write-only mode. They must be
+        # created in the final order before any data is written.
+        locations = sorted(str(loc) for loc in df_xlsx.index.unique(DataModel.LOCATION))
+        locations.insert(regions_position - 1, regions_sheet)
+        for sheet_name in locations:
+            writer.book.add_worksheet(sheet_name)
+
     for country, data in df_xlsx.groupby(DataModel.LOCATION):
         data = data.droplevel(DataModel.LOCATION)
-        _write_excel_sheet(data, excel_defaults, writer, str(country))
+        write_sheet(data, excel_defaults, writer, str(country))
 
     # append carrier tables to special region sheet
     df_region = df.pivot_table(
@@ -99,12 +121,12 @@ def export_excel_regions_at(
     ).droplevel(DataModel.METRIC, axis=1)
 
     excel_defaults.chart_title = "Region AT"
-    _write_excel_sheet(
+    write_sheet(
         df_region,
         excel_defaults,
         writer,
-        sheet_name="Regions AT",
-        position=3,
+        sheet_name=regions_sheet,
+        position=regions_position,
     )
     groups = df_region.drop(
         ["Europe", "Austria"], level=DataModel.LOCATION, axis=1, errors="ignore"
@@ -116,15 +138,20 @@ def export_excel_regions_at(
 
     for carrier, df_reg in groups:
         excel_defaults.chart_title = str(carrier).title()
-        _write_excel_sheet(
+        write_sheet(
             df_reg.T.unstack(1),
             excel_defaults,
             writer,
-            sheet_name="Regions AT",
-            position=3,
+            sheet_name=regions_sheet,
+            position=regions_position,
         )
 
-    _write_categories_sheet(categories, carrier, writer, sheet_name="Categories")
+    write_categories = (
+        _stream_categories_sheet
+        if excel_defaults.streaming
+        else _write_categories_sheet
+    )
+    write_categories(categories, carrier, writer, sheet_name="Categories")
 
 
 def _write_excel_sheet(
@@ -409,3 +436,286 @@ def _expand_column_to_fit_content(ws: Worksheet, df: pd.DataFrame, col: int) ->
     existing_width = ws.column_dimensions[xl_col].width
     column_width = max(existing_width, data_width)
     ws.column_dimensions[xl_col].width = column_width
+
+
+# cell styles similar to the pandas header and index styles
+_HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+_DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+_DEFAULT_COLUMN_WIDTH = 13  # the openpyxl default column width
+
+
+def _get_stream_formats(writer: ExcelWriter) -> dict:
+    """
+    Return the cell formats used in write-only mode.
+
+    Formats are registered once per workbook.
+
+    Parameters
+    ----------
+    writer
+        The ExcelWriter instance using the xlsxwriter engine.
+
+    Returns
+    -------
+    :
+        The header, datetime header, and index formats.
+    """
+    wb = writer.book
+    if not hasattr(wb, "evals_formats"):
+        wb.evals_formats = {
+            "header": wb.add_format(_HEADER_FORMAT),
+            "datetime": wb.add_format(
+                _HEADER_FORMAT | {"num_format": _DATETIME_FORMAT}
+            ),
+            "index": wb.add_format(_HEADER_FORMAT | {"align": "left"}),
+        }
+    return wb.evals_formats
+
+
+def _fit_column_width(ws: XlsxWorksheet, col: int, labels: pd.Index) -> None:
+    """
+    Expand a column to the longest label from the data frame.
+
+    The width is computed from the data frame only, because cells
+    cannot be read back in write-only mode.
+
+    Parameters
+    ----------
+    ws
+        The xlsxwriter worksheet.
+    col
+        The index of the column that should become expanded.
+    labels
+        The labels written to the column.
+    """
+    widths = ws.__dict__.setdefault("evals_column_widths", {})
+    data_width = labels.astype(str).str.len().max() if len(labels) else 0
+    widths[col] = max(widths.get(col, _DEFAULT_COLUMN_WIDTH), data_width)
+    ws.set_column(col, col, widths[col])
+
+
+def _stream_excel_sheet(
+    df: pd.DataFrame,
+    excel_defaults: ExcelConfig,
+    writer: pd.ExcelWriter,
+    sheet_name: str,
+    position: int = -1,
+) -> None:
+    """
+    Write a data frame to an Excel sheet in write-only mode.
+
+    Produces the same sheet layout as _write_excel_sheet() but writes
+    rows sequentially with xlsxwriter. The writer must use the
+    xlsxwriter engine, typically with the "constant_memory" option
+    to flush rows to disk immediately. The index name row is never
+    written instead of being deleted afterward.
+
+    Parameters
+    ----------
+    df
+        The dataframe to be exported to Excel; works with columns of
+        multiindex level <= 2 f.ex. (location, year).
+    excel_defaults
+        The configuration of the Excel file and chart.
+    writer
+        The writer object that represents an opened Excel file.
+    sheet_name
+        The name of sheet included in xlsx, will also be the
+        name of diagram.
+    position
+        Unused. Sheets must be created in the desired order before
+        writing to them in write-only mode.
+    """
+    axis_labels = excel_defaults.axis_labels or [df.attrs["name"], df.attrs["unit"]]
+    formats = _get_stream_formats(writer)
+    number_rows, number_col = df.shape
+    n_idx, n_col = df.index.nlevels, df.columns.nlevels
+
+    ws = writer.book.get_worksheet_by_name(sheet_name)
+    start_row = 0
+    if ws is None:
+        ws = writer.book.add_worksheet(sheet_name)
+    elif ws.dim_rowmax is not None:
+        start_row = ws.dim_rowmax + 1 + 2  # two empty rows between tables
+
+    # header rows with merged cells for repeated outer column labels
+    for level in range(n_col):
+        row = start_row + level
+        ws.write(row, n_idx - 1, df.columns.names[level], formats["header"])
+        labels = df.columns.get_level_values(level)
+        first = 0
+        for last in range(1, number_col + 1):
+            if (
+                last < number_col
+                and level < n_col - 1
+                and labels[last] == labels[first]
+            ):
+                continue
+            label = labels[first]
+            fmt = formats["datetime" if isinstance(label, pd.Timestamp) else "header"]
+            if last - first > 1:
+                ws.merge_range(row, n_idx + first, row, n_idx + last - 1, label, fmt)
+            else:
+                ws.write(row, n_idx + first, label, fmt)
+            first = last
+
+    # data rows. Same precision as float_format="%0.4f" in pandas
+    values = df.round(4).astype(object).where(df.notna(), None)
+    for i, (labels, data) in enumerate(zip(df.index, values.itertuples(index=False))):
+        row = start_row + n_col + i
+        labels = labels if isinstance(labels, tuple) else (labels,)
+        for col, label in enumerate(labels):
+            ws.write(row, col, label, formats["index"])
+        ws.write_row(row, n_idx, data)
+
+    _fit_column_width(ws, 0, df.index.get_level_values(0))
+
+    if excel_defaults.chart:
+        chart = _create_streaming_barchart(
+            writer, ws, df, excel_defaults, axis_labels, start_row
+        )
+        ws.insert_chart(start_row, number_col + 2, chart)
+
+
+def _stream_categories_sheet(
+    mapping: dict, carrier: tuple, writer: ExcelWriter, sheet_name: str
+) -> None:
+    """
+    Write the mapping to a separate Excel sheet in write-only mode.
+
+    Parameters
+    ----------
+    mapping
+        The model name (bus carrier, carrier, or sector) to group
+        relation as key value pairs.
+    carrier
+        A collection of all carrier technologies present in the
+        exported metric.
+    writer
+        The open ExcelWriter object using the xlsxwriter engine.
+    sheet_name
+        The name of the sheet to write the 2 mapping columns to.
+    """
+    formats = _get_stream_formats(writer)
+    m = {k: v for k, v in mapping.items() if k in carrier}
+    ws = writer.book.add_worksheet(sheet_name)
+    ws.write(0, 1, "Category", formats["header"])
+    for row, (model_name, category) in enumerate(m.items(), start=1):
+        ws.write(row, 0, model_name, formats["index"])
+        ws.write(row, 1, category)
+    _fit_column_width(ws, 0, pd.Index(list(m)))
+    _fit_column_width(ws, 1, pd.Index(list(m.values())))
+
+
+def _create_streaming_barchart(
+    writer: ExcelWriter,
+    ws: XlsxWorksheet,
+    df: pd.DataFrame,
+    cfg: ExcelConfig,
+    axis_labels: list,
+    start_row: int,
+) -> XlsxChart:
+    """
+    Create an xlsxwriter bar chart for data written by _stream_excel_sheet.
+
+    The chart references the same cells and uses the same
+    orientation, grouping, size and colors as _create_excel_barchart().
+
+    Parameters
+    ----------
+    writer
+        The writer object that represents an opened Excel file.
+    ws
+        The worksheet the data was written to.
+    df
+        Reference data for the bar chart.
+    cfg
+        The configuration for the Excel file and Excel chart.
+    axis_labels
+        A list of strings. The first list item is the x-axis label,
+        the second is the y-axis label.
+    start_row
+        First row of the written data.
+
+    Returns
+    -------
+    :
+        The Excel bar chart object ready for insertion in a sheet.
+    """
+    nrows, ncols = df.shape
+    n_idx, n_col = df.index.nlevels, df.columns.nlevels
+    name = ws.get_name()
+
+    subtypes = {"stacked": "stacked", "percentStacked": "percent_stacked"}
+    chart_type = {"type": "column"}
+    if cfg.chart in subtypes:
+        chart_type["subtype"] = subtypes[cfg.chart]
+    chart = writer.book.add_chart(chart_type)
+
+    cat_len = len(df.columns.unique(1))
+    first_data_row = start_row + n_col
+    last_data_row = first_data_row + nrows - 1
+    first_data_col, last_data_col = n_idx, n_idx + ncols - 1
+    options = {"overlap": 100 if cfg.chart == "stacked" else 0}
+    if cat_len > 1:
+        options["gap"] = 20
+
+    if cfg.chart_switch_axis:
+        color = cfg.chart_colors.get(df.columns.unique("carrier")[0])
+        points = None
+        if color:
+            point = {"fill": {"color": f"#{color}"}, "border": {"color": "#FFFFFF"}}
+            points = [point] * nrows
+        for col in range(first_data_col, last_data_col + 1):
+            chart.add_series(
+                options
+                | {
+                    "name": [name, first_data_row - 1, col],
+                    "values": [name, first_data_row, col, last_data_row, col],
+                    "categories": [
+                        name,
+                        first_data_row,
+                        n_idx - 1,
+                        last_data_row,
+                        n_idx - 1,
+                    ],
+                    "points": points,
+                }
+            )
+    else:
+        first_cat_row = first_data_row - (2 if cat_len > 1 else 1)
+        for i, carrier in enumerate(df.index):
+            row = first_data_row + i
+            series = options | {
+                "name": [name, row, n_idx - 1],
+                "values": [name, row, first_data_col, row, last_data_col],
+                "categories": [
+                    name,
+                    first_cat_row,
+                    first_data_col,
+                    first_data_row - 1,
+                    last_data_col,
+                ],
+            }
+            if color := cfg.chart_colors.get(carrier):
+                series["fill"] = {"color": f"#{color}"}
+                series["border"] = {"color": f"#{color}"}
+            chart.add_series(series)
+
+    title = cfg.chart_title or df.columns.get_level_values("metric")[0]
+    chart.set_title({"name": title.format(location=name, unit=axis_labels[1])})
+    chart.set_x_axis({"name": axis_labels[0]})
+    chart.set_y_axis({"name": axis_labels[1]})
+
+    if cfg.chart_switch_axis:  # the legend is redundant, as is the x-axis label
+        chart.set_legend({"none": True})
+        chart.set_x_axis({})
+
+    # same size as the openpyxl chart, converted from cm to pixels (96 DPI)
+    height_factor = 0.53  # 15 (px) / 72 (px/Inch) * 2.54 (cm/Inch) = (cm)
+    height_cm = min((nrows + n_col) * height_factor, 10)
+    chart.set_size(
+        {"width": cfg.chart_width / 2.54 * 96, "height": height_cm / 2.54 * 96}
+    )
+
+    return chart
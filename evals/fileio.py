@@ -4,8 +4,12 @@
 # For license information, see the LICENSE.txt file in the project root.
 """Input - Output related functions."""
 
+import json
 import logging
+import multiprocessing as mp
+import os
 import re
+from collections.abc import Iterator, Mapping
 from functools import cached_property
 from importlib import resources
 from pathlib import Path
@@ -16,6 +20,7 @@ import pypsa
 import tomllib
 from pydantic.v1.utils import deep_update
 
+from evals.cache import StatisticsCache
 from evals.configs import ViewDefaults
 from evals.constants import (
     ALIAS_COUNTRY,
@@ -27,28 +32,180 @@ from evals.constants import (
     Regex,
 )
 from evals.excel import export_excel_countries, export_excel_regions_at
+from evals.plots._base import write_plotlyjs
 from evals.utils import (
     combine_statistics,
     insert_index_level,
     rename_aggregate,
 )
-from scripts._helpers import get_rdir, path_provider
+from scripts._helpers import get_rdir, load_network, path_provider
+
+COLUMNAR_META_KEY = b"evals"
+
+
+def _load_network(file_path: Path) -> pypsa.Network:
+    """
+    Load a single network from a NetCDF file.
+
+    Defined at module level, because process pools must be able to
+    pickle the function.
+
+    Parameters
+    ----------
+    file_path
+        The path to the NetCDF file.
+
+    Returns
+    -------
+    :
+        The loaded network without evaluation specific patches.
+    """
+    return load_network(file_path)
+
+
+class NetworkCollection(Mapping):
+    """
+    A lazy, read-only mapping of planning horizons to networks.
+
+    The collection behaves like the dictionary returned by
+    read_networks() in earlier versions, but postpones loading a
+    network until it is accessed for the first time. Loaded networks
+    are kept, i.e. every file is read at most once.
+
+    Parameters
+    ----------
+    file_paths
+        A dictionary with the year as key and the path to the NetCDF
+        file as value. The dictionary order determines the iteration
+        order of the collection.
+    result_path
+        The result path passed to the statistics accessor.
+    cache
+        An optional on-disk cache used by collect_myopic_statistics()
+        to skip computing (and loading networks for) known statistics.
+    """
+
+    def __init__(
+        self,
+        file_paths: dict,
+        result_path: str | Path | list,
+        cache: StatisticsCache = None,
+    ) -> None:
+        self.file_paths = file_paths
+        self.result_path = result_path
+        self.cache = cache
+        self._networks = {}
+
+    def __getitem__(self, year: str) -> pypsa.Network:
+        """Return the network for a year and load it if necessary."""
+        if year not in self._networks:
+            n = _load_network(self.file_paths[year])
+            self._networks[year] = self._patch(n, year)
+        return self._networks[year]
+
+    def __iter__(self) -> Iterator:
+        """Iterate over years without loading networks."""
+        return iter(self.file_paths)
+
+    def __reversed__(self) -> Iterator:
+        """Iterate over years in reversed order."""
+        return reversed(self.file_paths)
+
+    def __len__(self) -> int:
+        """Return the number of networks in the collection."""
+        return len(self.file_paths)
+
+    def __repr__(self) -> str:
+        """Show years and their loading state."""
+        years = ", ".join(
+            f"{y}{'' if self.is_loaded(y) else ' (not loaded)'}" for y in self
+        )
+        return f"{type(self).__name__}({years})"
+
+    def is_loaded(self, year: str) -> bool:
+        """Return whether the network for a year is already loaded."""
+        return year in self._networks
+
+    def prefetch(self, processes: int = None) -> "NetworkCollection":
+        """
+        Load all missing networks in parallel.
+
+        Parameters
+        ----------
+        processes
+            The number of worker processes. Defaults to one process
+            per missing network, but at most the number of CPUs.
+
+        Returns
+        -------
+        :
+            The collection itself with all networks loaded.
+        """
+        missing = [y for y in self if not self.is_loaded(y)]
+        if not missing:
+            return self
+
+        processes = processes or min(len(missing), os.cpu_count() or 1)
+        if processes == 1 or len(missing) == 1:
+            for year in missing:
+                self[year]
+            return self
+
+        with mp.Pool(processes=min(processes, len(missing))) as pool:
+            loaded = pool.map(_load_network, [self.file_paths[y] for y in missing])
+
+        for year, n in zip(missing, loaded, strict=True):
+            self._networks[year] = self._patch(n, year)
+
+        return self
+
+    def _patch(self, n: pypsa.Network, year: str) -> pypsa.Network:
+        """
+        Attach the evaluation statistics and metadata to a network.
+
+        Parameters
+        ----------
+        n
+            The freshly loaded network.
+        year
+            The planning horizon of the network.
+
+        Returns
+        -------
+        :
+            The patched network.
+        """
+        # delayed import to prevent circular dependency error
+        from evals.statistic import ESMStatistics
+
+        n.statistics = ESMStatistics(n, self.result_path)
+        n.name = f"PyPSA-AT Network {year}"
+        n.year = year
+        return n
 
 
 def read_networks(
-    result_path: str | Path | list, sub_directory: str = "networks"
-) -> dict:
+    result_path: str | Path | list,
+    sub_directory: str = "networks",
+    prefetch: bool = False,
+    processes: int = None,
+    cache: StatisticsCache = None,
+) -> NetworkCollection:
     """
     Read network results from NetCDF (.nc) files.
 
-    The function returns a dictionary of data frames. The planning
-    horizon (year) is used as dictionary key and added to the network
+    The function returns a mapping of networks. The planning
+    horizon (year) is used as key and added to the network
     as an attribute to associate the year with it. Network snapshots
     are equal for all networks, although the year changes. This is
     required to align timestamp columns in a data frame. Snapshots
     will become fixed late in the evaluation process (just before
     export to file).
 
+    Networks are loaded lazily on first access, unless prefetching
+    is requested. Prefetching loads all networks at once using a
+    process pool.
+
     In addition, the function patches the statistics accessor attached
     to loaded networks and adds the configuration under n.meta if it is
     missing.
@@ -62,32 +219,37 @@ def read_networks(
     sub_directory
         The subdirectory name to read files from relative to the
         result folder.
+    prefetch
+        Whether to load all networks immediately.
+    processes
+        The number of processes used to prefetch networks. Only
+        effective if prefetch is enabled.
+    cache
+        An optional on-disk statistics cache attached to the returned
+        collection.
 
     Returns
     -------
     :
-        A Dictionary that contains pypsa.Network objects as values the
+        A mapping that contains pypsa.Network objects as values and the
         year from the end of the file name as keys.
     """
-    # delayed import to prevent circular dependency error
-    from evals.statistic import ESMStatistics
-
     if isinstance(result_path, list):
         file_paths = [Path(p) for p in result_path]  # assuming snakemake.input.networks
     else:
         input_path = Path(result_path) / sub_directory
         file_paths = input_path.glob(r"*[0-9].nc")
 
-    networks = {}
+    years = {}
     for file_path in file_paths:
         year = re.search(Regex.year, file_path.stem).group()
-        n = pypsa.Network(file_path)
-        n.statistics = ESMStatistics(n, result_path)
-        n.name = f"PyPSA-AT Network {year}"
-        n.year = year
-        networks[year] = n
+        years[year] = file_path
+
+    assert years, f"No networks found in {file_paths}."
 
-    assert networks, f"No networks found in {file_paths}."
+    networks = NetworkCollection(years, result_path, cache)
+    if prefetch:
+        networks.prefetch(processes)
 
     return networks
 
@@ -187,6 +349,98 @@ def read_csv_files(
     return pd.concat(df_list, sort=True)
 
 
+def write_columnar(df: pd.DataFrame, file_path: Path, file_format: str) -> None:
+    """
+    Write a metric data frame to a Parquet or Feather file.
+
+    Index levels are stored as dictionary encoded (categorical)
+    columns. Column labels are converted to strings, because Arrow
+    requires string column names. The information needed to restore
+    the original data frame is stored in the schema metadata.
+
+    Parameters
+    ----------
+    df
+        The metric data frame to write.
+    file_path
+        The path to the output file.
+    file_format
+        The file format, either "parquet" or "feather".
+    """
+    # delayed import, pyarrow is only required for columnar exports
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    index_names = list(df.index.names)
+    columnar = df.copy()
+    datetime_columns = isinstance(columnar.columns, pd.DatetimeIndex)
+    columns_name = columnar.columns.name
+    columnar.columns = columnar.columns.astype(str)
+    columnar = columnar.reset_index()
+    for name in index_names:
+        columnar[name] = columnar[name].astype("category")
+
+    table = pa.Table.from_pandas(columnar, preserve_index=False)
+    meta = {
+        "index": index_names,
+        "columns_name": columns_name,
+        "datetime_columns": datetime_columns,
+        "attrs": df.attrs,
+    }
+    table = table.replace_schema_metadata(
+        (table.schema.metadata or {})
+        | {COLUMNAR_META_KEY: json.dumps(meta, default=str)}
+    )
+
+    if file_format == "parquet":
+        pq.write_table(table, file_path)
+    elif file_format == "feather":
+        feather.write_feather(table, file_path)
+    else:
+        raise ValueError(f"Unsupported columnar file format: '{file_format}'.")
+
+
+def read_columnar(file_path: str | Path, memory_map: bool = True) -> pd.DataFrame:
+    """
+    Read a metric from a Parquet or Feather file.
+
+    Restores the metric data frame as written by the Exporter, i.e.
+    the index levels, the column labels and data frame attributes.
+
+    Parameters
+    ----------
+    file_path
+        The path to a file written with the "parquet" or "feather"
+        export.
+    memory_map
+        Whether to memory-map the file instead of reading it into
+        memory.
+
+    Returns
+    -------
+    :
+        The metric data frame.
+    """
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    file_path = Path(file_path)
+    if file_path.suffix == ".parquet":
+        table = pq.read_table(file_path, memory_map=memory_map)
+    else:
+        table = feather.read_table(file_path, memory_map=memory_map)
+
+    meta = json.loads(table.schema.metadata[COLUMNAR_META_KEY])
+    df = table.to_pandas().set_index(meta["index"])
+    if meta["datetime_columns"]:
+        df.columns = pd.to_datetime(df.columns)
+    df.columns.name = meta["columns_name"]
+    df.attrs = meta["attrs"]
+
+    return df
+
+
 def get_resources_directory(n: pypsa.Network) -> Callable:
     """Return a path provider to the resources directory for a network."""
     run = n.meta["run"]
@@ -248,6 +502,23 @@ def _add_dummy_rows(df: pd.DataFrame, keep_regions: tuple) -> pd.DataFrame:
     return result
 
 
+def _render_chart(args: tuple) -> None:
+    """
+    Plot one chart and write it to HTML and JSON.
+
+    Parameters
+    ----------
+    args
+        The groupby key, the plot data, the plot configuration and the
+        output path.
+    """
+    idx, data, cfg, output_path = args
+    chart = cfg.chart(data, cfg)
+    chart.plot()
+    chart.to_html(output_path, cfg.plotby, idx)
+    chart.to_json(output_path, cfg.plotby, idx)
+
+
 class Exporter:
     """
     A class to export statistics.
@@ -271,6 +542,9 @@ class Exporter:
         to show the full country name.
     """
 
+    # the number of processes used to render plotly charts
+    plot_processes: int = 1
+
     def __init__(
         self,
         statistics: list,
@@ -329,6 +603,9 @@ class Exporter:
         """
         Create the plotly figure and export it as HTML and JSON.
 
+        One chart is rendered per group. Groups are rendered in a
+        process pool if plot_processes is larger than 1.
+
         Parameters
         ----------
         output_path
@@ -346,11 +623,25 @@ class Exporter:
 
         df_plot = _add_dummy_rows(df_plot, self.keep_regions)
 
-        for idx, data in df_plot.groupby(cfg.plotby):
-            chart = cfg.chart(data, cfg)
-            chart.plot()
-            chart.to_html(output_path, cfg.plotby, idx)
-            chart.to_json(output_path, cfg.plotby, idx)
+        # one shared plotly.js bundle for all HTML files in the folder
+        write_plotlyjs(output_path / "HTML")
+
+        groups = [
+            (idx, data, cfg, output_path) for idx, data in df_plot.groupby(cfg.plotby)
+        ]
+        processes = min(self.plot_processes, len(groups))
+        # worker processes of parallel evaluations cannot start a pool
+        if processes < 2 or mp.current_process().daemon:
+            for args in groups:
+                _render_chart(args)
+            return
+
+        methods = mp.get_all_start_methods()
+        context = mp.get_context("fork" if "fork" in methods else "spawn")
+        with context.Pool(processes) as pool:
+            pool.map(
+                _render_chart, groups, chunksize=max(len(groups) // processes // 4, 1)
+            )
 
     def export_excel(self, output_path: Path) -> None:
         """
@@ -363,7 +654,8 @@ class Exporter:
         """
         file_name_stem = self.view_config["file_name"].split("_{")[0]
         file_path = output_path / "XLSX" / f"{file_name_stem}_{NOW}.xlsx"
-        with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+        self.defaults.excel.streaming = self.view_config.get("excel_streaming", False)
+        with self._excel_writer(file_path) as writer:
             export_excel_countries(
                 self.df, writer, self.defaults.excel, self.view_config
             )
@@ -372,11 +664,37 @@ class Exporter:
             return  # skips region sheets for time series
 
         file_path_at = output_path / f"{file_name_stem}_AT_{NOW}.xlsx"
-        with pd.ExcelWriter(file_path_at, engine="openpyxl") as writer:
+        with self._excel_writer(file_path_at) as writer:
             export_excel_regions_at(
                 self.df, writer, self.defaults.excel, self.view_config
             )
 
+    def _excel_writer(self, file_path: Path) -> pd.ExcelWriter:
+        """
+        Open an Excel writer for the configured Excel mode.
+
+        The streaming mode uses the xlsxwriter engine in constant
+        memory mode, which flushes every row to disk once the next row
+        is written.
+
+        Parameters
+        ----------
+        file_path
+            The path to the Excel file.
+
+        Returns
+        -------
+        :
+            The ExcelWriter to use as a context manager.
+        """
+        if self.defaults.excel.streaming:
+            return pd.ExcelWriter(
+                file_path,
+                engine="xlsxwriter",
+                engine_kwargs={"options": {"constant_memory": True}},
+            )
+        return pd.ExcelWriter(file_path, engine="openpyxl")
+
     def export_csv(self, output_path: Path) -> None:
         """
         Encode the metric da frame to a CSV file.
@@ -396,6 +714,32 @@ class Exporter:
         file_path = output_path / "CSV" / f"{file_name}_{NOW}.csv"
         self.df.to_csv(file_path, encoding="utf-8")
 
+    def export_columnar(self, output_path: Path, file_format: str) -> None:
+        """
+        Encode the metric data frame to a Parquet or Feather file.
+
+        Columnar files keep the metric MultiIndex and data types and
+        can be memory-mapped by downstream applications. Use
+        read_columnar() to load them.
+
+        Parameters
+        ----------
+        output_path
+            The path to the evaluation folder. Files are stored in the
+            PARQUET or FEATHER subdirectory, respectively.
+        file_format
+            The file format, either "parquet" or "feather".
+
+        Returns
+        -------
+        :
+            Writes the metric to a columnar file.
+        """
+        file_name = self.defaults.plotly.file_name_template.split("_{", maxsplit=1)[0]
+        directory = output_path / file_format.upper()
+        file_path = directory / f"{file_name}_{NOW}.{file_format}"
+        write_columnar(self.df, file_path, file_format)
+
     def export(self, result_path: Path, subdir: str) -> None:
         """
         Export the metric to formats specified in the config.
@@ -419,6 +763,9 @@ class Exporter:
             self.export_excel(output_path)
         if "csv" in self.view_config.get("exports", []):
             self.export_csv(output_path)
+        for file_format in ("parquet", "feather"):
+            if file_format in self.view_config.get("exports", []):
+                self.export_columnar(output_path, file_format)
 
         # always run tests after the export
         self.consistency_checks()
@@ -519,6 +866,8 @@ class Exporter:
         self.make_directory(output_path, "JSON")
         self.make_directory(output_path, "CSV")
         self.make_directory(output_path, "XLSX")
+        self.make_directory(output_path, "PARQUET")
+        self.make_directory(output_path, "FEATHER")
 
         return output_path
 
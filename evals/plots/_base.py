@@ -4,6 +4,8 @@
 # For license information, see the LICENSE.txt file in the project root.
 """Common graph bases and emtpy figures."""
 
+import functools
+import os
 import pathlib
 import typing
 
@@ -79,29 +81,13 @@ class ESMChart:
         """
         file_name = f"{self.construct_file_name(groupby, idx)}.html"
         file_path = output_path / "HTML" / file_name
-        template_html = """\
-<!DOCTYPE html>
-<html>
-<head>
-<meta charset="utf-8" />
-<meta name="viewport" content="width=device-width, initial-scale=1.0" />
-<meta name="repo_name" content="{{ repo_name }}" />
-<meta name="repo_branch" content="{{ repo_branch }}" />
-<meta name="repo_hash" content="{{ repo_hash }}" />
-</head>
-<body>
-    {{ fig }}
-</body>
-</html>"""
 
         div = self.fig.to_html(include_plotlyjs="directory", full_html=False)
         with file_path.open("w", encoding="utf-8") as fh:
-            fh.write(Template(template_html).render(fig=div, **RUN_META_DATA))
+            fh.write(HTML_TEMPLATE.render(fig=div, **RUN_META_DATA))
 
         # need to write the plotly.js too, because to_html does not
-        bundle_path = file_path.parent / "plotly.min.js"
-        if not bundle_path.exists():
-            bundle_path.write_text(get_plotlyjs(), encoding="utf-8")
+        write_plotlyjs(file_path.parent)
 
         return file_path
 
@@ -214,12 +200,7 @@ class ESMChart:
 
     def _set_base_layout(self) -> None:
         """Set various figure properties."""
-        self.fig.update_layout(
-            height=800,
-            font_family="Calibri",
-            plot_bgcolor="#ffffff",
-            legend_title_text=self.cfg.legend_header,
-        )
+        self.fig.update_layout(base_layout(self.cfg.legend_header))
         # update axes
         self.fig.update_yaxes(
             showgrid=self.cfg.yaxes_showgrid, visible=self.cfg.yaxes_visible
@@ -231,19 +212,9 @@ class ESMChart:
             showgrid=False,
             tickprefix="<b>",
             ticksuffix="</b>",
-            tickfont_size=20,
+            tickfont={"size": 20},
             title_font={"size": 20},
         )
-        self.fig.update_layout(
-            xaxis={"categoryorder": "category ascending"},
-            hovermode="x",  # all categories are shown by mouse-over
-        )
-        # trace order always needs to be reversed to show correct order
-        # of legend entries for relative bar charts
-        self.fig.update_layout(legend={"traceorder": "reversed"})
-
-        # export the metadata directly in the Layout property for JSON
-        self.fig.update_layout(meta=[RUN_META_DATA])
 
     def _append_footnotes(self) -> None:
         """Append the footnote(s) at the bottom of the figure."""
@@ -309,6 +280,82 @@ class ESMChart:
         return "".join(self.cfg.footnotes).count("<br>")
 
 
+HTML_TEMPLATE = Template("""\
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8" />
+<meta name="viewport" content="width=device-width, initial-scale=1.0" />
+<meta name="repo_name" content="{{ repo_name }}" />
+<meta name="repo_branch" content="{{ repo_branch }}" />
+<meta name="repo_hash" content="{{ repo_hash }}" />
+</head>
+<body>
+    {{ fig }}
+</body>
+</html>""")
+
+
+@functools.cache
+def base_layout(legend_header: str) -> dict:
+    """
+    Return the layout properties shared by all ESM charts.
+
+    The layout is validated once and returned as a nested dictionary,
+    which is much faster to apply to new figures than several
+    update_layout() calls with magic underscore keys.
+
+    Parameters
+    ----------
+    legend_header
+        The legend title text.
+
+    Returns
+    -------
+    :
+        The layout properties to pass to Figure.update_layout().
+    """
+    layout = go.Layout(
+        height=800,
+        font={"family": "Calibri"},
+        plot_bgcolor="#ffffff",
+        xaxis={"categoryorder": "category ascending"},
+        hovermode="x",  # all categories are shown by mouse-over
+        # trace order always needs to be reversed to show correct order
+        # of legend entries for relative bar charts
+        legend={"title": {"text": legend_header}, "traceorder": "reversed"},
+        # export the metadata directly in the Layout property for JSON
+        meta=[RUN_META_DATA],
+    )
+    return layout.to_plotly_json()
+
+
+def write_plotlyjs(directory: pathlib.Path) -> pathlib.Path:
+    """
+    Write the plotly.js bundle once per output folder.
+
+    HTML files reference the bundle in the same folder. The file is
+    written to a temporary file first, because charts may be rendered
+    by parallel processes.
+
+    Parameters
+    ----------
+    directory
+        The folder with HTML files.
+
+    Returns
+    -------
+    :
+        The path to the plotly.js bundle.
+    """
+    bundle_path = directory / "plotly.min.js"
+    if not bundle_path.exists():
+        tmp_path = directory / f"plotly.min.js.{os.getpid()}.tmp"
+        tmp_path.write_text(get_plotlyjs(), encoding="utf-8")
+        os.replace(tmp_path, bundle_path)
+    return bundle_path
+
+
 def empty_figure(title: str) -> go.Figure:
     """
     Return an empty graph with explanation text.
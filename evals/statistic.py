@@ -5,11 +5,15 @@
 """Collect statistics for evaluations."""  # noqa: A005
 
 import logging
+import weakref
+from collections import OrderedDict
 from functools import partial
 from inspect import getmembers
 from itertools import product
 from pathlib import Path
+from uuid import uuid4
 
+import numpy as np
 import pandas as pd
 import pypsa
 from pandas import DataFrame
@@ -61,6 +65,11 @@ def get_location(
     Note, that the bus_carrier will still be the bus_carrier
     from the "port" argument, i.e. only the location is swapped.
 
+    Results are cached per network and component. The cache is
+    invalidated if components or buses are added or removed, i.e.
+    if the static data frames are replaced. In-place edits of bus
+    assignments or bus locations are not detected.
+
     Parameters
     ----------
     n
@@ -81,19 +90,48 @@ def get_location(
     :
         A list of series to group statistics by.
     """
-    if avoid_eu_locations and c in n.branch_components:
-        bus0 = n.static(c)["bus0"].map(n.static("Bus").location).rename("loc0")
-        bus1 = n.static(c)["bus1"].map(n.static("Bus").location).rename("loc1")
-        buses = pd.concat([bus0, bus1], axis=1)
+    static, buses = n.static(c), n.static("Bus")
+    key = (c, port, location_port, avoid_eu_locations)
+    # keys are grouper arguments, values weak references to the data
+    # frames the result was built from, their shapes and the result
+    if not hasattr(n, "_location_cache"):
+        n._location_cache = {}
+    cache = n._location_cache
+    if key in cache:
+        static_ref, buses_ref, shapes, location = cache[key]
+        if (
+            static_ref() is static
+            and buses_ref() is buses
+            and shapes == (static.shape, buses.shape)
+        ):
+            return location.copy()
+
+    location = _get_location(n, c, port, location_port, avoid_eu_locations)
+    cache[key] = (
+        weakref.ref(static),
+        weakref.ref(buses),
+        (static.shape, buses.shape),
+        location,
+    )
 
-        def _select_location(row) -> str:
-            if row.loc0 != "EU" or pd.isna(row.loc1):
-                return row.loc0
-            return row.loc1
+    return location.copy()
 
-        return buses.apply(_select_location, axis=1).rename("location")
 
+def _get_location(
+    n: pypsa.Network,
+    c: str,
+    port: str,
+    location_port: str,
+    avoid_eu_locations: bool,
+) -> pd.Series:
+    """Build the location grouper series (see get_location)."""
+    if avoid_eu_locations and c in n.branch_components:
         # selection order: country code > EU > NaN
+        loc0 = n.static(c)["bus0"].map(n.static("Bus").location)
+        loc1 = n.static(c)["bus1"].map(n.static("Bus").location)
+        use_loc0 = (loc0 != "EU").to_numpy() | loc1.isna().to_numpy()
+        location = np.where(use_loc0, loc0.to_numpy(), loc1.to_numpy())
+        return pd.Series(location, index=loc0.index, name="location", dtype=object)
 
     # todo: probably obsolete?
     if location_port and c in n.branch_components:
@@ -147,6 +185,10 @@ def collect_myopic_statistics(
     statistics method for every year and optionally aggregates
     components, e.g. Links and Lines often should become summed up.
 
+    If the networks come with a statistics cache (see read_networks),
+    cached statistics are used instead of calling the statistics
+    method. Networks are not loaded in this case.
+
     Parameters
     ----------
     networks
@@ -180,15 +222,28 @@ def collect_myopic_statistics(
     if statistic in pypsa_statistics:  # register a default to reduce verbosity
         kwargs.setdefault("groupby", ["location", "carrier", "bus_carrier", "unit"])
 
+    # networks from read_networks() may come with an on-disk cache
+    cache = getattr(networks, "cache", None)
+
     year_statistics = []
-    for year, n in networks.items():
-        func = getattr(n.statistics, statistic)
-        assert func, (
-            f"Statistic '{statistic}' not found. "
-            f"Available statistics are: "
-            f"'{[m[0] for m in getmembers(n.statistics)]}'."
-        )
-        year_statistic = func(**kwargs)
+    for year in networks:
+        year_statistic = None
+        if cache is not None:
+            key = cache.key(networks.file_paths[year], statistic, kwargs)
+            year_statistic = cache.get(key)
+
+        if year_statistic is None:
+            n = networks[year]
+            func = getattr(n.statistics, statistic)
+            assert func, (
+                f"Statistic '{statistic}' not found. "
+                f"Available statistics are: "
+                f"'{[m[0] for m in getmembers(n.statistics)]}'."
+            )
+            year_statistic = func(**kwargs)
+            if cache is not None:
+                cache.put(key, year_statistic)
+
         year_statistic = insert_index_level(year_statistic, year, DataModel.YEAR)
         year_statistics.append(year_statistic)
 
@@ -230,6 +285,77 @@ def collect_myopic_statistics(
     return statistic.sort_index()
 
 
+class StatisticsMemo:
+    """
+    A least recently used memo for unfiltered statistics.
+
+    The memo is shared by all networks in a session and bounded by
+    the approximate memory footprint of stored statistics. A maximum
+    size of zero disables the memo.
+
+    Parameters
+    ----------
+    max_size
+        The memory budget in megabytes.
+    """
+
+    def __init__(self, max_size: int = 0) -> None:
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def _nbytes(statistic: pd.DataFrame | pd.Series) -> int:
+        usage = statistic.memory_usage(index=True, deep=False)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+
+    def get(self, key: tuple) -> pd.DataFrame | pd.Series | None:
+        """Return a memoized statistic or None if the key is unknown."""
+        if key not in self._items:
+            return None
+        self._items.move_to_end(key)
+        return self._items[key][0]
+
+    def put(self, key: tuple, statistic: pd.DataFrame | pd.Series) -> None:
+        """Store a statistic and evict least recently used items."""
+        nbytes = self._nbytes(statistic)
+        limit = self.max_size * 2**20
+        if nbytes > limit:
+            return
+        if key in self._items:
+            self._size -= self._items.pop(key)[1]
+        self._items[key] = (statistic, nbytes)
+        self._size += nbytes
+        while self._size > limit:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self._size -= evicted
+
+    def clear(self, prefix: str = None) -> None:
+        """
+        Remove memoized statistics.
+
+        Parameters
+        ----------
+        prefix
+            Only remove keys that start with this value, i.e. the
+            statistics of a single network. Defaults to removing all.
+        """
+        for key in [k for k in self._items if prefix is None or k[0] == prefix]:
+            self._size -= self._items.pop(key)[1]
+
+
+STATISTICS_MEMO = StatisticsMemo()
+
+# Statistic filter arguments that can be answered by slicing a result
+# that is grouped by the respective index level.
+_MEMO_FILTERS = {
+    "comps": DataModel.COMPONENT,
+    "carrier": DataModel.CARRIER,
+    "bus_carrier": DataModel.BUS_CARRIER,
+}
+_MEMO_ARGUMENTS = {"groupby", "aggregate_time", "nice_names", "drop_zero"}
+
+
 class ESMStatistics(StatisticsAccessor):
     """
     Provides additional statistics for ESM evaluations.
@@ -259,6 +385,7 @@ class ESMStatistics(StatisticsAccessor):
     def __init__(self, n: pypsa.Network, result_path: Path) -> None:
         super().__init__(n)
         self.result_path = result_path
+        self._memo_id = uuid4().hex
         pypsa.options.params.statistics.nice_names = False
         pypsa.options.params.statistics.drop_zero = True
         groupers.add_grouper("location", get_location)
@@ -269,6 +396,109 @@ class ESMStatistics(StatisticsAccessor):
             "bus1", partial(get_location_from_name_at_port, location_port="1")
         )
 
+    def _memoized(self, statistic: str, **kwargs: object) -> pd.DataFrame | pd.Series:
+        """
+        Return a statistic sliced from the memoized unfiltered statistic.
+
+        The unfiltered statistic is calculated once per groupby and
+        aggregate_time combination and stored in the STATISTICS_MEMO.
+        The comps, carrier and bus_carrier filters are applied to the
+        memoized result afterward. This is only possible, if the
+        statistic is explicitly grouped by the filtered index levels.
+        Other calls are passed to the StatisticsAccessor unchanged.
+        Note, that the row order may differ from unmemoized results.
+
+        Parameters
+        ----------
+        statistic
+            The name of the StatisticsAccessor method.
+        **kwargs
+            The keyword arguments for the statistic method.
+
+        Returns
+        -------
+        :
+            The statistic as returned by the StatisticsAccessor.
+        """
+        func = getattr(super(), statistic)
+        groupby = kwargs.get("groupby")
+        groupby = [groupby] if isinstance(groupby, str) else groupby
+        filters = {k: kwargs[k] for k in _MEMO_FILTERS if kwargs.get(k) is not None}
+        if (
+            STATISTICS_MEMO.max_size <= 0
+            or not isinstance(groupby, list | tuple)
+            or not all(isinstance(g, str) for g in groupby)
+            or not set(kwargs).issubset(_MEMO_ARGUMENTS | set(_MEMO_FILTERS))
+            or any(
+                _MEMO_FILTERS[k] not in groupby
+                for k in filters
+                if k != "comps"  # component level is always returned
+            )
+        ):
+            return func(**kwargs)
+
+        unfiltered_kwargs = {k: v for k, v in kwargs.items() if k not in filters}
+        unfiltered_kwargs["groupby"] = list(groupby)
+        # zeros are dropped after slicing, because the components of zero
+        # rows still determine the name of filtered results
+        drop_zero = kwargs.get("drop_zero")
+        if drop_zero is None:
+            drop_zero = pypsa.options.params.statistics.drop_zero
+        unfiltered_kwargs["drop_zero"] = False
+        key = (
+            self._memo_id,
+            statistic,
+            tuple(groupby),
+            *sorted((k, str(v)) for k, v in unfiltered_kwargs.items()),
+        )
+        result = STATISTICS_MEMO.get(key)
+        if result is None:
+            result = func(**unfiltered_kwargs)
+            STATISTICS_MEMO.put(key, result)
+
+        if not filters:
+            sliced = result.copy()
+        else:
+            mask = np.ones(len(result), dtype=bool)
+            for argument, values in filters.items():
+                values = [values] if isinstance(values, str) else list(values)
+                level = result.index.get_level_values(_MEMO_FILTERS[argument])
+                mask &= level.isin(values)
+            sliced = result.loc[mask]
+
+        # mimic the StatisticsAccessor output format for filtered calls
+        if filters and isinstance(sliced, pd.Series):
+            # series are named after the snapshot weightings of their
+            # components, if all components share the same weightings
+            comps = sliced.index.unique(DataModel.COMPONENT)
+            names = {get_weightings(self._n, c).name for c in comps}
+            sliced.name = names.pop() if len(names) == 1 else None
+        if drop_zero:
+            sliced = sliced[sliced != 0]
+        sliced.attrs = dict(result.attrs)
+        if isinstance(filters.get("comps"), str):
+            sliced = sliced.droplevel(DataModel.COMPONENT)
+        if statistic == "energy_balance" and "bus_carrier" in filters:
+            sliced.attrs["unit"] = self._n.bus_carrier_unit(filters["bus_carrier"])
+
+        return sliced
+
+    def clear_memo(self) -> None:
+        """Remove all memoized statistics of this network."""
+        STATISTICS_MEMO.clear(self._memo_id)
+
+    def supply(self, **kwargs: object) -> pd.DataFrame | pd.Series:
+        """Calculate the supply using memoized results if possible."""
+        return self._memoized("supply", **kwargs)
+
+    def withdrawal(self, **kwargs: object) -> pd.DataFrame | pd.Series:
+        """Calculate the withdrawal using memoized results if possible."""
+        return self._memoized("withdrawal", **kwargs)
+
+    def energy_balance(self, **kwargs: object) -> pd.DataFrame | pd.Series:
+        """Calculate the energy balance using memoized results if possible."""
+        return self._memoized("energy_balance", **kwargs)
+
     def ac_load_split(self) -> pd.DataFrame:
         """
         Split energy amounts for electricity Loads.
@@ -786,12 +786,16 @@ def operations_override(networks: dict, component: str, operation: str) -> None:
         c = n.pnl(component)
         c[_temp_key] = c["p"]  # save a copy
         c["p"] = c[operation]  # overwrite
+        if hasattr(n.statistics, "clear_memo"):
+            n.statistics.clear_memo()  # memoized statistics use the original 'p'
 
     yield  # run anything in the with statement
 
     for n in networks.values():
         c = n.pnl(component)
         c["p"] = c.pop(_temp_key)  # restore original
+        if hasattr(n.statistics, "clear_memo"):
+            n.statistics.clear_memo()
 
 
 def prettify_number(x: float) -> str:
@@ -847,30 +851,21 @@ def add_grid_lines(buses: pd.DataFrame, statistic: pd.Series) -> pd.DataFrame:
 
     bus0 = statistic.index.get_level_values("bus0").str.strip()
     bus1 = statistic.index.get_level_values("bus1").str.strip()
-    ac_buses = filter_by(buses, carrier="AC")[["x", "y"]]
+    ac_buses = filter_by(buses, carrier="AC")[["y", "x"]]
 
-    def _get_bus_lines(_nodes: tuple[str]) -> np.ndarray:
-        """
-        Draw a line between buses using AC bus coordinates.
-
-        Note, that only AC buses have coordinates assigned.
-
-        Parameters
-        ----------
-        _nodes
-            The start node name and the end node name in a tuple.
-
-        Returns
-        -------
-        :
-            A one dimensional array with lists of coordinate pairs,
-            i.e. grid lines.
-        """
-        return ac_buses.loc[[*_nodes]][["y", "x"]].values.tolist()
+    # look up the coordinates of all start and end nodes at once.
+    # Note, that only AC buses have coordinates assigned.
+    pos0 = ac_buses.index.get_indexer(bus0)
+    pos1 = ac_buses.index.get_indexer(bus1)
+    if missing := set(bus0[pos0 == -1]) | set(bus1[pos1 == -1]):
+        raise KeyError(f"{sorted(missing)} not in index")
 
     # generate lines [(x0, y0), (x1,y1)] between buses for every
-    # row in grid and store it in a new column
-    statistic["line"] = [*map(_get_bus_lines, zip(bus0, bus1, strict=True))]
+    # row in grid and store it in a new column. The (N, 2, 2) array
+    # is converted to nested lists as expected by folium.
+    coords = ac_buses.to_numpy()
+    lines = np.stack([coords[pos0], coords[pos1]], axis=1)
+    statistic["line"] = lines.tolist()
 
     return statistic
 
@@ -881,6 +876,11 @@ def align_edge_directions(
     """
     Align the directionality of edges between two nodes.
 
+    Edges between the same two nodes but in reversed direction become
+    aligned to the direction that is sorted first, i.e. the edge with
+    the smaller node name in lvl0 keeps its direction and the values of
+    the reversed edge are swapped.
+
     Parameters
     ----------
     df
@@ -896,37 +896,24 @@ def align_edge_directions(
         The input data frame with aligned edge directions between the
         nodes in lvl1 and lvl0.
     """
-    seen = []
-
-    def _reverse_values_if_seen(df_slice: pd.DataFrame) -> pd.DataFrame:
-        """
-        Reverse index levels if they have a duplicated permutation.
-
-        Parameters
-        ----------
-        df_slice
-            A slice of a data frame with the bus0 and bus1 index level.
-
-        Returns
-        -------
-        :
-            The slice with exchanged level values if the combination of
-            lvl1 and lvl2 is not unique and the original slice
-            otherwise.
-        """
-        buses = {df_slice.index.unique(lvl0)[0], df_slice.index.unique(lvl1)[0]}
-        if buses in seen:
-            reversed_slice = df_slice.swaplevel(lvl0, lvl1)
-            # keep original names since we only want to swap values
-            reversed_slice.index.names = df_slice.index.names
-            return reversed_slice
-        else:
-            seen.append(buses)
-            return df_slice
+    bus0 = df.index.get_level_values(lvl0)
+    bus1 = df.index.get_level_values(lvl1)
 
-    return df.groupby([lvl0, lvl1], group_keys=False).apply(
-        _reverse_values_if_seen,
-    )
+    # canonical bus pair keys: integer codes in sort order of node names
+    codes, _ = pd.factorize(np.concatenate([bus0, bus1]), sort=True)
+    code0, code1 = np.split(codes, 2)
+    edges = pd.MultiIndex.from_arrays([code0, code1])
+    has_reversed = pd.MultiIndex.from_arrays([code1, code0]).isin(edges)
+    swap = has_reversed & (code0 > code1)
+
+    if not swap.any():
+        return df
+
+    levels = [df.index.get_level_values(i) for i in range(df.index.nlevels)]
+    levels[df.index.names.index(lvl0)] = bus0.where(~swap, bus1)
+    levels[df.index.names.index(lvl1)] = bus1.where(~swap, bus0)
+
+    return df.set_axis(pd.MultiIndex.from_arrays(levels, names=df.index.names))
 
 
 def _split_trade_saldo_to_netted_import_export(df: pd.DataFrame) -> pd.DataFrame:
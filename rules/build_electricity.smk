@@ -285,6 +285,8 @@ def input_ua_md_availability_matrix(w):
 rule determine_availability_matrix:
     params:
         renewable=config_provider("renewable"),
+        availability=config_provider("atlite", "availability"),
+        checkpoints=resources("availability_checkpoints"),
     input:
         unpack(input_ua_md_availability_matrix),
         corine=ancient("data/bundle/corine/g250_clc06_V18_5.tif"),
@@ -343,6 +345,9 @@ rule build_renewable_profiles:
         snapshots=config_provider("snapshots"),
         drop_leap_day=config_provider("enable", "drop_leap_day"),
         renewable=config_provider("renewable"),
+        cache_distances=config_provider("atlite", "cache_distances"),
+        cache_conversions=config_provider("atlite", "cache_conversions"),
+        distance_cache=resources("distance_matrices"),
     input:
         availability_matrix=resources("availability_matrix_{clusters}_{technology}.nc"),
         offshore_shapes=resources("offshore_shapes.geojson"),
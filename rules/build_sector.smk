@@ -1212,6 +1212,8 @@ rule time_aggregation:
         time_resolution=config_provider("clustering", "temporal", "resolution_sector"),
         drop_leap_day=config_provider("enable", "drop_leap_day"),
         solver_name=config_provider("solving", "solver", "name"),
+        segmentation=config_provider("clustering", "temporal", "segmentation"),
+        segmentation_cache=resources("time_segmentation"),
     input:
         network=resources("networks/base_s_{clusters}_elec_{opts}.nc"),
         hourly_heat_demand_total=lambda w: (
@@ -1460,9 +1462,15 @@ rule prepare_sector_network:
     resources:
         mem_mb=2000,
     log:
-        logs(
+        python=logs(
             "prepare_sector_network_base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}.log"
         ),
+        memory=logs(
+            "prepare_sector_network_base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_memory.log"
+        ),
+        memory_phases=logs(
+            "prepare_sector_network_base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_memory.json"
+        ),
     benchmark:
         benchmarks(
             "prepare_sector_network/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}"
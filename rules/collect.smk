@@ -10,6 +10,7 @@ localrules:
     prepare_sector_networks,
     solve_elec_networks,
     solve_sector_networks,
+    make_benchmark_report,
 
 
 rule cluster_networks:
@@ -154,3 +154,40 @@ def input_cutout(wildcards, cutout_names="default"):
         return [CDIR.joinpath(cn + ".nc").as_posix() for cn in cutout_names]
     else:
         return CDIR.joinpath(cutout_names + ".nc").as_posix()
+
+
+def benchmark_files(w):
+    """
+    Map the benchmark files of a run to the rule, wildcards and memory log of
+    the job that wrote them.
+
+    Evaluated when the job is scheduled, so rules using it must run after
+    the run they report on.
+    """
+    patterns = {r: r.benchmark for r in workflow.rules if r.benchmark}
+    roots = {os.path.dirname(str(p).split("{")[0]) for p in patterns.values()}
+
+    files = {}
+    for root in sorted(filter(None, roots)):
+        for dirpath, _, filenames in os.walk(root):
+            for fn in filenames:
+                path = os.path.join(dirpath, fn)
+                if path in files:
+                    continue
+                for r, pattern in patterns.items():
+                    match = pattern.match(path)
+                    if match is None:
+                        continue
+                    wildcards = match.groupdict()
+                    if wildcards.get("run", w.get("run")) != w.get("run"):
+                        break
+                    memory = r.log.get("memory")
+                    if memory is not None:
+                        memory = str(memory.apply_wildcards(wildcards))
+                    files[path] = {
+                        "rule": r.name,
+                        "wildcards": wildcards,
+                        "memory": memory,
+                    }
+                    break
+    return files
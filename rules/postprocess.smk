@@ -576,3 +576,22 @@ rule plot_base_statistics:
         + "figures/.statistics_plots_base_s_{clusters}_elec_{opts}",
     script:
         "../scripts/plot_statistics.py"
+
+
+rule make_benchmark_report:
+    """
+    Collect the benchmarks of a finished run into a table and HTML report.
+
+    Run after the workflow with ``snakemake make_benchmark_report -f``; the
+    requested resources are only reported if the workflow ran with
+    ``--benchmark-extended``.
+    """
+    params:
+        benchmarks=benchmark_files,
+    output:
+        table=RESULTS + "csvs/benchmarks.csv",
+        report=RESULTS + "benchmark_report.html",
+    log:
+        RESULTS + "logs/make_benchmark_report.log",
+    script:
+        "../scripts/make_benchmark_report.py"
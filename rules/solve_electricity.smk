@@ -21,6 +21,7 @@ rule solve_network:
             RESULTS + "logs/solve_network/base_s_{clusters}_elec_{opts}_solver.log"
         ),
         memory=RESULTS + "logs/solve_network/base_s_{clusters}_elec_{opts}_memory.log",
+        memory_phases=RESULTS + "logs/solve_network/base_s_{clusters}_elec_{opts}_memory.json",
         python=RESULTS + "logs/solve_network/base_s_{clusters}_elec_{opts}_python.log",
     benchmark:
         (RESULTS + "benchmarks/solve_network/base_s_{clusters}_elec_{opts}")
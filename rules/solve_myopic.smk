@@ -134,6 +134,14 @@ rule add_brownfield:
 ruleorder: add_existing_baseyear > add_brownfield
 
 
+def input_warm_start_network(w):
+    enable = config_provider("solving", "options", "warm_start", "enable", default=False)
+    planning_horizons = config_provider("scenario", "planning_horizons")(w)
+    if not enable(w) or int(w.planning_horizons) == planning_horizons[0]:
+        return []
+    return solved_previous_horizon(w)
+
+
 rule solve_sector_network_myopic:
     params:
         solving=config_provider("solving"),
@@ -149,6 +157,7 @@ rule solve_sector_network_myopic:
         ),
         co2_totals_name=resources("co2_totals.csv"),
         energy_totals=resources("energy_totals.csv"),
+        network_p=input_warm_start_network,  # solved network at previous time step
     output:
         network=RESULTS
         + "networks/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}.nc",
@@ -161,6 +170,8 @@ rule solve_sector_network_myopic:
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_solver.log",
         memory=RESULTS
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_memory.log",
+        memory_phases=RESULTS
+        + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_memory.json",
         python=RESULTS
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_python.log",
     threads: solver_threads
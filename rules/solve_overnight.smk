@@ -27,6 +27,8 @@ rule solve_sector_network:
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_solver.log",
         memory=RESULTS
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_memory.log",
+        memory_phases=RESULTS
+        + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_memory.json",
         python=RESULTS
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_{planning_horizons}_python.log",
     threads: solver_threads
@@ -122,6 +122,8 @@ rule solve_sector_network_perfect:
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_brownfield_all_years_python.log",
         memory=RESULTS
         + "logs/base_s_{clusters}_{opts}_{sector_opts}_brownfield_all_years_memory.log",
+        memory_phases=RESULTS
+        + "logs/base_s_{clusters}_{opts}_{sector_opts}_brownfield_all_years_memory.json",
     benchmark:
         (
             RESULTS
@@ -2,11 +2,14 @@
 #
 # SPDX-License-Identifier: MIT
 
+import json
 import logging
 import os
 import signal
 import sys
 import time
+from contextlib import contextmanager
+from functools import wraps
 
 from memory_profiler import _get_memory, choose_backend
 
@@ -19,11 +22,31 @@ except ImportError:
     from multiprocessing.dummy import Pipe, Process
 
 
+def _get_peak_memory(pid):
+    """
+    Return the peak resident memory of a process in MiB, or None if the
+    platform does not track it.
+
+    The high-water mark is only read, never reset, so that it stays valid
+    for ``getrusage`` and ``time -v``. It ignores subprocesses.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            peak = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration, ValueError):
+        return None
+    return peak / 1024
+
+
 # The memory logging facilities have been adapted from memory_profiler
 class MemTimer(Process):
     """
     Write memory consumption over a time interval to file until signaled to
     stop on the pipe.
+
+    Phases are announced on the pipe as tuples of name and start time. The
+    measurements are attributed to the running phase and a measurement is
+    taken immediately at each phase boundary.
     """
 
     def __init__(
@@ -55,6 +78,10 @@ class MemTimer(Process):
 
         n_measurements = 1
         mem_usage = cur_mem if self.max_usage else [cur_mem]
+        timeline = []
+        phase = None
+        # a rising high-water mark shows a peak since the previous measurement
+        last_peak = _get_peak_memory(self.monitor_pid) or 0.0
 
         if self.filename is not None:
             stream = open(self.filename, "w")
@@ -83,16 +110,42 @@ class MemTimer(Process):
             else:
                 mem_usage = max(cur_mem, mem_usage)
 
+            # attribute the measurement to the running phase and start the
+            # next phase with it, if one was announced
+            mem = cur_mem[0] if self.timestamps else cur_mem
+            peak = _get_peak_memory(self.monitor_pid) or 0.0
+            if peak > last_peak:
+                mem = max(mem, peak)
+                last_peak = peak
+            if timeline and timeline[-1]["end"] is None:
+                timeline[-1]["peak"] = max(timeline[-1]["peak"], mem)
+            if phase is not None:
+                name, start = phase
+                if timeline and timeline[-1]["end"] is None:
+                    timeline[-1]["end"] = start
+                if name is not None:
+                    timeline.append(dict(name=name, start=start, end=None, peak=mem))
+                phase = None
+
             if stop:
                 break
-            stop = self.pipe.poll(self.interval)
+            if self.pipe.poll(self.interval):
+                message = self.pipe.recv()
+                if isinstance(message, tuple):
+                    phase = message
+                else:
+                    stop = True
             # do one more iteration
 
         if stream is not None:
             stream.close()
 
+        if timeline and timeline[-1]["end"] is None:
+            timeline[-1]["end"] = time.time()
+
         self.pipe.send(mem_usage)
         self.pipe.send(n_measurements)
+        self.pipe.send(timeline)
 
 
 class memory_logger:
@@ -114,6 +167,9 @@ class memory_logger:
         a file timestamps are always kept (defaults to True)
     include_children : bool
         Whether the memory of subprocesses is to be included (default: True)
+    phases_filename : None|str
+        Name of the JSON file to write the duration and peak memory of the
+        phases to, if None no file is written (defaults to None)
 
     Arguments
     ---------
@@ -122,6 +178,9 @@ class memory_logger:
     mem_usage : (float, float)|[(float, float)]
         All memory measurements and timestamps (if timestamps was True) or only
         the maximum memory usage and its timestamp
+    phases : [dict]
+        Name, start, end, duration and peak memory in MiB of the phases in
+        the order in which they ran
 
     Note
     ----
@@ -132,7 +191,10 @@ class memory_logger:
     -------
     with memory_logger(filename="memory.log", max_usage=True) as mem:
         # Do a lot of long running memory intensive stuff
-        hard_memory_bound_stuff()
+        with mem.phase("build"):
+            build_memory_bound_stuff()
+        with mem.phase("solve"):
+            hard_memory_bound_stuff()
 
     max_mem, timestamp = mem.mem_usage
     """
@@ -144,6 +206,7 @@ class memory_logger:
         max_usage=True,
         timestamps=True,
         include_children=True,
+        phases_filename=None,
     ):
         if filename is not None:
             timestamps = True
@@ -153,6 +216,8 @@ class memory_logger:
         self.max_usage = max_usage
         self.timestamps = timestamps
         self.include_children = include_children
+        self.phases_filename = phases_filename
+        self.current_phase = None
 
     def __enter__(self):
         backend = choose_backend()
@@ -174,16 +239,116 @@ class memory_logger:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if exc_type is None:
+        # the phases are also written if the context fails, as they show
+        # where the failure occurred
+        try:
             self.parent_conn.send(0)  # finish timing
 
             self.mem_usage = self.parent_conn.recv()
             self.n_measurements = self.parent_conn.recv()
-        else:
+            self.phases = [
+                dict(phase, duration=phase["end"] - phase["start"])
+                for phase in self.parent_conn.recv()
+            ]
+            self.p.join()
+        except Exception:
+            if exc_type is None:
+                raise
             self.p.terminate()
+            return False
+
+        if self.phases_filename is not None:
+            with open(self.phases_filename, "w") as f:
+                json.dump(summarize_phases(self.phases), f, indent=2)
 
         return False
 
+    def set_phase(self, name):
+        """
+        Start the phase `name`, which lasts until the next phase starts or
+        the measurements stop. A name of None ends the current phase.
+        """
+        self.current_phase = name
+        self.parent_conn.send((name, time.time()))
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Context manager for the phase `name`, after which the enclosing
+        phase continues.
+        """
+        previous = self.current_phase
+        self.set_phase(name)
+        try:
+            yield self
+        finally:
+            self.set_phase(previous)
+
+
+def summarize_phases(phases):
+    """
+    Aggregate the duration and peak memory of repeated phases.
+
+    Parameters
+    ----------
+    phases : [dict]
+        Phases as recorded by `memory_logger`.
+
+    Returns
+    -------
+    dict
+        The peak memory in MiB over all phases, the aggregated phases in the
+        order of their first start and the individual phases.
+    """
+    summary = {}
+    for phase in phases:
+        entry = summary.setdefault(
+            phase["name"], dict(name=phase["name"], calls=0, duration=0.0, peak=0.0)
+        )
+        entry["calls"] += 1
+        entry["duration"] += phase["duration"]
+        entry["peak"] = max(entry["peak"], phase["peak"])
+    return dict(
+        peak=max((phase["peak"] for phase in phases), default=None),
+        phases=list(summary.values()),
+        timeline=phases,
+    )
+
+
+@contextmanager
+def phase_hooks(mem, phases):
+    """
+    Mark all calls of the given functions as phases of a `memory_logger` for
+    the duration of the context.
+
+    Parameters
+    ----------
+    mem : memory_logger
+        The running memory logger.
+    phases : dict
+        Maps the phase names to lists of `(owner, name)` tuples of the
+        functions, where owner is the class or module defining the function.
+    """
+    originals = []
+
+    def hook(name, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with mem.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    try:
+        for name, functions in phases.items():
+            for owner, attr in functions:
+                originals.append((owner, attr, vars(owner)[attr]))
+                setattr(owner, attr, hook(name, getattr(owner, attr)))
+        yield mem
+    finally:
+        for owner, attr, original in reversed(originals):
+            setattr(owner, attr, original)
+
 
 class timer:
     level = 0
@@ -9,6 +9,7 @@ import logging
 import os
 import re
 import time
+from fnmatch import fnmatch
 from functools import partial, wraps
 from pathlib import Path
 from tempfile import NamedTemporaryFile
@@ -16,12 +17,14 @@ from typing import Callable, Union
 
 import atlite
 import fiona
+import numpy as np
 import pandas as pd
 import pypsa
 import pytz
 import requests
 import xarray as xr
 import yaml
+from scipy.sparse import csr_matrix
 from snakemake.utils import update_config
 from tqdm import tqdm
 
@@ -1083,3 +1086,367 @@ def load_cutout(
         cutout.data = cutout.data.sel(time=time)
 
     return cutout
+
+
+def to_sparse_availability(
+    availability: xr.DataArray | csr_matrix,
+    buses: pd.Index | None = None,
+    y: np.ndarray | None = None,
+    x: np.ndarray | None = None,
+) -> xr.Dataset:
+    """
+    Store an availability matrix as compressed sparse rows.
+
+    Parameters
+    ----------
+    availability : xr.DataArray or csr_matrix
+        Share of available area per bus and grid cell, either with dimensions
+        bus, y and x or as sparse matrix of buses and (y, x) stacked cells.
+    buses, y, x : array-like, optional
+        Coordinates of a sparse `availability`.
+
+    Returns
+    -------
+    xr.Dataset
+        The data, column indices and row pointers of the sparse matrix with
+        the bus, y and x coordinates.
+    """
+    if isinstance(availability, xr.DataArray):
+        availability = availability.transpose("bus", "y", "x")
+        buses, y, x = (availability.indexes[d] for d in ["bus", "y", "x"])
+        availability = csr_matrix(availability.values.reshape(len(buses), -1))
+    availability.sum_duplicates()
+    return xr.Dataset(
+        {
+            "data": ("nnz", availability.data),
+            "indices": ("nnz", availability.indices),
+            "indptr": ("bus_ptr", availability.indptr),
+        },
+        coords={"bus": np.asarray(buses), "y": np.asarray(y), "x": np.asarray(x)},
+        attrs={"format": "csr"},
+    )
+
+
+def load_availability_matrix(
+    fn: str, cutout: atlite.Cutout | None = None
+) -> tuple[csr_matrix, pd.Index]:
+    """
+    Load an availability matrix as sparse matrix of buses and grid cells.
+
+    Also reads dense availability matrices with dimensions bus, y and x.
+
+    Parameters
+    ----------
+    fn : str
+        Path to the availability matrix.
+    cutout : atlite.Cutout, optional
+        If given, check that the grid cells are aligned with the cutout.
+
+    Returns
+    -------
+    matrix : csr_matrix
+        Share of available area per bus and (y, x) stacked grid cell.
+    buses : pd.Index
+        The buses of the rows.
+    """
+    with xr.open_dataset(fn) as ds:
+        if ds.attrs.get("format") == "csr":
+            shape = (ds.sizes["bus"], ds.sizes["y"] * ds.sizes["x"])
+            matrix = csr_matrix(
+                (ds["data"].values, ds["indices"].values, ds["indptr"].values),
+                shape=shape,
+            )
+        else:
+            da = next(iter(ds.data_vars.values())).transpose("bus", "y", "x")
+            matrix = csr_matrix(da.values.reshape(da.sizes["bus"], -1))
+        buses = ds.indexes["bus"]
+        coords = ds["y"].values, ds["x"].values
+
+    if cutout is not None and not (
+        np.allclose(coords[0], cutout.coords["y"])
+        and np.allclose(coords[1], cutout.coords["x"])
+    ):
+        raise ValueError(f"Availability matrix {fn} is not aligned with the cutout.")
+    return matrix, buses
+
+
+INTERNED_PREFIX = "interned_"
+
+
+def intern_duplicate_profiles(ds: xr.Dataset) -> xr.Dataset:
+    """
+    Store identical time series of a network dataset only once.
+
+    For every time-varying attribute with duplicate columns, only the first
+    occurrence of each profile is kept. A variable ``interned_{name}`` maps
+    every original column to the column holding its profile.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Dataset as returned by ``pypsa.Network.export_to_netcdf``.
+
+    Returns
+    -------
+    xr.Dataset
+        Dataset with deduplicated time series.
+    """
+    for name in list(ds.data_vars):
+        da = ds[name]
+        if "_t_" not in name or da.ndim != 2 or da.dtype.kind not in "fiub":
+            continue
+        dim = da.dims[1]
+        columns = np.ascontiguousarray(da.values.T)
+        keys = columns.view(np.dtype((np.void, columns.itemsize * columns.shape[1])))
+        _, first, inverse = np.unique(
+            keys.ravel(), return_index=True, return_inverse=True
+        )
+        if len(first) == len(columns):
+            continue
+
+        index = da.indexes[dim]
+        profiles = da.isel({dim: np.sort(first)})
+        profiles.encoding = da.encoding
+        ds = ds.drop_vars([name, dim])
+        ds[name] = profiles
+        ds[INTERNED_PREFIX + name] = xr.DataArray(
+            index[first][inverse.ravel()].to_numpy(dtype=str),
+            coords={INTERNED_PREFIX + dim: index.to_numpy(dtype=str)},
+        )
+
+    return ds
+
+
+def expand_interned_profiles(ds: xr.Dataset) -> xr.Dataset:
+    """
+    Restore time series deduplicated by ``intern_duplicate_profiles``.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Dataset with interned time series.
+
+    Returns
+    -------
+    xr.Dataset
+        Dataset with one column per component for every time series.
+    """
+    for interned in [v for v in ds.data_vars if v.startswith(INTERNED_PREFIX)]:
+        name = interned[len(INTERNED_PREFIX) :]
+        dim = ds[name].dims[1]
+        mapping = ds[interned].to_series()
+        profiles = ds[name].sel({dim: mapping.to_numpy()})
+        profiles = profiles.assign_coords({dim: mapping.index.to_numpy()})
+        ds = ds.drop_vars([interned, INTERNED_PREFIX + dim, name, dim])
+        ds[name] = profiles
+
+    return ds
+
+
+def apply_export_profile(
+    ds: xr.Dataset,
+    n: pypsa.Network,
+    float32: bool = False,
+    skip: list[str] | None = None,
+) -> xr.Dataset:
+    """
+    Reduce the storage size of time series in a network dataset.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Dataset as returned by ``pypsa.Network.export_to_netcdf``.
+    n : pypsa.Network
+        The exported network, used to look up output attributes.
+    float32 : bool, default False
+        Whether to downcast output time series, e.g. ``generators_t_p``,
+        to float32. Input time series keep their precision.
+    skip : list of str, optional
+        Shell-style patterns of time series to drop, e.g. ``*_t_mu_*``.
+
+    Returns
+    -------
+    xr.Dataset
+        Dataset with the export profile applied.
+    """
+    series = [v for v in ds.data_vars if "_t_" in v]
+
+    if skip:
+        dropped = [v for v in series if any(fnmatch(v, p) for p in skip)]
+        ds = ds.drop_vars(dropped)
+        series = [v for v in series if v not in dropped]
+
+    if float32:
+        outputs = {
+            f"{c.list_name}_t_{attr}"
+            for c in n.iterate_components()
+            for attr in c.attrs.index[c.attrs.status == "Output"]
+        }
+        for name in series:
+            if name in outputs and ds[name].dtype == np.float64:
+                encoding = ds[name].encoding
+                ds[name] = ds[name].astype(np.float32)
+                ds[name].encoding = encoding
+
+    return ds
+
+
+def set_chunk_encoding(ds: xr.Dataset, chunks: dict) -> xr.Dataset:
+    """
+    Store time series of a network dataset in chunks.
+
+    Chunking allows reading single components or periods without
+    decompressing the whole variable.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Dataset as returned by ``pypsa.Network.export_to_netcdf``.
+    chunks : dict
+        Chunk sizes with the keys ``snapshots`` and ``components``. Missing
+        or empty values store the whole dimension in one chunk.
+
+    Returns
+    -------
+    xr.Dataset
+        Dataset with chunk sizes in the variable encodings.
+    """
+    sizes = [chunks.get("snapshots"), chunks.get("components")]
+    for name in ds.data_vars:
+        shape = ds[name].shape
+        if "_t_" not in name or len(shape) != 2 or 0 in shape:
+            continue
+        ds[name].encoding["chunksizes"] = tuple(
+            min(size or length, length) for size, length in zip(sizes, shape)
+        )
+
+    return ds
+
+
+def export_network(
+    n: pypsa.Network,
+    path: str | Path,
+    intern_profiles: bool = False,
+    export_profile: dict | None = None,
+) -> None:
+    """
+    Export a network to NetCDF with optional storage optimisations.
+
+    Networks exported with ``intern_profiles`` must be read with
+    ``load_network``; plain ``pypsa.Network`` only sees the unique profiles.
+
+    Parameters
+    ----------
+    n : pypsa.Network
+        Network to export.
+    path : str or Path
+        Path of the NetCDF file.
+    intern_profiles : bool, default False
+        Whether to deduplicate identical time series.
+    export_profile : dict, optional
+        Storage settings with the keys ``compression``, passed as NetCDF
+        encoding, ``float32`` and ``skip``, passed to
+        ``apply_export_profile``, and ``chunks``, passed to
+        ``set_chunk_encoding``.
+    """
+    export_profile = export_profile or {}
+    if not intern_profiles and not export_profile:
+        n.export_to_netcdf(path)
+        return
+
+    ds = n.export_to_netcdf(compression=export_profile.get("compression"))
+    ds = apply_export_profile(
+        ds,
+        n,
+        float32=export_profile.get("float32", False),
+        skip=export_profile.get("skip"),
+    )
+    if intern_profiles:
+        ds = intern_duplicate_profiles(ds)
+    if export_profile.get("chunks"):
+        ds = set_chunk_encoding(ds, export_profile["chunks"])
+    ds.to_netcdf(path)
+
+
+def select_network_variables(
+    ds: xr.Dataset,
+    list_names: dict[str, str],
+    components: list[str] | None = None,
+    series: list[str] | None = None,
+) -> xr.Dataset:
+    """
+    Drop network variables that are not required before they are read.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Lazily opened network dataset.
+    list_names : dict
+        Mapping of component names to their list names, e.g. ``buses``.
+    components : list of str, optional
+        Components to keep, e.g. ``["Bus", "Link"]``. Keeps all if None.
+    series : list of str, optional
+        Time-varying attributes to keep, e.g. ``["p0", "marginal_price"]``.
+        Keeps all if None.
+
+    Returns
+    -------
+    xr.Dataset
+        Dataset with the selected variables.
+    """
+    keep = set(
+        list_names.values() if components is None else map(list_names.get, components)
+    )
+    # match longer list names first, e.g. line_types before lines
+    prefixes = sorted(list_names.values(), key=len, reverse=True)
+
+    dropped = []
+    for name in list(ds.data_vars) + list(ds.coords):
+        variable = name.removeprefix(INTERNED_PREFIX)
+        list_name = next((p for p in prefixes if variable.startswith(p + "_")), None)
+        if list_name is None:
+            continue
+        attr = variable[len(list_name) + 1 :]
+        if list_name not in keep:
+            dropped.append(name)
+        elif series is not None and attr.startswith("t_"):
+            if attr.removesuffix("_i")[2:] not in series:
+                dropped.append(name)
+
+    return ds.drop_vars(dropped)
+
+
+def load_network(
+    path: str | Path,
+    components: list[str] | None = None,
+    series: list[str] | None = None,
+) -> pypsa.Network:
+    """
+    Load a network from NetCDF and expand interned time series.
+
+    Scripts that only need some components or time series can declare
+    them to skip reading the other variables of the file.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the NetCDF file.
+    components : list of str, optional
+        Components to load, e.g. ``["Bus", "Link", "Carrier"]``. Loads all
+        components if None.
+    series : list of str, optional
+        Time-varying attributes to load for all components, e.g.
+        ``["p", "p0", "marginal_price"]``. Loads all if None.
+
+    Returns
+    -------
+    pypsa.Network
+        The loaded network.
+    """
+    n = pypsa.Network()
+    with xr.open_dataset(path) as ds:
+        if components is not None or series is not None:
+            list_names = {c: n.components[c].list_name for c in n.all_components}
+            ds = select_network_variables(ds, list_names, components, series)
+        n.import_from_netcdf(expand_interned_profiles(ds))
+    return n
@@ -14,7 +14,9 @@ import xarray as xr
 
 from scripts._helpers import (
     configure_logging,
+    export_network,
     get_snapshots,
+    load_network,
     sanitize_custom_columns,
     set_scenario_config,
     update_config_from_wildcards,
@@ -347,13 +349,13 @@ if __name__ == "__main__":
 
     year = int(snakemake.wildcards.planning_horizons)
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     adjust_renewable_profiles(n, snakemake.input, snakemake.params, year)
 
     add_build_year_to_new_assets(n, year)
 
-    n_p = pypsa.Network(snakemake.input.network_p)
+    n_p = load_network(snakemake.input.network_p)
 
     update_heat_pump_efficiency(n, n_p, year)
 
@@ -375,4 +377,8 @@ if __name__ == "__main__":
 
     sanitize_custom_columns(n)
     sanitize_carriers(n, snakemake.config)
-    n.export_to_netcdf(snakemake.output[0])
+    export_network(
+        n,
+        snakemake.output[0],
+        intern_profiles=snakemake.config["run"]["intern_profiles"],
+    )
@@ -19,6 +19,8 @@ import xarray as xr
 
 from scripts._helpers import (
     configure_logging,
+    export_network,
+    load_network,
     sanitize_custom_columns,
     set_scenario_config,
     update_config_from_wildcards,
@@ -1120,7 +1122,7 @@ if __name__ == "__main__":
 
     baseyear = snakemake.params.baseyear
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     # define spatial resolution of carriers
     spatial = define_spatial(n.buses[n.buses.carrier == "AC"].index, options)
@@ -1185,4 +1187,8 @@ if __name__ == "__main__":
 
     sanitize_custom_columns(n)
     sanitize_carriers(n, snakemake.config)
-    n.export_to_netcdf(snakemake.output[0])
+    export_network(
+        n,
+        snakemake.output[0],
+        intern_profiles=snakemake.config["run"]["intern_profiles"],
+    )
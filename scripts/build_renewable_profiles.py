@@ -65,6 +65,10 @@ assume more generators are installed at cells with a higher capacity factor.
 Based on the average capacity factor, the potentials are further divided into a
 configurable number of resource classes (bins).
 
+Since each region only overlaps with a few grid cells, the availability matrix,
+the resource classes and the layout are kept as sparse matrices of the
+``(bus, bin)`` pairs and the grid cells throughout.
+
 .. image:: img/offwinddc-gridcell.png
     :scale: 50 %
     :align: center
@@ -86,22 +90,48 @@ the weather data cutout from ``atlite``.
 
 The maximal installable potential for the node (`p_nom_max`) is computed by
 adding up the installable potentials of the individual grid cells.
+
+With ``atlite: cache_conversions`` enabled, the hub-height wind speeds and the
+irradiation on the tilted panels are stored in a directory next to the cutout
+and reused by all model years and technologies with the same hub height or
+panel orientation, such that only the power curve or panel model is evaluated
+for each of them.
 """
 
+import hashlib
+import json
 import logging
+import os
 import time
-from itertools import product
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
 
+import atlite
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import shapely
 import xarray as xr
 from atlite.gis import ExclusionContainer
-from dask.distributed import Client
+from atlite.pv.irradiation import TiltedIrradiation
+from atlite.pv.orientation import SurfaceOrientation, get_orientation
+from atlite.pv.solar_panel_model import SolarPanelModel
+from atlite.pv.solar_position import SolarPosition
+from atlite.resource import (
+    get_solarpanelconfig,
+    get_windturbineconfig,
+    windturbine_smooth,
+)
+from atlite.wind import extrapolate_wind_speed
+from rasterio.features import shapes
+from rasterio.transform import Affine
+from scipy.sparse import csr_matrix, load_npz, save_npz, vstack
 
 from scripts._helpers import (
     configure_logging,
     get_snapshots,
+    load_availability_matrix,
     load_cutout,
     set_scenario_config,
 )
@@ -109,6 +139,425 @@ from scripts.build_shapes import _simplify_polys
 
 logger = logging.getLogger(__name__)
 
+CONVERSION_PARAMS = {
+    "wind": ["turbine", "smooth", "add_cutout_windspeed", "interpolation_method"],
+    "pv": ["panel", "orientation", "tracking", "clearsky_model", "trigon_model"],
+}
+
+
+def get_indicator_matrix(
+    cutout: atlite.Cutout, regions: gpd.GeoSeries, chunksize: int = 10
+) -> csr_matrix:
+    """
+    Indicate which grid cells touch which regions.
+
+    Equivalent to the ceiled availability matrix of the regions without
+    exclusions, but computed for a few regions at a time, so that no dense
+    array over all regions and grid cells is allocated.
+
+    Parameters
+    ----------
+    cutout : atlite.Cutout
+        Cutout defining the grid cells.
+    regions : gpd.GeoSeries
+        Regions indexed by bus.
+    chunksize : int
+        Number of regions rasterized at once.
+
+    Returns
+    -------
+    csr_matrix
+        One for the grid cells touching each region, stacked over y and x.
+    """
+    excluder = ExclusionContainer()
+    chunks = [csr_matrix((0, len(cutout.grid)))]
+    for i in range(0, len(regions), chunksize):
+        chunk = cutout.availabilitymatrix(regions.iloc[i : i + chunksize], excluder)
+        chunks.append(csr_matrix(np.ceil(chunk.values.reshape(len(chunk), -1))))
+    return vstack(chunks, format="csr")
+
+
+def get_class_masks(
+    capacity_factor: np.ndarray,
+    indicator: csr_matrix,
+    nbins: int,
+    epsilon: float = 1e-3,
+) -> csr_matrix:
+    """
+    Assign the grid cells of each region to resource classes.
+
+    The range of capacity factors of the cells touching a region is divided
+    into `nbins` equally wide classes.
+
+    Parameters
+    ----------
+    capacity_factor : np.ndarray
+        Capacity factor of each grid cell, stacked over y and x.
+    indicator : csr_matrix
+        Non-zero for the grid cells touching each region.
+    nbins : int
+        Number of resource classes.
+    epsilon : float
+        Margin added to the range of capacity factors of each region.
+
+    Returns
+    -------
+    csr_matrix
+        Masks of the grid cells per region and resource class, with the row
+        ``i * nbins + bin`` for the region ``i``.
+    """
+    nbuses, ncells = indicator.shape
+    rows, cells = indicator.nonzero()
+    cf = capacity_factor[cells]
+    valid = ~np.isnan(cf)
+    rows, cells, cf = rows[valid], cells[valid], cf[valid]
+
+    cf_min = np.full(nbuses, np.inf, dtype=cf.dtype)
+    cf_max = np.full(nbuses, -np.inf, dtype=cf.dtype)
+    np.minimum.at(cf_min, rows, cf)
+    np.maximum.at(cf_max, rows, cf)
+    cf_min, cf_max = cf_min - epsilon, cf_max + epsilon
+    normed_bins = np.linspace(0, 1, nbins + 1)
+    bins = cf_min[:, None] + (cf_max - cf_min)[:, None] * normed_bins
+
+    # each cell falls into the class of the highest lower edge below it
+    bin_ids = (cf[:, None] >= bins[rows, 1:nbins]).sum(axis=1)
+    return csr_matrix(
+        (np.ones(len(rows), dtype=bool), (rows * nbins + bin_ids, cells)),
+        shape=(nbuses * nbins, ncells),
+    )
+
+
+def get_class_regions(
+    class_masks: csr_matrix,
+    resource_regions: gpd.GeoSeries,
+    nbins: int,
+    cutout: atlite.Cutout,
+) -> gpd.GeoSeries:
+    """
+    Build the geometries of the resource classes of each region.
+
+    The resource classes of the grid cells of each region are polygonized in
+    one pass and the resulting class geometries of all regions are clipped
+    to the regions at once.
+
+    Parameters
+    ----------
+    class_masks : csr_matrix
+        Masks of the grid cells per region and resource class as returned by
+        :func:`get_class_masks`.
+    resource_regions : gpd.GeoSeries
+        Regions in the order of the rows of `class_masks`.
+    nbins : int
+        Number of resource classes.
+    cutout : atlite.Cutout
+        Cutout of the grid cells.
+
+    Returns
+    -------
+    gpd.GeoSeries
+        Geometry of each resource class, indexed by bus and bin.
+    """
+    masks = class_masks.tocoo()
+    cells = pd.DataFrame(
+        np.column_stack(
+            [*np.divmod(masks.row, nbins), *np.divmod(masks.col, cutout.shape[1])]
+        ),
+        columns=["bus", "bin", "y", "x"],
+    )
+
+    geometries = np.full(class_masks.shape[0], None, dtype=object)
+    for i, group in cells.groupby("bus"):
+        y0, x0 = group["y"].min(), group["x"].min()
+        raster = np.zeros(
+            (group["y"].max() - y0 + 1, group["x"].max() - x0 + 1), dtype=np.int32
+        )
+        raster[group["y"] - y0, group["x"] - x0] = group["bin"] + 1
+        transform = cutout.transform @ Affine.translation(x0, y0)
+        polygons = pd.DataFrame(
+            shapes(raster, mask=raster > 0, transform=transform),
+            columns=["geometry", "bin"],
+        )
+        polygons["geometry"] = polygons["geometry"].map(shapely.geometry.shape)
+        for bin_id, parts in polygons.groupby("bin")["geometry"]:
+            geometries[i * nbins + int(bin_id) - 1] = shapely.union_all(parts.values)
+
+    regions = np.repeat(resource_regions.values, nbins)
+    geometries = shapely.buffer(shapely.intersection(geometries, regions), 0)
+    geometries[shapely.is_missing(geometries)] = shapely.Polygon()
+
+    index = pd.MultiIndex.from_product(
+        [resource_regions.index, range(nbins)], names=["bus", "bin"]
+    )
+    return gpd.GeoSeries(geometries, index=index, crs=resource_regions.crs)
+
+
+def get_distance_matrix(
+    coords: gpd.GeoSeries,
+    regions: gpd.GeoSeries,
+    indicator: csr_matrix,
+    cache_dir: str | None = None,
+) -> csr_matrix:
+    """
+    Compute the distances between the grid cells and the regions they touch.
+
+    If a cache directory is given, the distance matrix is looked up by a hash
+    of the grid cells, the regions and the indicator matrix and stored after a
+    cache miss, so that technologies sharing a cutout and regions reuse it.
+
+    Parameters
+    ----------
+    coords : gpd.GeoSeries
+        Representative points of the grid cells in a metric CRS.
+    regions : gpd.GeoSeries
+        Regions to measure the distance to, in the same CRS as `coords`.
+    indicator : csr_matrix
+        Non-zero for the grid cells touching each region.
+    cache_dir : str, optional
+        Directory with cached distance matrices.
+
+    Returns
+    -------
+    csr_matrix
+        Distance in km between each region and the grid cells it touches,
+        with the sparsity structure of `indicator`.
+    """
+    indicator = csr_matrix(indicator, dtype=bool)
+    indicator.sort_indices()
+
+    if cache_dir:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{coords.crs}-{regions.crs}".encode())
+        for geometries in [coords, regions]:
+            digest.update(pd.util.hash_pandas_object(geometries.index).to_numpy())
+            digest.update(b"".join(shapely.to_wkb(geometries.values)))
+        digest.update(indicator.indptr.tobytes())
+        digest.update(indicator.indices.tobytes())
+        file_path = Path(cache_dir, f"{digest.hexdigest()}.npz")
+        if file_path.exists():
+            logger.info(f"Reuse cached distance matrix {file_path}")
+            return load_npz(file_path)
+
+    rows = np.repeat(np.arange(indicator.shape[0]), np.diff(indicator.indptr))
+    distances = shapely.distance(coords.values[indicator.indices], regions.values[rows])
+    matrix = csr_matrix(
+        (distances / 1e3, indicator.indices, indicator.indptr),  # km
+        shape=indicator.shape,
+    )
+
+    if cache_dir:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # parallel runs may write the same distance matrix at the same time
+        tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp.npz")
+        save_npz(tmp_path, matrix)
+        os.replace(tmp_path, file_path)
+
+    return matrix
+
+
+def get_average_distance(
+    layoutmatrix: csr_matrix, distances: csr_matrix, nbins: int
+) -> np.ndarray:
+    """
+    Average the distances of the grid cells weighted by their layout.
+
+    Parameters
+    ----------
+    layoutmatrix : csr_matrix
+        Layout per region and resource class with the row ``i * nbins + bin``
+        for the region ``i``. Its non-zero cells must be touching the regions.
+    distances : csr_matrix
+        Distances per region as returned by :func:`get_distance_matrix`.
+    nbins : int
+        Number of resource classes.
+
+    Returns
+    -------
+    np.ndarray
+        Average distance per region and resource class, zero for resource
+        classes without layout.
+    """
+    distances = distances[np.repeat(np.arange(distances.shape[0]), nbins)]
+    weighted = np.asarray(layoutmatrix.multiply(distances).sum(axis=1)).ravel()
+    total = np.asarray(layoutmatrix.sum(axis=1)).ravel()
+    return np.divide(weighted, total, out=np.zeros_like(weighted), where=total > 0)
+
+
+def get_intermediate(
+    cutout: atlite.Cutout,
+    cutout_files: list[str],
+    name: str,
+    settings: dict,
+    compute: Callable,
+) -> xr.DataArray:
+    """
+    Load a conversion intermediate from the cache next to the cutout.
+
+    The intermediate is looked up by a hash of the cutout files, the selected
+    time steps and its settings, and computed and stored after a cache miss.
+
+    Parameters
+    ----------
+    cutout : atlite.Cutout
+        Cutout the intermediate is computed from.
+    cutout_files : list of str
+        Files of the cutout, next to which the cache directory is placed.
+    name : str
+        Name of the intermediate.
+    settings : dict
+        JSON-serializable settings the intermediate depends on.
+    compute : callable
+        Computes the intermediate from the cutout data.
+
+    Returns
+    -------
+    xr.DataArray
+        The intermediate, backed by the cache file.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for fn in cutout_files:
+        stat = os.stat(fn)
+        digest.update(
+            f"{Path(fn).resolve()}-{stat.st_size}-{stat.st_mtime_ns}".encode()
+        )
+    digest.update(pd.util.hash_pandas_object(cutout.coords["time"].to_index()).values)
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+
+    cutout_file = Path(cutout_files[0])
+    cache_dir = cutout_file.with_name(f"{cutout_file.stem}_conversions")
+    file_path = cache_dir / f"{name}_{digest.hexdigest()}.nc"
+
+    if file_path.exists():
+        logger.info(f"Reuse cached {name} {file_path}")
+    else:
+        logger.info(f"Compute {name} for {settings} and store it in {file_path}")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # parallel jobs may write the same intermediate at the same time
+        tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+        compute(cutout.data).rename(name).to_netcdf(tmp_path)
+        os.replace(tmp_path, file_path)
+
+    return xr.open_dataarray(file_path, chunks=cutout.chunks)
+
+
+def convert_cached_wind(
+    ds: xr.Dataset, wind_speed: xr.DataArray, turbine: dict
+) -> xr.DataArray:
+    """
+    Evaluate the power curve of a turbine on cached hub-height wind speeds.
+    """
+    V, POW, P = turbine["V"], turbine["POW"], turbine["P"]
+    da = xr.apply_ufunc(
+        lambda v: np.interp(v, V, POW / P),
+        wind_speed,
+        dask="parallelized",
+        output_dtypes=[wind_speed.dtype],
+    )
+    da.attrs["units"] = "MWh/MWp"
+    return da.rename("specific generation")
+
+
+def convert_cached_pv(
+    ds: xr.Dataset, irradiation: xr.DataArray, panel: dict
+) -> xr.DataArray:
+    """
+    Evaluate a panel model on cached plane-of-array irradiation.
+    """
+    return SolarPanelModel(ds, irradiation, panel)
+
+
+def convert_with_cache(
+    cutout: atlite.Cutout, cutout_files: list[str], method: str, **params
+) -> xr.DataArray:
+    """
+    Run an atlite conversion with cached hub-height wind speeds or
+    plane-of-array irradiation.
+
+    Takes the same arguments as the conversion `method` of the cutout, which
+    is called directly for methods other than ``wind`` and ``pv``.
+
+    Parameters
+    ----------
+    cutout : atlite.Cutout
+        Cutout to convert.
+    cutout_files : list of str
+        Files of the cutout, next to which the cache directory is placed.
+    method : str
+        Conversion method, e.g. ``wind`` or ``pv``.
+    **params
+        Arguments of the conversion and of
+        :func:`atlite.convert.convert_and_aggregate`.
+
+    Returns
+    -------
+    xr.DataArray
+        The result of the conversion.
+    """
+    if method not in CONVERSION_PARAMS:
+        return getattr(cutout, method)(**params)
+    settings = {k: params.pop(k) for k in CONVERSION_PARAMS[method] if k in params}
+
+    if method == "wind":
+        turbine = get_windturbineconfig(
+            settings["turbine"],
+            add_cutout_windspeed=settings.get("add_cutout_windspeed", False),
+        )
+        if settings.get("smooth"):
+            turbine = windturbine_smooth(turbine, params=settings["smooth"])
+        height = {
+            "hub_height": float(turbine["hub_height"]),
+            "method": settings.get("interpolation_method", "logarithmic"),
+        }
+        wind_speed = get_intermediate(
+            cutout,
+            cutout_files,
+            "wind_speed",
+            height,
+            lambda ds: extrapolate_wind_speed(
+                ds, to_height=height["hub_height"], method=height["method"]
+            ),
+        )
+        return cutout.convert_and_aggregate(
+            convert_func=convert_cached_wind,
+            wind_speed=wind_speed,
+            turbine=turbine,
+            **params,
+        )
+
+    panel = settings["panel"]
+    if isinstance(panel, str):
+        panel = get_solarpanelconfig(panel)
+    orientation = {
+        "orientation": settings["orientation"],
+        "tracking": settings.get("tracking"),
+        "trigon_model": settings.get("trigon_model", "simple"),
+        "clearsky_model": settings.get("clearsky_model"),
+    }
+
+    def compute_irradiation(ds):
+        solar_position = SolarPosition(ds)
+        surface_orientation = SurfaceOrientation(
+            ds,
+            solar_position,
+            get_orientation(orientation["orientation"]),
+            orientation["tracking"],
+        )
+        return TiltedIrradiation(
+            ds,
+            solar_position,
+            surface_orientation,
+            trigon_model=orientation["trigon_model"],
+            clearsky_model=orientation["clearsky_model"],
+            tracking=orientation["tracking"],
+        )
+
+    irradiation = get_intermediate(
+        cutout, cutout_files, "irradiation", orientation, compute_irradiation
+    )
+    return cutout.convert_and_aggregate(
+        convert_func=convert_cached_pv, irradiation=irradiation, panel=panel, **params
+    )
+
 
 if __name__ == "__main__":
     if "snakemake" not in globals():
@@ -141,6 +590,8 @@ if __name__ == "__main__":
         logger.info(f"correction_factor is set as {correction_factor}")
 
     if nprocesses > 1:
+        from dask.distributed import Client
+
         client = Client(n_workers=nprocesses, threads_per_worker=1)
     else:
         client = None
@@ -149,14 +600,16 @@ if __name__ == "__main__":
 
     cutout = load_cutout(snakemake.input.cutout, time=sns)
 
-    availability = xr.open_dataarray(snakemake.input.availability_matrix)
+    availability, availability_buses = load_availability_matrix(
+        snakemake.input.availability_matrix, cutout
+    )
 
     regions = gpd.read_file(snakemake.input.distance_regions)
     # do not pull up, set_index does not work if geo dataframe is empty
     regions = regions.set_index("name").rename_axis("bus")
     if snakemake.wildcards.technology.startswith("offwind"):
         # for offshore regions, the shortest distance to the shoreline is used
-        offshore_regions = availability.coords["bus"].values
+        offshore_regions = availability_buses
         regions = regions.loc[offshore_regions]
         regions = regions.map(lambda g: _simplify_polys(g, minarea=1)).set_crs(
             regions.crs
@@ -165,14 +618,20 @@ if __name__ == "__main__":
         # for onshore regions, the representative point of the region is used
         regions = regions.representative_point()
     regions = regions.geometry.to_crs(3035)
-    buses = regions.index
 
     area = cutout.grid.to_crs(3035).area / 1e6
     area = xr.DataArray(
         area.values.reshape(cutout.shape), [cutout.coords["y"], cutout.coords["x"]]
     )
 
-    func = getattr(cutout, resource.pop("method"))
+    method = resource.pop("method")
+    if snakemake.params.cache_conversions:
+        cutout_files = snakemake.input.cutout
+        if isinstance(cutout_files, str):
+            cutout_files = [cutout_files]
+        func = partial(convert_with_cache, cutout, cutout_files, method)
+    else:
+        func = getattr(cutout, method)
     if client is not None:
         resource["dask_kwargs"] = {"scheduler": client}
 
@@ -197,22 +656,19 @@ if __name__ == "__main__":
     fn = snakemake.input.resource_regions
     resource_regions = gpd.read_file(fn).set_index("name").rename_axis("bus").geometry
 
-    # indicator matrix for which cells touch which regions
-    I = np.ceil(cutout.availabilitymatrix(resource_regions, ExclusionContainer()))
-    cf_by_bus = capacity_factor * I.where(I > 0)
+    buses = resource_regions.index.intersection(availability_buses, sort=False)
+    availability = availability[availability_buses.get_indexer(buses)]
+    bus_bins = pd.MultiIndex.from_product([buses, range(nbins)], names=["bus", "bin"])
 
-    epsilon = 1e-3
-    cf_min, cf_max = (
-        cf_by_bus.min(dim=["x", "y"]) - epsilon,
-        cf_by_bus.max(dim=["x", "y"]) + epsilon,
-    )
-    normed_bins = xr.DataArray(np.linspace(0, 1, nbins + 1), dims=["bin"])
-    bins = cf_min + (cf_max - cf_min) * normed_bins
+    # indicator matrix for which cells touch which regions
+    I = get_indicator_matrix(cutout, resource_regions.loc[buses])
+    cf_flat = capacity_factor.stack(spatial=["y", "x"]).values
+    class_masks = get_class_masks(cf_flat, I, nbins)
 
-    cf_by_bus_bin = cf_by_bus.expand_dims(bin=range(nbins))
-    lower_edges = bins[:, :-1]
-    upper_edges = bins[:, 1:]
-    class_masks = (cf_by_bus_bin >= lower_edges) & (cf_by_bus_bin < upper_edges)
+    # share of available area per (bus, bin) and grid cell
+    matrix = class_masks.multiply(availability[np.repeat(np.arange(len(buses)), nbins)])
+    matrix = csr_matrix(matrix)
+    matrix.eliminate_zeros()
 
     if nbins == 1:
         bus_bin_mi = pd.MultiIndex.from_product(
@@ -220,21 +676,9 @@ if __name__ == "__main__":
         )
         class_regions = resource_regions.set_axis(bus_bin_mi)
     else:
-        grid = cutout.grid.set_index(["y", "x"])
-        class_regions = {}
-        for bus, bin_id in product(buses, range(nbins)):
-            bus_bin_mask = (
-                class_masks.sel(bus=bus, bin=bin_id)
-                .stack(spatial=["y", "x"])
-                .to_pandas()
-            )
-            grid_cells = grid.loc[bus_bin_mask]
-            geometry = (
-                grid_cells.intersection(resource_regions.loc[bus]).union_all().buffer(0)
-            )
-            class_regions[(bus, bin_id)] = geometry
-        class_regions = gpd.GeoSeries(class_regions, crs=4326)
-        class_regions.index.names = ["bus", "bin"]
+        class_regions = get_class_regions(
+            class_masks, resource_regions.loc[buses], nbins, cutout
+        )
     class_regions.to_file(snakemake.output.class_regions)
 
     duration = time.time() - start
@@ -253,14 +697,10 @@ if __name__ == "__main__":
 
         resource[tech] = model
 
-        matrix = (availability * class_masks).stack(
-            bus_bin=["bus", "bin"], spatial=["y", "x"]
-        )
-
         profile = func(
             matrix=matrix,
             layout=layout,
-            index=matrix.indexes["bus_bin"],
+            index=xr.Coordinates.from_pandas_multiindex(bus_bins, "bus_bin"),
             per_unit=True,
             return_capacity=False,
             **resource,
@@ -280,24 +720,23 @@ if __name__ == "__main__":
     profiles = xr.merge(profiles)
 
     logger.info(f"Calculating maximal capacity per bus for technology {technology}")
-    p_nom_max = capacity_per_sqkm * availability * class_masks @ area
+    p_nom_max = capacity_per_sqkm * (matrix @ area.stack(spatial=["y", "x"]).values)
+    p_nom_max = xr.DataArray(p_nom_max, [bus_bins]).unstack("bus_bin")
 
     logger.info(f"Calculate average distances for technology {technology}.")
-    layoutmatrix = (layout * availability * class_masks).stack(
-        bus_bin=["bus", "bin"], spatial=["y", "x"]
-    )
+    layoutmatrix = csr_matrix(matrix.multiply(layout.stack(spatial=["y", "x"]).values))
+    layoutmatrix.eliminate_zeros()
 
     coords = cutout.grid.representative_point().to_crs(3035)
-
-    average_distance = []
-    bus_bins = layoutmatrix.indexes["bus_bin"]
-    for bus, bin in bus_bins:
-        row = layoutmatrix.sel(bus=bus, bin=bin).data
-        nz_b = row != 0
-        row = row[nz_b]
-        co = coords[nz_b]
-        distances = co.distance(regions[bus]).div(1e3)  # km
-        average_distance.append((distances * (row / row.sum())).sum())
+    distances = get_distance_matrix(
+        coords,
+        regions.loc[buses],
+        I,
+        cache_dir=snakemake.params.distance_cache
+        if snakemake.params.cache_distances
+        else None,
+    )
+    average_distance = get_average_distance(layoutmatrix, distances, nbins)
 
     average_distance = xr.DataArray(average_distance, [bus_bins]).unstack("bus_bin")
 
@@ -51,22 +51,312 @@ Inputs
 Outputs
 -------
 
-- ``resources/availability_matrix_{clusters_{technology}.nc``
+- ``resources/availability_matrix_{clusters_{technology}.nc``: share of
+  available area per bus and cutout grid cell, stored as compressed sparse rows
+  (see :func:`scripts._helpers.load_availability_matrix`) since each bus only
+  overlaps with a few grid cells.
+
+Description
+-----------
+
+The regions are processed in tiles of cutout grid cells. The tile size is
+chosen such that the exclusion rasters of a tile fit into the memory budget
+``atlite: availability: tile_mem_mb`` of each process, which makes fine
+excluder resolutions feasible for large regions. Each tile is extended by the
+largest exclusion buffer, so that the availability matches the computation
+over whole regions.
+
+With ``atlite: availability: checkpoint`` enabled, the availability of each
+region is stored as soon as all its tiles are done, keyed by a hash of the
+region geometry, the exclusion settings and the cutout grid. Reruns after a
+crash or with a changed set of regions only compute the missing regions.
 """
 
 import functools
+import hashlib
+import json
 import logging
+import multiprocessing as mp
+import os
 import time
+from pathlib import Path
+from warnings import catch_warnings, simplefilter
 
 import atlite
 import geopandas as gpd
 import numpy as np
+import shapely
 import xarray as xr
+from atlite.gis import shape_availability_reprojected
+from scipy.sparse import csr_matrix
+from tqdm import tqdm
 
-from scripts._helpers import configure_logging, load_cutout, set_scenario_config
+from scripts._helpers import (
+    configure_logging,
+    load_cutout,
+    set_scenario_config,
+    to_sparse_availability,
+)
 
 logger = logging.getLogger(__name__)
 
+# rough peak memory per excluder pixel of the rasters, masks and buffers
+BYTES_PER_PIXEL = 32
+
+
+def get_excluder_settings(excluder: atlite.ExclusionContainer) -> dict:
+    """
+    Describe the exclusions of an unopened excluder including the size and
+    modification time of the files they are read from.
+    """
+
+    def describe(d, key):
+        d = d.copy()
+        if isinstance(d[key], str | Path):
+            stat = os.stat(d[key])
+            d[key] = f"{Path(d[key]).resolve()}-{stat.st_size}-{stat.st_mtime_ns}"
+        return d
+
+    return {
+        "crs": str(excluder.crs),
+        "res": excluder.res,
+        "rasters": [describe(d, "raster") for d in excluder.rasters],
+        "geometries": [describe(d, "geometry") for d in excluder.geometries],
+    }
+
+
+def get_halo(excluder: atlite.ExclusionContainer) -> float:
+    """
+    Return the distance in excluder CRS units by which the tiles are extended
+    to cover the largest exclusion buffer.
+    """
+    buffers = [d["buffer"] or 0 for d in excluder.rasters]
+    # buffers of rasters are dilated in whole pixels
+    return (max(buffers, default=0) // excluder.res + 3) * excluder.res
+
+
+def get_tile_size(
+    cutout: atlite.Cutout, excluder: atlite.ExclusionContainer, mem_mb: float
+) -> int:
+    """
+    Return the number of grid cells along each side of a tile, such that the
+    exclusion rasters of a tile fit into the memory budget.
+    """
+    bounds = cutout.grid.to_crs(excluder.crs).bounds
+    width = max((bounds.maxx - bounds.minx).max(), (bounds.maxy - bounds.miny).max())
+    side = np.sqrt(mem_mb * 1e6 / BYTES_PER_PIXEL) * excluder.res
+    return max(int((side - 2 * get_halo(excluder)) // width), 1)
+
+
+def get_tiles(
+    cutout: atlite.Cutout,
+    region: shapely.Geometry,
+    tile_size: int,
+    halo: float,
+    crs,
+) -> list[tuple[shapely.Geometry, slice, slice]]:
+    """
+    Split a region into tiles of grid cells.
+
+    Parameters
+    ----------
+    cutout : atlite.Cutout
+        Cutout with the grid cells.
+    region : shapely.Geometry
+        Region in `crs`.
+    tile_size : int
+        Number of grid cells along each side of a tile.
+    halo : float
+        Distance by which the tiles are extended.
+    crs
+        CRS of the region and the tiles.
+
+    Returns
+    -------
+    list
+        The part of the region in each extended tile and the y and x slices of
+        the grid cells of the tile, for all tiles overlapping with the region.
+    """
+    x, y = cutout.coords["x"].values, cutout.coords["y"].values
+    dx, dy = cutout.dx, cutout.dy
+    left, bottom, right, top = (
+        gpd.GeoSeries([region], crs=crs).to_crs(cutout.crs).total_bounds
+    )
+    # include neighbouring cells which may receive a share of border pixels
+    x0 = max(np.searchsorted(x + dx / 2, left) - 1, 0)
+    x1 = min(np.searchsorted(x - dx / 2, right) + 1, len(x))
+    y0 = max(np.searchsorted(y + dy / 2, bottom) - 1, 0)
+    y1 = min(np.searchsorted(y - dy / 2, top) + 1, len(y))
+
+    boxes, slices = [], []
+    for ys in range(y0 - y0 % tile_size, y1, tile_size):
+        for xs in range(x0 - x0 % tile_size, x1, tile_size):
+            ye, xe = min(ys + tile_size, len(y)), min(xs + tile_size, len(x))
+            box = shapely.box(
+                x[xs] - dx / 2, y[ys] - dy / 2, x[xe - 1] + dx / 2, y[ye - 1] + dy / 2
+            )
+            boxes.append(shapely.segmentize(box, min(dx, dy) / 10))
+            slices.append((slice(ys, ye), slice(xs, xe)))
+    if not boxes:
+        return []
+
+    boxes = gpd.GeoSeries(boxes, crs=cutout.crs).to_crs(crs).buffer(halo)
+    parts = shapely.intersection(boxes.values, region)
+    return [
+        (part, *tile) for part, tile in zip(parts, slices) if not shapely.is_empty(part)
+    ]
+
+
+def _init_worker(excluder, dst_transform, dst_crs, dst_shape):
+    global _excluder, _dst_transform, _dst_crs, _dst_shape
+    _excluder, _dst_transform, _dst_crs, _dst_shape = (
+        excluder,
+        dst_transform,
+        dst_crs,
+        dst_shape,
+    )
+
+
+def _compute_tile(task):
+    i, geometry, ys, xs = task
+    with catch_warnings():
+        simplefilter("ignore")
+        values = shape_availability_reprojected(
+            gpd.GeoSeries([geometry], crs=_excluder.crs),
+            _excluder,
+            _dst_transform,
+            _dst_crs,
+            _dst_shape,
+        )[0]
+    # atlite computes top-down, flip to the ascending y of the cutout
+    values = np.asarray(values).reshape(_dst_shape)[::-1]
+    iy, ix = np.nonzero(values[ys, xs])
+    cells = (iy + ys.start) * _dst_shape[1] + ix + xs.start
+    return i, cells, values[ys, xs][iy, ix]
+
+
+def compute_availability(
+    cutout: atlite.Cutout,
+    regions: gpd.GeoSeries,
+    excluder: atlite.ExclusionContainer,
+    nprocesses: int = 1,
+    mem_mb: float = 2000,
+    checkpoint_dir: str | None = None,
+    disable_progressbar: bool = True,
+) -> csr_matrix:
+    """
+    Compute the eligible share of the grid cells in the overlap with each
+    region in tiles of grid cells.
+
+    Equivalent to :meth:`atlite.Cutout.availabilitymatrix`, but the exclusion
+    rasters are processed in tiles of grid cells which fit into the memory
+    budget, and the availability of each region can be checkpointed.
+
+    Parameters
+    ----------
+    cutout : atlite.Cutout
+        Cutout which the availability matrix is aligned to.
+    regions : gpd.GeoSeries
+        Regions for which the availability is computed.
+    excluder : atlite.ExclusionContainer
+        Unopened container of the exclusions.
+    nprocesses : int
+        Number of processes.
+    mem_mb : float
+        Memory budget per process in MB.
+    checkpoint_dir : str, optional
+        Directory with the stored availability of regions.
+    disable_progressbar : bool
+        Whether to hide the progress bar.
+
+    Returns
+    -------
+    csr_matrix
+        Eligible share of each (y, x) stacked grid cell per region.
+    """
+    regions = regions.geometry.to_crs(excluder.crs)
+    halo = get_halo(excluder)
+    tile_size = get_tile_size(cutout, excluder, mem_mb)
+    logger.info(f"Compute availability in tiles of {tile_size}x{tile_size} grid cells.")
+
+    digest = hashlib.blake2b(digest_size=16)
+    settings = get_excluder_settings(excluder)
+    digest.update(json.dumps(settings, sort_keys=True, default=repr).encode())
+    digest.update(f"{cutout.transform}-{cutout.shape}-{cutout.crs}".encode())
+    digest.update(f"{tile_size}-{halo}".encode())
+    keys = [
+        f"{digest.copy().hexdigest()}_{hashlib.blake2b(wkb, digest_size=16).hexdigest()}"
+        for wkb in shapely.to_wkb(regions.values)
+    ]
+
+    rows = [None] * len(regions)
+    if checkpoint_dir:
+        checkpoint_dir = Path(checkpoint_dir)
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        for i, key in enumerate(keys):
+            if (checkpoint_dir / f"{key}.npz").exists():
+                with np.load(checkpoint_dir / f"{key}.npz") as f:
+                    rows[i] = f["cells"], f["values"]
+        logger.info(
+            f"Reuse checkpointed availability of {sum(r is not None for r in rows)} "
+            f"of {len(regions)} regions."
+        )
+
+    def finish(i):
+        cells, values = (np.concatenate(r) for r in zip(*rows[i]))
+        rows[i] = cells, values
+        if checkpoint_dir:
+            file_path = checkpoint_dir / f"{keys[i]}.npz"
+            tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, cells=cells, values=values)
+            os.replace(tmp_path, file_path)
+
+    def collect(i, cells, values):
+        rows[i].append((cells, values))
+        pending[i] -= 1
+        if pending[i] == 0:
+            finish(i)
+
+    tasks, pending = [], {}
+    for i, region in enumerate(regions.values):
+        if rows[i] is not None:
+            continue
+        tiles = get_tiles(cutout, region, tile_size, halo, excluder.crs)
+        tasks.extend((i, *tile) for tile in tiles)
+        pending[i] = len(tiles)
+        rows[i] = [(np.array([], dtype=int), np.array([]))]
+        if not tiles:
+            finish(i)
+
+    args = (excluder, cutout.transform_r, cutout.crs, cutout.shape)
+    kwargs = dict(total=len(tasks), desc="Compute availability", unit=" tiles")
+    if nprocesses > 1:
+        assert excluder.all_closed, "All raster files in excluder must be closed"
+        with mp.get_context("spawn").Pool(
+            processes=nprocesses,
+            initializer=_init_worker,
+            initargs=args,
+            maxtasksperchild=20,
+        ) as pool:
+            results = pool.imap_unordered(_compute_tile, tasks)
+            for result in tqdm(results, disable=disable_progressbar, **kwargs):
+                collect(*result)
+    else:
+        _init_worker(*args)
+        for task in tqdm(tasks, disable=disable_progressbar, **kwargs):
+            collect(*_compute_tile(task))
+
+    indptr = np.cumsum([0] + [len(cells) for cells, _ in rows])
+    return csr_matrix(
+        (
+            np.concatenate([values for _, values in rows]),
+            np.concatenate([cells for cells, _ in rows]).astype(int),
+            indptr,
+        ),
+        shape=(len(regions), cutout.shape[0] * cutout.shape[1]),
+    )
+
 
 if __name__ == "__main__":
     if "snakemake" not in globals():
@@ -158,8 +448,16 @@ if __name__ == "__main__":
     logger.info(f"Calculate landuse availability for {technology}...")
     start = time.time()
 
-    kwargs = dict(nprocesses=nprocesses, disable_progressbar=noprogress)
-    availability = cutout.availabilitymatrix(regions, excluder, **kwargs)
+    settings = snakemake.params.availability
+    availability = compute_availability(
+        cutout,
+        regions,
+        excluder,
+        nprocesses=nprocesses,
+        mem_mb=settings["tile_mem_mb"],
+        checkpoint_dir=snakemake.params.checkpoints if settings["checkpoint"] else None,
+        disable_progressbar=noprogress,
+    )
 
     duration = time.time() - start
     logger.info(
@@ -172,6 +470,19 @@ if __name__ == "__main__":
         availability_MDUA = xr.open_dataarray(
             snakemake.input["availability_matrix_MD_UA"]
         )
-        availability.loc[availability_MDUA.coords] = availability_MDUA
+        buses = availability_MDUA.indexes["bus"]
+        i = regions.index.get_indexer(buses)
+        rows = xr.DataArray(
+            availability[i].toarray().reshape(len(i), *cutout.shape),
+            [buses, cutout.coords["y"], cutout.coords["x"]],
+        )
+        rows.loc[availability_MDUA.coords] = availability_MDUA
+        availability = availability.tolil()
+        availability[i] = rows.values.reshape(len(i), -1)
+        availability = availability.tocsr()
 
-    availability.to_netcdf(snakemake.output[0])
+    availability = to_sparse_availability(
+        availability, regions.index, cutout.coords["y"], cutout.coords["x"]
+    )
+    encoding = {v: {"zlib": True, "complevel": 4} for v in availability.data_vars}
+    availability.to_netcdf(snakemake.output[0], encoding=encoding)
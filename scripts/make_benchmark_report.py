@@ -0,0 +1,316 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+"""
+Collect the benchmark files and memory logs of a run into a table and render
+an HTML report with the critical path of the run and the rules whose
+``threads`` and ``mem_mb`` requests are badly sized.
+
+Snakemake only records the requested threads and resources of a job in its
+benchmark file if it runs with ``--benchmark-extended``. Without, the sizing
+of the rules cannot be assessed and only runtimes and memory peaks are
+reported.
+"""
+
+import ast
+import logging
+import math
+import os
+from html import escape
+
+import numpy as np
+import pandas as pd
+
+from scripts._helpers import configure_logging, set_scenario_config
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    "rule",
+    "wildcards",
+    "start",
+    "end",
+    "s",
+    "max_rss",
+    "memory_log_max",
+    "cpu_time",
+    "threads",
+    "mem_mb",
+    "cpu_efficiency",
+    "memory_usage",
+]
+
+
+def read_benchmark(fn):
+    """
+    Read a benchmark file written by Snakemake.
+
+    Parameters
+    ----------
+    fn : str
+        Path to the benchmark file.
+
+    Returns
+    -------
+    dict
+        Wall time, memory peak and CPU time of the job and, for extended
+        benchmarks, the rule, wildcards and requested resources.
+    """
+    df = pd.read_csv(fn, sep="\t", na_values=["NA", "-"])
+    # repeated benchmarks append a row per repetition
+    record = {
+        "s": df["s"].mean(),
+        "max_rss": df["max_rss"].max(),
+        "cpu_time": df["cpu_time"].mean(),
+        "end": os.path.getmtime(fn),
+    }
+    if "rule_name" in df:
+        resources = ast.literal_eval(df["resources"].iat[-1])
+        record.update(
+            rule=df["rule_name"].iat[-1],
+            wildcards=ast.literal_eval(df["wildcards"].iat[-1]),
+            threads=df["threads"].iat[-1],
+            mem_mb=resources.get("mem_mb", np.nan),
+        )
+    return record
+
+
+def read_memory_log(fn):
+    """
+    Return the maximum memory usage in MB recorded by
+    ``scripts._benchmark.memory_logger``.
+    """
+    with open(fn) as f:
+        usage = [float(line.split()[1]) for line in f if line.startswith("MEM ")]
+    return max(usage, default=np.nan)
+
+
+def build_table(benchmarks):
+    """
+    Build the table of all benchmarked jobs of a run.
+
+    Parameters
+    ----------
+    benchmarks : dict
+        Maps the path of each benchmark file to its ``rule``, ``wildcards``
+        and the path of its ``memory`` log, which is None for rules without
+        memory log.
+
+    Returns
+    -------
+    pd.DataFrame
+        A row per job with wall time ``s``, peak memory ``max_rss`` and
+        ``memory_log_max`` in MB, ``cpu_time`` in seconds, the requested
+        ``threads`` and ``mem_mb``, and the ratios ``cpu_efficiency`` of
+        used to reserved CPU time and ``memory_usage`` of peak to requested
+        memory.
+    """
+    records = []
+    for fn, job in benchmarks.items():
+        try:
+            record = dict(job, **read_benchmark(fn))
+        except (OSError, KeyError, ValueError, pd.errors.ParserError) as e:
+            logger.warning(f"Skipping unreadable benchmark file {fn}: {e}")
+            continue
+        memory = job.get("memory")
+        if memory and os.path.exists(memory):
+            record["memory_log_max"] = read_memory_log(memory)
+        records.append(record)
+
+    df = pd.DataFrame.from_records(records).reindex(columns=COLUMNS)
+    df["wildcards"] = df["wildcards"].map(
+        lambda w: (
+            ",".join(f"{k}={v}" for k, v in w.items()) if isinstance(w, dict) else ""
+        )
+    )
+    df = df.astype({c: float for c in COLUMNS[2:]})
+    df["start"] = df["end"] - df["s"]
+    df["cpu_efficiency"] = df["cpu_time"] / (df["s"] * df["threads"])
+    peak = df[["max_rss", "memory_log_max"]].max(axis=1)
+    df["memory_usage"] = peak / df["mem_mb"]
+    return df.sort_values("start", ignore_index=True)
+
+
+def get_critical_path(df, tolerance=5.0):
+    """
+    Reconstruct the chain of jobs which determined the duration of the run.
+
+    The benchmarks do not record the dependencies between jobs, so the path
+    is reconstructed from the timeline: starting from the job which finished
+    last, the predecessor of each job is the job which finished last before
+    it started, i.e. the job which released its inputs or its cores.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table of jobs as returned by ``build_table``.
+    tolerance : float
+        Scheduling delay in seconds between the end of a job and the start
+        of its successor.
+
+    Returns
+    -------
+    pd.DataFrame
+        The jobs on the critical path in chronological order.
+    """
+    if df.empty:
+        return df
+    path = [df["end"].idxmax()]
+    while True:
+        job = df.loc[path[-1]]
+        candidates = df[
+            (df["end"] <= job["start"] + tolerance) & (df["end"] < job["end"])
+        ]
+        if candidates.empty:
+            break
+        path.append(candidates["end"].idxmax())
+    return df.loc[path[::-1]]
+
+
+def get_sizing(df, memory_bounds=(0.5, 1.0), cpu_bounds=(0.5, 1.1), margin=1.2):
+    """
+    Assess the requested threads and memory of each rule.
+
+    A rule is oversized if even its most demanding job stays below the lower
+    bound and undersized if any job exceeds the upper bound of memory usage
+    or CPU efficiency.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table of jobs as returned by ``build_table``.
+    memory_bounds : tuple(float, float)
+        Bounds on the ratio of peak to requested memory.
+    cpu_bounds : tuple(float, float)
+        Bounds on the ratio of used to reserved CPU time.
+    margin : float
+        Safety margin on the observed peaks for the suggested requests.
+
+    Returns
+    -------
+    pd.DataFrame
+        A row per rule with the requested and suggested ``threads`` and
+        ``mem_mb`` and the ``assessment``, which is empty for well-sized
+        rules.
+    """
+    df = df.assign(
+        peak=df[["max_rss", "memory_log_max"]].max(axis=1),
+        load=df["cpu_time"] / df["s"],
+    )
+    rules = df.groupby("rule").agg(
+        jobs=("s", "size"),
+        s=("s", "sum"),
+        threads=("threads", "max"),
+        mem_mb=("mem_mb", "max"),
+        peak=("peak", "max"),
+        load=("load", "max"),
+        cpu_efficiency=("cpu_efficiency", "max"),
+        memory_usage=("memory_usage", "max"),
+    )
+    rules["suggested_threads"] = np.ceil(rules["load"]).clip(lower=1)
+    rules["suggested_mem_mb"] = np.ceil(rules["peak"] * margin / 100) * 100
+
+    def assess(rule):
+        assessment = []
+        if rule["memory_usage"] < memory_bounds[0]:
+            assessment.append("memory oversized")
+        elif rule["memory_usage"] > memory_bounds[1]:
+            assessment.append("memory undersized")
+        if rule["threads"] > 1 and rule["cpu_efficiency"] < cpu_bounds[0]:
+            assessment.append("threads oversized")
+        elif rule["cpu_efficiency"] > cpu_bounds[1]:
+            assessment.append("threads undersized")
+        return ", ".join(assessment)
+
+    rules["assessment"] = rules.apply(assess, axis=1) if not rules.empty else ""
+    return rules.sort_values("s", ascending=False)
+
+
+def format_duration(seconds):
+    if not math.isfinite(seconds):
+        return "-"
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+def to_html(df, sizing, critical_path, title):
+    """
+    Render the benchmark report as a standalone HTML page.
+    """
+
+    def table(df, **kwargs):
+        return df.to_html(
+            float_format=lambda x: f"{x:.2f}", na_rep="-", border=0, **kwargs
+        )
+
+    timeline = ["rule", "wildcards", "s", "max_rss", "threads", "mem_mb"]
+    start = critical_path["start"].min() if not df.empty else np.nan
+    summary = pd.Series(
+        {
+            "Jobs": len(df),
+            "Makespan": format_duration(df["end"].max() - df["start"].min()),
+            "Critical path": format_duration(critical_path["s"].sum()),
+            "Summed wall time": format_duration(df["s"].sum()),
+            "Reserved core hours": f"{(df['s'] * df['threads']).sum() / 3600:.1f}",
+            "Used core hours": f"{df['cpu_time'].sum() / 3600:.1f}",
+        }
+    )
+    critical_path = critical_path.assign(
+        offset=(critical_path["start"] - start).map(format_duration)
+    )
+    flagged = sizing[sizing["assessment"] != ""]
+
+    sections = [
+        ("Summary", summary.to_frame("").to_html(border=0, header=False)),
+        ("Critical path", table(critical_path[["offset", *timeline]], index=False)),
+        ("Badly sized rules", table(flagged)),
+        ("Rules", table(sizing)),
+        (
+            "Jobs",
+            table(
+                df.sort_values("s", ascending=False).drop(columns=["end"]), index=False
+            ),
+        ),
+    ]
+    body = "\n".join(f"<h2>{escape(name)}</h2>\n{html}" for name, html in sections)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; font-size: 0.9em; }}
+th, td {{ padding: 0.2em 0.6em; text-align: right; }}
+tr:nth-child(even) {{ background: #f2f2f2; }}
+</style>
+</head>
+<body>
+<h1>{escape(title)}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    if "snakemake" not in globals():
+        from scripts._helpers import mock_snakemake
+
+        snakemake = mock_snakemake("make_benchmark_report")
+
+    configure_logging(snakemake)
+    set_scenario_config(snakemake)
+
+    df = build_table(snakemake.params.benchmarks)
+    if df["threads"].isna().all():
+        logger.warning(
+            "No requested resources found in the benchmark files. Run snakemake "
+            "with --benchmark-extended to assess the sizing of the rules."
+        )
+    critical_path = get_critical_path(df)
+    sizing = get_sizing(df)
+
+    df.to_csv(snakemake.output.table, index=False)
+    with open(snakemake.output.report, "w") as f:
+        f.write(to_html(df, sizing, critical_path, "Benchmarks"))
@@ -13,7 +13,7 @@ import pypsa
 from pypsa.statistics import groupers
 
 from evals.statistic import get_location
-from scripts._helpers import configure_logging, set_scenario_config
+from scripts._helpers import configure_logging, load_network, set_scenario_config
 
 pd.set_option("future.no_silent_downcasting", True)
 idx = pd.IndexSlice
@@ -40,6 +40,31 @@ OUTPUTS = [
     "nodal_withdrawal",
 ]
 
+# time series used by the summaries, other series are not read from the network
+NETWORK_SERIES = [
+    "p",
+    "p0",
+    "p1",
+    "p2",
+    "p3",
+    "p4",
+    "e",
+    "p_dispatch",
+    "p_store",
+    "state_of_charge",
+    "marginal_price",
+    "p_max_pu",
+    "marginal_cost",
+    "marginal_cost_quadratic",
+    "marginal_cost_storage",
+    "spill_cost",
+    "stand_by_cost",
+    "spill",
+    "start_up",
+    "shut_down",
+    "status",
+]
+
 
 def assign_carriers(n: pypsa.Network) -> None:
     if "carrier" not in n.lines:
@@ -334,7 +359,7 @@ if __name__ == "__main__":
     configure_logging(snakemake)
     set_scenario_config(snakemake)
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network, series=NETWORK_SERIES)
     assign_carriers(n)
     assign_locations(n)
 
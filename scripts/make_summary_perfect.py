@@ -9,11 +9,10 @@ other metrics.
 
 import numpy as np
 import pandas as pd
-import pypsa
 from pypsa.descriptors import get_active_assets
 from six import iteritems
 
-from scripts._helpers import set_scenario_config
+from scripts._helpers import load_network, set_scenario_config
 from scripts.add_electricity import load_costs
 from scripts.make_summary import (
     assign_carriers,
@@ -680,7 +679,7 @@ def make_summaries(networks_dict):
     for label, filename in iteritems(networks_dict):
         print(label, filename)
         try:
-            n = pypsa.Network(filename)
+            n = load_network(filename)
         except OSError:
             print(label, " not solved yet.")
             continue
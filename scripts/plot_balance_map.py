@@ -16,6 +16,7 @@ from pypsa.statistics import get_transmission_carriers
 from scripts._helpers import (
     PYPSA_V1,
     configure_logging,
+    load_network,
     set_scenario_config,
     update_config_from_wildcards,
 )
@@ -41,7 +42,10 @@ if __name__ == "__main__":
     set_scenario_config(snakemake)
     update_config_from_wildcards(snakemake.config, snakemake.wildcards)
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(
+        snakemake.input.network,
+        series=["p", "p0", "p1", "p2", "p3", "p4", "marginal_price"],
+    )
     sanitize_carriers(n, snakemake.config)
     n.statistics.set_parameters(round=3, drop_zero=True, nice_names=False)
 
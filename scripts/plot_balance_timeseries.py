@@ -14,10 +14,14 @@ import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import pypsa
 from tqdm import tqdm
 
-from scripts._helpers import configure_logging, get_snapshots, set_scenario_config
+from scripts._helpers import (
+    configure_logging,
+    get_snapshots,
+    load_network,
+    set_scenario_config,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -205,7 +209,7 @@ if __name__ == "__main__":
     plt.style.use(["bmh", snakemake.input.rc])
 
     # Load network and prepare data
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
     config = snakemake.params.plotting["balance_timeseries"]
     output_dir = snakemake.output[0]
     os.makedirs(output_dir, exist_ok=True)
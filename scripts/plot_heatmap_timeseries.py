@@ -11,10 +11,14 @@ import sys
 
 import matplotlib.pyplot as plt
 import pandas as pd
-import pypsa
 import seaborn as sns
 
-from scripts._helpers import configure_logging, get_snapshots, set_scenario_config
+from scripts._helpers import (
+    configure_logging,
+    get_snapshots,
+    load_network,
+    set_scenario_config,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -109,7 +113,7 @@ if __name__ == "__main__":
     output_dir = snakemake.output[0]
     os.makedirs(output_dir, exist_ok=True)
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     snapshots = get_snapshots(snakemake.params.snapshots, drop_leap_day)
     carriers = n.carriers
@@ -12,10 +12,15 @@ import cartopy.crs as ccrs
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import pandas as pd
-import pypsa
 from pypsa.plot import add_legend_circles, add_legend_lines, add_legend_patches
 
-from scripts._helpers import configure_logging, rename_techs, retry, set_scenario_config
+from scripts._helpers import (
+    configure_logging,
+    load_network,
+    rename_techs,
+    retry,
+    set_scenario_config,
+)
 from scripts.make_summary import assign_locations
 from scripts.plot_summary import preferred_order
 
@@ -249,7 +254,7 @@ if __name__ == "__main__":
     configure_logging(snakemake)
     set_scenario_config(snakemake)
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     regions = gpd.read_file(snakemake.input.regions).set_index("name")
 
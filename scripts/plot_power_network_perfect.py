@@ -11,10 +11,9 @@ import logging
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import pandas as pd
-import pypsa
 from pypsa.plot import add_legend_circles, add_legend_lines
 
-from scripts._helpers import configure_logging, retry, set_scenario_config
+from scripts._helpers import configure_logging, load_network, retry, set_scenario_config
 from scripts.make_summary import assign_locations
 from scripts.plot_power_network import load_projection, rename_techs_tyndp
 from scripts.plot_summary import preferred_order
@@ -187,7 +186,7 @@ if __name__ == "__main__":
     configure_logging(snakemake)
     set_scenario_config(snakemake)
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     regions = gpd.read_file(snakemake.input.regions).set_index("name")
 
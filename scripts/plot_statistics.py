@@ -3,10 +3,9 @@
 # SPDX-License-Identifier: MIT
 
 import matplotlib.pyplot as plt
-import pypsa
 import seaborn as sns
 
-from scripts._helpers import configure_logging, set_scenario_config
+from scripts._helpers import configure_logging, load_network, set_scenario_config
 
 sns.set_theme("paper", style="whitegrid")
 
@@ -23,7 +22,7 @@ if __name__ == "__main__":
     configure_logging(snakemake)
     set_scenario_config(snakemake)
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     n.loads.carrier = "load"
     n.carriers.loc["load", ["nice_name", "color"]] = "Load", "darkred"
@@ -15,6 +15,8 @@ from six import iterkeys
 
 from scripts._helpers import (
     configure_logging,
+    export_network,
+    load_network,
     sanitize_custom_columns,
     set_scenario_config,
     update_config_from_wildcards,
@@ -200,7 +202,7 @@ def concat_networks(
     # Loop over each input network file and its corresponding investment year
     for i, network_path in enumerate(network_paths):
         year = years[i]
-        network = pypsa.Network(network_path)
+        network = load_network(network_path)
         adjust_electricity_grid(network, year, years)
         add_build_year_to_new_assets(network, year)
 
@@ -666,4 +668,8 @@ if __name__ == "__main__":
     # export network
     sanitize_custom_columns(n)
     sanitize_carriers(n, snakemake.config)
-    n.export_to_netcdf(snakemake.output[0])
+    export_network(
+        n,
+        snakemake.output[0],
+        intern_profiles=snakemake.config["run"]["intern_profiles"],
+    )
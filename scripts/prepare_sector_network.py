@@ -21,8 +21,10 @@ from networkx.algorithms.connectivity.edge_augmentation import k_edge_augmentati
 from pypsa.geo import haversine_pts
 from scipy.stats import beta
 
+from scripts._benchmark import memory_logger
 from scripts._helpers import (
     configure_logging,
+    export_network,
     get,
     set_scenario_config,
     update_config_from_wildcards,
@@ -6107,9 +6109,51 @@ def cluster_heat_buses(n):
         n.add(c.name, df.loc[to_add].index, **df.loc[to_add])
 
 
+def _segment_reduce(df, order, starts, how="mean"):
+    """
+    Reduce consecutive row segments of a time series table.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Time series with snapshots as index.
+    order : np.ndarray or None
+        Row order that sorts the snapshots by segment, or None if they
+        are sorted already.
+    starts : np.ndarray
+        First row position of each segment in sorted order.
+    how : {"mean", "min", "max"}
+        The reduction. NaN values are skipped like in pandas.
+
+    Returns
+    -------
+    np.ndarray
+        The reduced values with one row per segment.
+    """
+    values = df.to_numpy(dtype=float)
+    if order is not None:
+        values = values[order]
+    if how == "min":
+        return np.fmin.reduceat(values, starts, axis=0)
+    if how == "max":
+        return np.fmax.reduceat(values, starts, axis=0)
+
+    isnan = np.isnan(values)
+    if not isnan.any():
+        counts = np.diff(np.append(starts, len(values)))
+        return np.add.reduceat(values, starts, axis=0) / counts[:, None]
+    sums = np.add.reduceat(np.where(isnan, 0.0, values), starts, axis=0)
+    counts = np.add.reduceat(~isnan, starts, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
 def set_temporal_aggregation(n, resolution, snapshot_weightings):
     """
     Aggregate time-varying data to the given snapshots.
+
+    The network is modified in place. Segment boundaries are computed
+    once and all time series are reduced as NumPy blocks.
     """
     if not resolution:
         logger.info("No temporal aggregation. Using native resolution.")
@@ -6127,36 +6171,50 @@ def set_temporal_aggregation(n, resolution, snapshot_weightings):
             snapshot_weightings, index_col=0, parse_dates=True
         )
 
-        # Define a series used for aggregation, mapping each hour in
-        # n.snapshots to the closest previous timestep in
-        # snapshot_weightings.index
-        aggregation_map = (
-            pd.Series(
-                snapshot_weightings.index.get_indexer(n.snapshots), index=n.snapshots
-            )
+        # Map each hour in n.snapshots to the position of the closest
+        # previous timestep in snapshot_weightings.index
+        codes = (
+            pd.Series(snapshot_weightings.index.get_indexer(n.snapshots))
             .replace(-1, np.nan)
             .ffill()
             .astype(int)
-            .map(lambda i: snapshot_weightings.index[i])
+            .to_numpy()
         )
 
-        m = n.copy(with_time=False)
-        m.set_snapshots(snapshot_weightings.index)
-        m.snapshot_weightings = snapshot_weightings
+        # segment boundaries, computed once for all time series
+        order = None
+        if (np.diff(codes) < 0).any():
+            order = np.argsort(codes, kind="stable")
+            codes = codes[order]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        snapshots = snapshot_weightings.index[codes[starts]]
 
-        # Aggregation all time-varying data.
+        # Aggregation all time-varying data. Original tables are
+        # replaced by empty tables right away to limit peak memory.
+        aggregated = {}
         for c in n.iterate_components():
-            pnl = getattr(m, c.list_name + "_t")
+            pnl = getattr(n, c.list_name + "_t")
             for k, df in c.pnl.items():
-                if not df.empty:
-                    if c.list_name == "stores" and k == "e_max_pu":
-                        pnl[k] = df.groupby(aggregation_map).min()
-                    elif c.list_name == "stores" and k == "e_min_pu":
-                        pnl[k] = df.groupby(aggregation_map).max()
-                    else:
-                        pnl[k] = df.groupby(aggregation_map).mean()
+                if df.empty:
+                    continue
+                how = "mean"
+                if c.list_name == "stores" and k == "e_max_pu":
+                    how = "min"
+                elif c.list_name == "stores" and k == "e_min_pu":
+                    how = "max"
+                values = _segment_reduce(df, order, starts, how)
+                aggregated[c.list_name, k] = pd.DataFrame(
+                    values, index=snapshots, columns=df.columns
+                )
+                pnl[k] = df.iloc[:, :0]
+
+        n.set_snapshots(snapshot_weightings.index)
+        n.snapshot_weightings = snapshot_weightings
+
+        for (list_name, k), df in aggregated.items():
+            getattr(n, list_name + "_t")[k] = df.reindex(n.snapshots)
 
-        return m
+        return n
 
 
 def lossy_bidirectional_links(n, carrier, efficiencies={}, subset=None):
@@ -6591,327 +6649,357 @@ if __name__ == "__main__":
 
     investment_year = int(snakemake.wildcards.planning_horizons)
 
-    n = pypsa.Network(snakemake.input.network)
+    with memory_logger(
+        filename=snakemake.log.get("memory"),
+        interval=snakemake.config["solving"].get("mem_logging_frequency", 30),
+        phases_filename=snakemake.log.get("memory_phases"),
+    ) as mem:
+        mem.set_phase("load")
 
-    pop_layout = pd.read_csv(snakemake.input.clustered_pop_layout, index_col=0)
-    nhours = n.snapshot_weightings.generators.sum()
-    nyears = nhours / 8760
+        n = pypsa.Network(snakemake.input.network)
 
-    costs = load_costs(
-        snakemake.input.costs,
-        snakemake.params.costs,
-        nyears=nyears,
-    )
+        pop_layout = pd.read_csv(snakemake.input.clustered_pop_layout, index_col=0)
+        nhours = n.snapshot_weightings.generators.sum()
+        nyears = nhours / 8760
 
-    pop_weighted_energy_totals = (
-        pd.read_csv(snakemake.input.pop_weighted_energy_totals, index_col=0) * nyears
-    )
-    pop_weighted_heat_totals = (
-        pd.read_csv(snakemake.input.pop_weighted_heat_totals, index_col=0) * nyears
-    )
-    pop_weighted_energy_totals.update(pop_weighted_heat_totals)
-
-    fn = snakemake.input.gas_input_nodes_simplified
-    gas_input_nodes = pd.read_csv(fn, index_col=0)
-
-    carriers_to_keep = snakemake.params.pypsa_eur
-    profiles = {
-        key: snakemake.input[key]
-        for key in snakemake.input.keys()
-        if key.startswith("profile")
-    }
-    landfall_lengths = {
-        tech: settings["landfall_length"]
-        for tech, settings in snakemake.params.renewable.items()
-        if "landfall_length" in settings.keys()
-    }
-    patch_electricity_network(n, costs, carriers_to_keep, profiles, landfall_lengths)
-
-    fn = snakemake.input.heating_efficiencies
-    year = int(snakemake.params["energy_totals_year"])
-    heating_efficiencies = pd.read_csv(fn, index_col=[1, 0]).loc[year]
-
-    spatial = define_spatial(pop_layout.index, options)
-
-    if snakemake.params.foresight in ["myopic", "perfect"]:
-        add_lifetime_wind_solar(n, costs)
-
-        conventional = snakemake.params.conventional_carriers
-        for carrier in conventional:
-            add_carrier_buses(
-                n=n,
-                carrier=carrier,
-                costs=costs,
-                spatial=spatial,
-                options=options,
-                cf_industry=cf_industry,
-            )
-
-    add_eu_bus(n)
-
-    add_co2_tracking(
-        n,
-        costs,
-        options,
-        sequestration_potential_file=snakemake.input.sequestration_potential,
-    )
+        costs = load_costs(
+            snakemake.input.costs,
+            snakemake.params.costs,
+            nyears=nyears,
+        )
 
-    add_generation(
-        n=n,
-        costs=costs,
-        pop_layout=pop_layout,
-        conventionals=options["conventional_generation"],
-        spatial=spatial,
-        options=options,
-        cf_industry=cf_industry,
-    )
+        pop_weighted_energy_totals = (
+            pd.read_csv(snakemake.input.pop_weighted_energy_totals, index_col=0)
+            * nyears
+        )
+        pop_weighted_heat_totals = (
+            pd.read_csv(snakemake.input.pop_weighted_heat_totals, index_col=0) * nyears
+        )
+        pop_weighted_energy_totals.update(pop_weighted_heat_totals)
+
+        fn = snakemake.input.gas_input_nodes_simplified
+        gas_input_nodes = pd.read_csv(fn, index_col=0)
+
+        carriers_to_keep = snakemake.params.pypsa_eur
+        profiles = {
+            key: snakemake.input[key]
+            for key in snakemake.input.keys()
+            if key.startswith("profile")
+        }
+        landfall_lengths = {
+            tech: settings["landfall_length"]
+            for tech, settings in snakemake.params.renewable.items()
+            if "landfall_length" in settings.keys()
+        }
+        mem.set_phase("sector build")
+        patch_electricity_network(
+            n, costs, carriers_to_keep, profiles, landfall_lengths
+        )
+
+        fn = snakemake.input.heating_efficiencies
+        year = int(snakemake.params["energy_totals_year"])
+        heating_efficiencies = pd.read_csv(fn, index_col=[1, 0]).loc[year]
+
+        spatial = define_spatial(pop_layout.index, options)
+
+        if snakemake.params.foresight in ["myopic", "perfect"]:
+            add_lifetime_wind_solar(n, costs)
+
+            conventional = snakemake.params.conventional_carriers
+            for carrier in conventional:
+                add_carrier_buses(
+                    n=n,
+                    carrier=carrier,
+                    costs=costs,
+                    spatial=spatial,
+                    options=options,
+                    cf_industry=cf_industry,
+                )
 
-    add_storage_and_grids(
-        n=n,
-        costs=costs,
-        pop_layout=pop_layout,
-        h2_cavern_file=snakemake.input.h2_cavern,
-        cavern_types=snakemake.params.sector["hydrogen_underground_storage_locations"],
-        clustered_gas_network_file=snakemake.input.clustered_gas_network,
-        gas_input_nodes=gas_input_nodes,
-        spatial=spatial,
-        options=options,
-    )
+        add_eu_bus(n)
 
-    if options["transport"]:
-        add_land_transport(
-            n=n,
-            costs=costs,
-            transport_demand_file=snakemake.input.transport_demand,
-            transport_data_file=snakemake.input.transport_data,
-            avail_profile_file=snakemake.input.avail_profile,
-            dsm_profile_file=snakemake.input.dsm_profile,
-            temp_air_total_file=snakemake.input.temp_air_total,
-            cf_industry=cf_industry,
-            options=options,
-            investment_year=investment_year,
-            nodes=spatial.nodes,
+        add_co2_tracking(
+            n,
+            costs,
+            options,
+            sequestration_potential_file=snakemake.input.sequestration_potential,
         )
 
-    if options["heating"]:
-        add_heat(
+        add_generation(
             n=n,
             costs=costs,
-            cop_profiles_file=snakemake.input.cop_profiles,
-            direct_heat_source_utilisation_profile_file=snakemake.input.direct_heat_source_utilisation_profiles,
-            hourly_heat_demand_total_file=snakemake.input.hourly_heat_demand_total,
-            ptes_e_max_pu_file=snakemake.input.ptes_e_max_pu_profiles,
-            ates_e_nom_max=snakemake.input.ates_potentials,
-            ates_capex_as_fraction_of_geothermal_heat_source=snakemake.params.sector[
-                "district_heating"
-            ]["ates"]["capex_as_fraction_of_geothermal_heat_source"],
-            ates_marginal_cost_charger=snakemake.params.sector["district_heating"][
-                "ates"
-            ]["marginal_cost_charger"],
-            ates_recovery_factor=snakemake.params.sector["district_heating"]["ates"][
-                "recovery_factor"
-            ],
-            enable_ates=snakemake.params.sector["district_heating"]["ates"]["enable"],
-            ptes_direct_utilisation_profile=snakemake.input.ptes_direct_utilisation_profiles,
-            district_heat_share_file=snakemake.input.district_heat_share,
-            solar_thermal_total_file=snakemake.input.solar_thermal_total,
-            retro_cost_file=snakemake.input.retro_cost,
-            floor_area_file=snakemake.input.floor_area,
-            heat_source_profile_files={
-                source: snakemake.input[source]
-                for source in snakemake.params.limited_heat_sources
-                if source in snakemake.input.keys()
-            },
-            params=snakemake.params,
-            pop_weighted_energy_totals=pop_weighted_energy_totals,
-            heating_efficiencies=heating_efficiencies,
             pop_layout=pop_layout,
+            conventionals=options["conventional_generation"],
             spatial=spatial,
             options=options,
-            investment_year=investment_year,
-        )
-
-    if options["biomass"]:
-        add_biomass(
-            n=n,
-            costs=costs,
-            options=options,
-            spatial=spatial,
             cf_industry=cf_industry,
-            pop_layout=pop_layout,
-            biomass_potentials_file=snakemake.input.biomass_potentials,
-            biomass_transport_costs_file=snakemake.input.biomass_transport_costs,
-            nyears=nyears,
         )
 
-    if options["ammonia"]:
-        add_ammonia(n, costs, pop_layout, spatial, cf_industry)
-
-    if options["methanol"]:
-        add_methanol(n, costs, options=options, spatial=spatial, pop_layout=pop_layout)
-
-    if options["industry"]:
-        add_industry(
+        add_storage_and_grids(
             n=n,
             costs=costs,
-            industrial_demand_file=snakemake.input.industrial_demand,
             pop_layout=pop_layout,
-            pop_weighted_energy_totals=pop_weighted_energy_totals,
-            options=options,
+            h2_cavern_file=snakemake.input.h2_cavern,
+            cavern_types=snakemake.params.sector[
+                "hydrogen_underground_storage_locations"
+            ],
+            clustered_gas_network_file=snakemake.input.clustered_gas_network,
+            gas_input_nodes=gas_input_nodes,
             spatial=spatial,
-            cf_industry=cf_industry,
-            investment_year=investment_year,
-        )
-
-    if options["shipping"]:
-        add_shipping(
-            n=n,
-            costs=costs,
-            shipping_demand_file=snakemake.input.shipping_demand,
-            pop_layout=pop_layout,
-            pop_weighted_energy_totals=pop_weighted_energy_totals,
             options=options,
-            spatial=spatial,
-            investment_year=investment_year,
         )
 
-    if options["aviation"]:
-        add_aviation(
-            n=n,
-            costs=costs,
-            pop_layout=pop_layout,
-            pop_weighted_energy_totals=pop_weighted_energy_totals,
-            options=options,
-            spatial=spatial,
-            investment_year=investment_year,
-        )
+        if options["transport"]:
+            add_land_transport(
+                n=n,
+                costs=costs,
+                transport_demand_file=snakemake.input.transport_demand,
+                transport_data_file=snakemake.input.transport_data,
+                avail_profile_file=snakemake.input.avail_profile,
+                dsm_profile_file=snakemake.input.dsm_profile,
+                temp_air_total_file=snakemake.input.temp_air_total,
+                cf_industry=cf_industry,
+                options=options,
+                investment_year=investment_year,
+                nodes=spatial.nodes,
+            )
 
-    if options["heating"]:
-        add_waste_heat(n, costs, options, cf_industry)
+        if options["heating"]:
+            add_heat(
+                n=n,
+                costs=costs,
+                cop_profiles_file=snakemake.input.cop_profiles,
+                direct_heat_source_utilisation_profile_file=snakemake.input.direct_heat_source_utilisation_profiles,
+                hourly_heat_demand_total_file=snakemake.input.hourly_heat_demand_total,
+                ptes_e_max_pu_file=snakemake.input.ptes_e_max_pu_profiles,
+                ates_e_nom_max=snakemake.input.ates_potentials,
+                ates_capex_as_fraction_of_geothermal_heat_source=snakemake.params.sector[
+                    "district_heating"
+                ]["ates"]["capex_as_fraction_of_geothermal_heat_source"],
+                ates_marginal_cost_charger=snakemake.params.sector["district_heating"][
+                    "ates"
+                ]["marginal_cost_charger"],
+                ates_recovery_factor=snakemake.params.sector["district_heating"][
+                    "ates"
+                ]["recovery_factor"],
+                enable_ates=snakemake.params.sector["district_heating"]["ates"][
+                    "enable"
+                ],
+                ptes_direct_utilisation_profile=snakemake.input.ptes_direct_utilisation_profiles,
+                district_heat_share_file=snakemake.input.district_heat_share,
+                solar_thermal_total_file=snakemake.input.solar_thermal_total,
+                retro_cost_file=snakemake.input.retro_cost,
+                floor_area_file=snakemake.input.floor_area,
+                heat_source_profile_files={
+                    source: snakemake.input[source]
+                    for source in snakemake.params.limited_heat_sources
+                    if source in snakemake.input.keys()
+                },
+                params=snakemake.params,
+                pop_weighted_energy_totals=pop_weighted_energy_totals,
+                heating_efficiencies=heating_efficiencies,
+                pop_layout=pop_layout,
+                spatial=spatial,
+                options=options,
+                investment_year=investment_year,
+            )
 
-    if options["agriculture"]:  # requires H and I
-        add_agriculture(
-            n,
-            costs,
-            pop_layout,
-            pop_weighted_energy_totals,
-            investment_year,
-            options,
-            spatial,
-        )
+        if options["biomass"]:
+            add_biomass(
+                n=n,
+                costs=costs,
+                options=options,
+                spatial=spatial,
+                cf_industry=cf_industry,
+                pop_layout=pop_layout,
+                biomass_potentials_file=snakemake.input.biomass_potentials,
+                biomass_transport_costs_file=snakemake.input.biomass_transport_costs,
+                nyears=nyears,
+            )
 
-    if options["dac"]:
-        add_dac(n, costs)
+        if options["ammonia"]:
+            add_ammonia(n, costs, pop_layout, spatial, cf_industry)
 
-    if not options["electricity_transmission_grid"]:
-        decentral(n)
+        if options["methanol"]:
+            add_methanol(
+                n, costs, options=options, spatial=spatial, pop_layout=pop_layout
+            )
 
-    if not options["H2_network"]:
-        remove_h2_network(n)
+        if options["industry"]:
+            add_industry(
+                n=n,
+                costs=costs,
+                industrial_demand_file=snakemake.input.industrial_demand,
+                pop_layout=pop_layout,
+                pop_weighted_energy_totals=pop_weighted_energy_totals,
+                options=options,
+                spatial=spatial,
+                cf_industry=cf_industry,
+                investment_year=investment_year,
+            )
 
-    if options["co2_network"]:
-        add_co2_network(
-            n,
-            costs,
-            co2_network_cost_factor=snakemake.config["sector"][
-                "co2_network_cost_factor"
-            ],
-        )
+        if options["shipping"]:
+            add_shipping(
+                n=n,
+                costs=costs,
+                shipping_demand_file=snakemake.input.shipping_demand,
+                pop_layout=pop_layout,
+                pop_weighted_energy_totals=pop_weighted_energy_totals,
+                options=options,
+                spatial=spatial,
+                investment_year=investment_year,
+            )
 
-    if options["allam_cycle_gas"]:
-        add_allam_gas(n, costs, pop_layout=pop_layout, spatial=spatial)
+        if options["aviation"]:
+            add_aviation(
+                n=n,
+                costs=costs,
+                pop_layout=pop_layout,
+                pop_weighted_energy_totals=pop_weighted_energy_totals,
+                options=options,
+                spatial=spatial,
+                investment_year=investment_year,
+            )
 
-    n = set_temporal_aggregation(
-        n, snakemake.params.time_resolution, snakemake.input.snapshot_weightings
-    )
+        if options["heating"]:
+            add_waste_heat(n, costs, options, cf_industry)
 
-    co2_budget = snakemake.params.co2_budget
-    if isinstance(co2_budget, str) and co2_budget.startswith("cb"):
-        fn = "results/" + snakemake.params.RDIR + "/csvs/carbon_budget_distribution.csv"
-        if not os.path.exists(fn):
-            emissions_scope = snakemake.params.emissions_scope
-            input_co2 = snakemake.input.co2
-            build_carbon_budget(
-                co2_budget,
-                snakemake.input.eurostat,
-                fn,
-                emissions_scope,
-                input_co2,
+        if options["agriculture"]:  # requires H and I
+            add_agriculture(
+                n,
+                costs,
+                pop_layout,
+                pop_weighted_energy_totals,
+                investment_year,
                 options,
-                snakemake.params.countries,
-                snakemake.params.planning_horizons,
+                spatial,
+            )
+
+        if options["dac"]:
+            add_dac(n, costs)
+
+        if not options["electricity_transmission_grid"]:
+            decentral(n)
+
+        if not options["H2_network"]:
+            remove_h2_network(n)
+
+        if options["co2_network"]:
+            add_co2_network(
+                n,
+                costs,
+                co2_network_cost_factor=snakemake.config["sector"][
+                    "co2_network_cost_factor"
+                ],
             )
-        co2_cap = pd.read_csv(fn, index_col=0).squeeze()
-        limit = co2_cap.loc[investment_year]
-    else:
-        limit = get(co2_budget, investment_year)
-    add_co2limit(
-        n,
-        options,
-        snakemake.input.co2_totals_name,
-        snakemake.params.countries,
-        nyears,
-        limit,
-    )
 
-    maxext = snakemake.params["lines"]["max_extension"]
-    if maxext is not None:
-        limit_individual_line_extension(n, maxext)
+        if options["allam_cycle_gas"]:
+            add_allam_gas(n, costs, pop_layout=pop_layout, spatial=spatial)
 
-    if options["electricity_distribution_grid"]:
-        insert_electricity_distribution_grid(
-            n, costs, options, pop_layout, snakemake.input.solar_rooftop_potentials
+        mem.set_phase("temporal aggregation")
+        n = set_temporal_aggregation(
+            n, snakemake.params.time_resolution, snakemake.input.snapshot_weightings
         )
+        mem.set_phase("finalization")
 
-    if options["enhanced_geothermal"].get("enable", False):
-        logger.info("Adding Enhanced Geothermal Systems (EGS).")
-        add_enhanced_geothermal(
+        co2_budget = snakemake.params.co2_budget
+        if isinstance(co2_budget, str) and co2_budget.startswith("cb"):
+            fn = (
+                "results/"
+                + snakemake.params.RDIR
+                + "/csvs/carbon_budget_distribution.csv"
+            )
+            if not os.path.exists(fn):
+                emissions_scope = snakemake.params.emissions_scope
+                input_co2 = snakemake.input.co2
+                build_carbon_budget(
+                    co2_budget,
+                    snakemake.input.eurostat,
+                    fn,
+                    emissions_scope,
+                    input_co2,
+                    options,
+                    snakemake.params.countries,
+                    snakemake.params.planning_horizons,
+                )
+            co2_cap = pd.read_csv(fn, index_col=0).squeeze()
+            limit = co2_cap.loc[investment_year]
+        else:
+            limit = get(co2_budget, investment_year)
+        add_co2limit(
             n,
-            costs=costs,
-            costs_config=snakemake.config["costs"],
-            egs_potentials=snakemake.input["egs_potentials"],
-            egs_overlap=snakemake.input["egs_overlap"],
-            egs_config=snakemake.params["sector"]["enhanced_geothermal"],
-            egs_capacity_factors="path/to/capacity_factors.csv",
+            options,
+            snakemake.input.co2_totals_name,
+            snakemake.params.countries,
+            nyears,
+            limit,
         )
 
-    if options["imports"]["enable"]:
-        add_import_options(n, costs, options, gas_input_nodes)
+        maxext = snakemake.params["lines"]["max_extension"]
+        if maxext is not None:
+            limit_individual_line_extension(n, maxext)
 
-    if options["gas_distribution_grid"]:
-        insert_gas_distribution_costs(n, costs, options=options)
+        if options["electricity_distribution_grid"]:
+            insert_electricity_distribution_grid(
+                n, costs, options, pop_layout, snakemake.input.solar_rooftop_potentials
+            )
 
-    if options["electricity_grid_connection"]:
-        add_electricity_grid_connection(n, costs)
+        if options["enhanced_geothermal"].get("enable", False):
+            logger.info("Adding Enhanced Geothermal Systems (EGS).")
+            add_enhanced_geothermal(
+                n,
+                costs=costs,
+                costs_config=snakemake.config["costs"],
+                egs_potentials=snakemake.input["egs_potentials"],
+                egs_overlap=snakemake.input["egs_overlap"],
+                egs_config=snakemake.params["sector"]["enhanced_geothermal"],
+                egs_capacity_factors="path/to/capacity_factors.csv",
+            )
 
-    for k, v in options["transmission_efficiency"].items():
-        if k in options["transmission_efficiency"]["enable"]:
-            lossy_bidirectional_links(n, k, v)
+        if options["imports"]["enable"]:
+            add_import_options(n, costs, options, gas_input_nodes)
 
-    # Workaround: Remove lines with conflicting (and unrealistic) properties
-    # cf. https://github.com/PyPSA/pypsa-eur/issues/444
-    if snakemake.config["solving"]["options"]["transmission_losses"]:
-        idx = n.lines.query("num_parallel == 0").index
-        logger.info(
-            f"Removing {len(idx)} line(s) with properties conflicting with transmission losses functionality."
-        )
-        n.remove("Line", idx)
+        if options["gas_distribution_grid"]:
+            insert_gas_distribution_costs(n, costs, options=options)
 
-    first_year_myopic = (snakemake.params.foresight in ["myopic", "perfect"]) and (
-        snakemake.params.planning_horizons[0] == investment_year
-    )
+        if options["electricity_grid_connection"]:
+            add_electricity_grid_connection(n, costs)
 
-    if options["cluster_heat_buses"] and not first_year_myopic:
-        cluster_heat_buses(n)
+        for k, v in options["transmission_efficiency"].items():
+            if k in options["transmission_efficiency"]["enable"]:
+                lossy_bidirectional_links(n, k, v)
 
-    if not options["district_heating"]["subnodes"]["enable"]:
-        maybe_adjust_costs_and_potentials(
-            n, snakemake.params["adjustments"], investment_year
+        # Workaround: Remove lines with conflicting (and unrealistic) properties
+        # cf. https://github.com/PyPSA/pypsa-eur/issues/444
+        if snakemake.config["solving"]["options"]["transmission_losses"]:
+            idx = n.lines.query("num_parallel == 0").index
+            logger.info(
+                f"Removing {len(idx)} line(s) with properties conflicting with transmission losses functionality."
+            )
+            n.remove("Line", idx)
+
+        first_year_myopic = (snakemake.params.foresight in ["myopic", "perfect"]) and (
+            snakemake.params.planning_horizons[0] == investment_year
         )
 
-    n.meta = dict(snakemake.config, **dict(wildcards=dict(snakemake.wildcards)))
+        if options["cluster_heat_buses"] and not first_year_myopic:
+            cluster_heat_buses(n)
+
+        if not options["district_heating"]["subnodes"]["enable"]:
+            maybe_adjust_costs_and_potentials(
+                n, snakemake.params["adjustments"], investment_year
+            )
+
+        n.meta = dict(snakemake.config, **dict(wildcards=dict(snakemake.wildcards)))
+
+        sanitize_carriers(n, snakemake.config)
+        sanitize_locations(n)
 
-    sanitize_carriers(n, snakemake.config)
-    sanitize_locations(n)
+        mem.set_phase("export")
+        export_network(
+            n,
+            snakemake.output[0],
+            intern_profiles=snakemake.config["run"]["intern_profiles"],
+        )
 
-    n.export_to_netcdf(snakemake.output[0])
+    logger.info(f"Maximum memory usage: {mem.mem_usage}")
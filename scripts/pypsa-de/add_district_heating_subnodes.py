@@ -11,6 +11,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from scripts._helpers import (
     configure_logging,
+    export_network,
+    load_network,
     set_scenario_config,
     update_config_from_wildcards,
 )
@@ -660,7 +662,7 @@ if __name__ == "__main__":
 
     logger.info("Adding SysGF-specific functionality")
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     lau = gpd.read_file(
         f"{snakemake.input.lau_regions}!LAU_RG_01M_2019_3035.geojson",
@@ -725,4 +727,8 @@ if __name__ == "__main__":
     maybe_adjust_costs_and_potentials(
         n, snakemake.params["adjustments"], snakemake.wildcards.planning_horizons
     )
-    n.export_to_netcdf(snakemake.output.network)
+    export_network(
+        n,
+        snakemake.output.network,
+        intern_profiles=snakemake.config["run"]["intern_profiles"],
+    )
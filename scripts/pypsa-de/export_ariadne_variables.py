@@ -1,6 +1,7 @@
 import ast
 import logging
 import math
+import multiprocessing as mp
 import os
 import re
 import sys
@@ -14,7 +15,7 @@ import pandas as pd
 import pypsa
 from pypsa.statistics import get_transmission_carriers
 
-from scripts._helpers import configure_logging, mock_snakemake
+from scripts._helpers import configure_logging, load_network, mock_snakemake
 from scripts.add_electricity import calculate_annuity, load_costs
 
 
@@ -45,6 +46,105 @@ toe_to_MWh = 11.630  # GWh/ktoe OR MWh/toe
 EUR20TOEUR23 = 1.1076
 
 
+class StatisticsContext:
+    """
+    Serve the energy balances of a network from precomputed balances.
+
+    Almost all variables are derived from ``supply`` and ``withdrawal`` at
+    the ports of the components, grouped by at least bus and carrier. The
+    bus determines the bus carrier, so these calls are slices of a single
+    balance per direction grouped by name, bus, carrier and bus carrier,
+    which is computed on first use. All other calls are passed on to
+    ``n.statistics``.
+    """
+
+    levels = ["name", "bus", "carrier", "bus_carrier"]
+
+    def __init__(self, n):
+        self.n = n
+        self.balances = {}
+
+    def supply(self, **kwargs):
+        return self._get_balance("supply", **kwargs)
+
+    def withdrawal(self, **kwargs):
+        return self._get_balance("withdrawal", **kwargs)
+
+    def _get_balance(
+        self,
+        direction,
+        comps=None,
+        groupby="carrier",
+        at_port=True,
+        carrier=None,
+        bus_carrier=None,
+        nice_names=None,
+        drop_zero=None,
+        round=None,
+        **kwargs,
+    ):
+        if (
+            kwargs
+            or isinstance(comps, str)
+            or bus_carrier is None
+            or at_port is not True
+            or nice_names is not False
+            or isinstance(groupby, str)
+            or "bus" not in groupby
+            or not set(groupby).issubset(self.levels)
+        ):
+            return getattr(self.n.statistics, direction)(
+                comps=comps,
+                groupby=groupby,
+                at_port=at_port,
+                carrier=carrier,
+                bus_carrier=bus_carrier,
+                nice_names=nice_names,
+                drop_zero=drop_zero,
+                round=round,
+                **kwargs,
+            )
+
+        if direction not in self.balances:
+            self.balances[direction] = getattr(self.n.statistics, direction)(
+                groupby=self.levels, nice_names=False, drop_zero=False, round=False
+            )
+        df = self.balances[direction]
+
+        for level, values in [
+            ("bus_carrier", bus_carrier),
+            ("component", comps),
+            ("carrier", carrier),
+        ]:
+            if values is not None:
+                values = [values] if isinstance(values, str) else values
+                df = df[df.index.get_level_values(level).isin(values)]
+
+        df = df.groupby(level=["component", *groupby]).sum()
+
+        # mirror the option handling of pypsa, which may change between calls
+        options = pypsa.options.params.statistics
+        round = options.round if round is None else round
+        drop_zero = options.drop_zero if drop_zero is None else drop_zero
+        if round:
+            df = df.round(round)
+        if drop_zero:
+            df = df[df != 0]
+        return df
+
+
+def get_statistics(n):
+    """
+    Return the statistics context of a network, creating it on first use.
+
+    The context assumes that the dispatch of ``n`` does not change anymore,
+    i.e. it must only be requested after ``process_postnetworks``.
+    """
+    if getattr(n, "_statistics_context", None) is None:
+        n._statistics_context = StatisticsContext(n)
+    return n._statistics_context
+
+
 def domestic_length_factor(n, carriers, region="DE"):
     """
     Calculate the length factor for specified carriers within a PyPSA network.
@@ -121,15 +221,15 @@ def _get_fuel_fractions(n, region, fuel):
     }
 
     renewable_fuel_supply = (
-        n.statistics.supply(
-            bus_carrier=fuel if fuel == "gas" else f"renewable {fuel}", **kwargs
-        )
+        get_statistics(n)
+        .supply(bus_carrier=fuel if fuel == "gas" else f"renewable {fuel}", **kwargs)
         .groupby(["bus", "carrier"])
         .sum()
     ).round(3)  # rounding for numerical stability
 
     total_fuel_supply = (
-        n.statistics.supply(bus_carrier=fuel, **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier=fuel, **kwargs)
         .groupby(["name", "carrier"])
         .sum()
     ).round(3)
@@ -260,7 +360,8 @@ def _get_h2_fossil_fraction(n):
         "nice_names": False,
     }
     total_h2_supply = (
-        n.statistics.supply(bus_carrier="H2", **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier="H2", **kwargs)
         .drop("Store", errors="ignore")
         .groupby("carrier")
         .sum()
@@ -361,6 +462,11 @@ def get_capacities(n, region):
 
 
 def add_system_cost_rows(n):
+    # the rows of the first planning horizon are added before its evaluation
+    if getattr(n, "_system_cost_rows", False):
+        return
+    n._system_cost_rows = True
+
     def fill_if_lifetime_inf(n, carrier, lifetime, component="links"):
         df = getattr(n, component)
         if df.loc[df.carrier == carrier, "lifetime"].sum() == np.inf:
@@ -429,13 +535,14 @@ def add_system_cost_rows(n):
 
 
 """
-    get_system_cost(n, region)
+    get_system_cost(n, region, n_base)
 
     Calculate total investment, CAPEX, and OPEX in the given region.
+    The CAPEX and grid investments of the base year are taken from n_base.
 """
 
 
-def get_system_cost(n, region):
+def get_system_cost(n, region, n_base):
     add_system_cost_rows(n)
 
     invest = _get_capacities(
@@ -459,9 +566,9 @@ def get_system_cost(n, region):
     )
 
     capex2020 = _get_capacities(
-        networks[0],
+        n_base,
         region,
-        lambda **kwargs: networks[0].statistics.installed_capex(
+        lambda **kwargs: n_base.statistics.installed_capex(
             **kwargs, cost_attribute="annuity"
         ),
         cap_string="System Cost|CAPEX|",
@@ -470,7 +577,9 @@ def get_system_cost(n, region):
     # Subtracting all capex of assets built before 2020
     capex -= capex2020
 
-    baseyear_grid_invest = get_grid_investments(n, region, scope="baseyear")
+    baseyear_grid_invest = get_grid_investments(
+        n, region, scope="baseyear", n_base=n_base
+    )
 
     # Assuming 40 years lifetime, 7% discount rate
     grid_capex = pd.Series(
@@ -1135,7 +1244,8 @@ def get_CHP_E_and_H_usage(n, bus_carrier, region, fossil_fraction=1):
     }
 
     usage = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=bus_carrier,
             **kwargs,
         )
@@ -1170,7 +1280,8 @@ def get_primary_energy(n, region):
         n.links.query("carrier=='oil refining'").efficiency.unique().item()
     )
     oil_usage = (
-        n.statistics.withdrawal(bus_carrier="oil", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="oil", **kwargs)
         .filter(like=region)
         .drop("Store", errors="ignore")
         .groupby("carrier")
@@ -1203,7 +1314,8 @@ def get_primary_energy(n, region):
 
     assert isclose(
         var["Primary Energy|Oil"],
-        n.statistics.withdrawal(bus_carrier="oil primary", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="oil primary", **kwargs)
         .get(("Link", "DE oil refining"), pd.Series(0))
         .item(),
     )
@@ -1211,7 +1323,8 @@ def get_primary_energy(n, region):
     gas_fractions = _get_fuel_fractions(n, region, "gas")
 
     gas_usage = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier="gas",
             **kwargs,
         )
@@ -1253,7 +1366,8 @@ def get_primary_energy(n, region):
     var["Primary Energy|Gas"] = gas_usage.sum() / primary_gas_factor
 
     _gas_primary = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier="gas primary",
             **kwargs,
         )
@@ -1285,7 +1399,8 @@ def get_primary_energy(n, region):
     )
 
     coal_usage = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=["lignite", "coal"],
             **kwargs,
         )
@@ -1331,7 +1446,8 @@ def get_primary_energy(n, region):
     )
 
     biomass_usage = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=["solid biomass", "biogas"],
             **kwargs,
         )
@@ -1354,7 +1470,8 @@ def get_primary_energy(n, region):
     #     ).efficiency.unique().item()
 
     unsus_btl_secondary = (
-        n.statistics.supply(
+        get_statistics(n)
+        .supply(
             bus_carrier=["renewable oil"],
             **kwargs,
         )
@@ -1404,7 +1521,8 @@ def get_primary_energy(n, region):
     )
 
     var["Primary Energy|Nuclear"] = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=["uranium"],
             **kwargs,
         )
@@ -1416,7 +1534,8 @@ def get_primary_energy(n, region):
 
     # ! This should basically be equivalent to secondary energy
     renewable_electricity = (
-        n.statistics.supply(
+        get_statistics(n)
+        .supply(
             bus_carrier=["AC", "low voltage"],
             **kwargs,
         )
@@ -1434,7 +1553,8 @@ def get_primary_energy(n, region):
     )
 
     solar_thermal_heat = (
-        n.statistics.supply(
+        get_statistics(n)
+        .supply(
             bus_carrier=[
                 "urban decentral heat",
                 "urban central heat",
@@ -1495,7 +1615,8 @@ def get_secondary_energy(n, region, _industry_demand):
     var = pd.Series()
 
     electricity_supply = (
-        n.statistics.supply(bus_carrier=["low voltage", "AC"], **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier=["low voltage", "AC"], **kwargs)
         .filter(like=region)
         .groupby(["carrier"])
         .sum()
@@ -1666,7 +1787,8 @@ def get_secondary_energy(n, region, _industry_demand):
     )
 
     heat_supply = (
-        n.statistics.supply(
+        get_statistics(n)
+        .supply(
             bus_carrier=[
                 "urban central heat",
                 # rural and urban decentral heat do not produce secondary energy
@@ -1738,7 +1860,8 @@ def get_secondary_energy(n, region, _industry_demand):
     )
 
     hydrogen_production = (
-        n.statistics.supply(bus_carrier="H2", **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier="H2", **kwargs)
         .filter(like=region)
         .drop("Store", errors="ignore")
         .groupby(["carrier"])
@@ -1774,7 +1897,8 @@ def get_secondary_energy(n, region, _industry_demand):
 
     # Liquids
     liquids_production = (
-        n.statistics.supply(bus_carrier=["oil", "renewable oil", "methanol"], **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier=["oil", "renewable oil", "methanol"], **kwargs)
         .filter(like=region)
         .drop(
             [("Store", "DE oil Store"), ("Store", "DE methanol Store")], errors="ignore"
@@ -1808,7 +1932,8 @@ def get_secondary_energy(n, region, _industry_demand):
     )
 
     gas_supply = (
-        n.statistics.supply(bus_carrier=["gas"], **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier=["gas"], **kwargs)
         .filter(like=region)
         .drop(("Store", "DE gas Store"), errors="ignore")
         .groupby(["carrier"])
@@ -1842,7 +1967,8 @@ def get_secondary_energy(n, region, _industry_demand):
     )
 
     biomass_usage = (
-        n.statistics.withdrawal(bus_carrier="solid biomass", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="solid biomass", **kwargs)
         .filter(like=region)
         .groupby(["carrier"])
         .sum()
@@ -1855,7 +1981,8 @@ def get_secondary_energy(n, region, _industry_demand):
     )
 
     electricity_withdrawal = (
-        n.statistics.withdrawal(bus_carrier=["low voltage", "AC"], **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier=["low voltage", "AC"], **kwargs)
         .filter(like=region)
         .groupby(["carrier"])
         .sum()
@@ -1874,7 +2001,8 @@ def get_secondary_energy(n, region, _industry_demand):
     )
 
     hydrogen_withdrawal = (
-        n.statistics.withdrawal(bus_carrier="H2", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="H2", **kwargs)
         .filter(like=region)
         .groupby(["carrier"])
         .sum()
@@ -1932,7 +2060,8 @@ def get_final_energy(
     if config_industry["ammonia"]:
         # MWh/a
         Haber_Bosch_NH3 = (
-            n.statistics.supply(bus_carrier="NH3", **kwargs)
+            get_statistics(n)
+            .supply(bus_carrier="NH3", **kwargs)
             .groupby("carrier")
             .sum()["Haber-Bosch"]
         )
@@ -2157,7 +2286,8 @@ def get_final_energy(
     )
     # Final energy is delivered to the consumers
     low_voltage_electricity = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier="low voltage",
             **kwargs,
         )
@@ -2184,7 +2314,8 @@ def get_final_energy(
     # urban decentral heat and rural heat are delivered as different forms of energy
     # (gas, oil, biomass, ...)
     decentral_heat_withdrawal = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=["rural heat", "urban decentral heat"],
             **kwargs,
         )
@@ -2210,7 +2341,8 @@ def get_final_energy(
     )
 
     decentral_heat_supply_rescom = (
-        n.statistics.supply(
+        get_statistics(n)
+        .supply(
             bus_carrier=["rural heat", "urban decentral heat"],
             **kwargs,
         )
@@ -2231,7 +2363,8 @@ def get_final_energy(
     )  # Assuming for solar thermal secondary energy == Final energy
 
     gas_usage = (
-        n.statistics.withdrawal(bus_carrier="gas", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="gas", **kwargs)
         .filter(like=region)
         .groupby(["carrier"])
         .sum()
@@ -2251,7 +2384,8 @@ def get_final_energy(
     # var["Final Energy|Residential and Commercial|Hydrogen"] = \
     # ! Not implemented
     oil_usage = (
-        n.statistics.withdrawal(bus_carrier="oil", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="oil", **kwargs)
         .filter(like=region)
         .groupby(["carrier"])
         .sum()
@@ -2277,7 +2411,8 @@ def get_final_energy(
     # ! Not implemented
 
     biomass_usage = (
-        n.statistics.withdrawal(bus_carrier="solid biomass", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="solid biomass", **kwargs)
         .filter(like=region)
         .groupby(["carrier"])
         .sum()
@@ -2454,7 +2589,8 @@ def get_final_energy(
     # !!! TODO this assert is temporarily disabled because of https://github.com/PyPSA/pypsa-eur/issues/985
 
     central_heat_withdrawal = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=["urban central heat"],
             **kwargs,
         )
@@ -2470,7 +2606,8 @@ def get_final_energy(
     ) + central_heat_withdrawal.get("DAC", 0)
 
     electricity = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier="AC",
             **kwargs,
         )
@@ -2555,7 +2692,8 @@ def get_final_energy(
     # ! Not implemented
 
     waste_withdrawal = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=["non-sequestered HVC"],
             **kwargs,
         )
@@ -2606,7 +2744,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
     var = pd.Series()
 
     co2_emissions = (
-        n.statistics.supply(bus_carrier="co2", **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier="co2", **kwargs)
         .filter(like=region)
         .groupby("carrier")
         .sum()
@@ -2614,7 +2753,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
     )
 
     co2_atmosphere_withdrawal = (
-        n.statistics.withdrawal(bus_carrier="co2", **kwargs)
+        get_statistics(n)
+        .withdrawal(bus_carrier="co2", **kwargs)
         .filter(like=region)
         .groupby("carrier")
         .sum()
@@ -2624,7 +2764,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
     var["Emissions|CO2|Model"] = co2_emissions.sum() - co2_atmosphere_withdrawal.sum()
 
     co2_storage = (
-        n.statistics.supply(bus_carrier="co2 stored", **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier="co2 stored", **kwargs)
         .filter(like=region)
         .groupby("carrier")
         .sum()
@@ -2637,7 +2778,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
 
     try:
         total_ccs = (
-            n.statistics.supply(bus_carrier="co2 sequestered", **kwargs)
+            get_statistics(n)
+            .supply(bus_carrier="co2 sequestered", **kwargs)
             .filter(like=region)
             .get("Link")
             .groupby("carrier")
@@ -2686,7 +2828,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
 
     CHP_emissions = (
         (
-            n.statistics.supply(bus_carrier="co2", **kwargs)
+            get_statistics(n)
+            .supply(bus_carrier="co2", **kwargs)
             .filter(like=region)
             .filter(like="CHP")
             .multiply(t2Mt)
@@ -2697,7 +2840,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
 
     CHP_atmosphere_withdrawal = (
         (
-            n.statistics.withdrawal(bus_carrier="co2", **kwargs)
+            get_statistics(n)
+            .withdrawal(bus_carrier="co2", **kwargs)
             .filter(like=region)
             .filter(like="CHP")
             .multiply(t2Mt)
@@ -2708,7 +2852,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
 
     CHP_storage = (
         (
-            n.statistics.supply(bus_carrier="co2 stored", **kwargs)
+            get_statistics(n)
+            .supply(bus_carrier="co2 stored", **kwargs)
             .filter(like=region)
             .filter(like="CHP")
             .multiply(t2Mt)
@@ -2852,7 +2997,8 @@ def get_emissions(n, region, _energy_totals, industry_demand):
     )
 
     process_emissions = (
-        n.statistics.supply(bus_carrier="process emissions", **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier="process emissions", **kwargs)
         .filter(like=region)
         .groupby("carrier")
         .sum()
@@ -3118,7 +3264,8 @@ def get_nodal_flows(n, bus_carrier, region, query="index == index or index != in
     groupby = ["name", "bus", "carrier"]
 
     result = (
-        n.statistics.withdrawal(
+        get_statistics(n)
+        .withdrawal(
             bus_carrier=bus_carrier,
             groupby=groupby,
             aggregate_time=False,
@@ -3154,7 +3301,8 @@ def get_nodal_supply(n, bus_carrier, query="index == index or index != index"):
     groupby = ["name", "bus", "carrier"]
 
     result = (
-        n.statistics.supply(
+        get_statistics(n)
+        .supply(
             bus_carrier=bus_carrier,
             groupby=groupby,
             aggregate_time=False,
@@ -3908,8 +4056,10 @@ def get_grid_investments(
     region,
     scope="all",  # all, baseyear, expanded
     var_name="Investment|Energy Supply|Electricity|Transmission|",
+    n_base=None,
 ):
     assert scope in ["all", "baseyear", "expanded"]
+    assert scope != "baseyear" or n_base is not None
     # TODO gap between years should be read from config
     var = pd.Series()
 
@@ -3919,11 +4069,9 @@ def get_grid_investments(
     if scope == "expanded":
         offwind_capacity -= offwind.p_nom
     elif scope == "baseyear":
-        # WARNING USING GLOBAL VARIABLE `networks[0]`!!!
         # Subtracting 2020 capacity
         offwind2020 = (
-            networks[0]
-            .generators.filter(like="offwind", axis=0)
+            n_base.generators.filter(like="offwind", axis=0)
             .filter(like="DE", axis=0)
             .p_nom
         )
@@ -3959,9 +4107,8 @@ def get_grid_investments(
     if scope == "expanded":
         dc_capacity -= dc_links.p_nom_min
     elif scope == "baseyear":
-        # WARNING USING GLOBAL VARIABLE!!!
         # Subtracting 2020 capacity
-        dc_capacity -= networks[0].links.loc[dc_links.index].p_nom_min
+        dc_capacity -= n_base.links.loc[dc_links.index].p_nom_min
 
     dc_investments = dc_capacity * dc_links.overnight_cost * 1e-9
     # International dc_projects are only accounted with half the costs
@@ -3978,9 +4125,8 @@ def get_grid_investments(
     if scope == "expanded":
         ac_capacity -= ac_lines.s_nom_min
     elif scope == "baseyear":
-        # WARNING USING GLOBAL VARIABLE!!!
         # Subtracting 2020 capacity
-        ac_capacity -= networks[0].lines.loc[ac_lines.index].s_nom_min
+        ac_capacity -= n_base.lines.loc[ac_lines.index].s_nom_min
 
     ac_investments = ac_capacity * ac_lines.overnight_cost * 1e-9
     # International ac_projects are only accounted with half the costs
@@ -4612,7 +4758,8 @@ def get_trade(n, region):
     # Trade|Secondary Energy|Liquids|Hydrogen|Volume
 
     renewable_oil_supply = (
-        n.statistics.supply(bus_carrier="renewable oil", **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier="renewable oil", **kwargs)
         .groupby(["bus", "carrier"])
         .sum()
     )
@@ -4668,7 +4815,8 @@ def get_trade(n, region):
     # Trade|Secondary Energy|Gases|Hydrogen|Volume
 
     renewable_gas_supply = (
-        n.statistics.supply(bus_carrier="gas", **kwargs)
+        get_statistics(n)
+        .supply(bus_carrier="gas", **kwargs)
         .groupby(["bus", "carrier"])
         .sum()
     )
@@ -5211,6 +5359,7 @@ def get_ariadne_var(
     costs,
     region,
     year,
+    n_base,
 ):
     var = pd.concat(
         [
@@ -5236,7 +5385,7 @@ def get_ariadne_var(
             get_policy(n, year),
             get_trade(n, region),
             get_economy(n, region),
-            get_system_cost(n, region),
+            get_system_cost(n, region, n_base),
         ]
     )
 
@@ -5253,6 +5402,7 @@ def get_data(
     costs,
     region,
     year,
+    n_base,
     version="0.10",
     scenario="test",
 ):
@@ -5265,6 +5415,7 @@ def get_data(
         costs,
         region,
         year,
+        n_base,
     )
 
     # Renaming variables
@@ -5340,6 +5491,63 @@ def get_data(
     return tab
 
 
+def get_horizon_data(
+    network_path,
+    costs,
+    industry_demand,
+    energy_totals,
+    sector_ratios,
+    industry_production,
+    year,
+):
+    """
+    Load, process and evaluate the network of a single planning horizon.
+
+    Defined at module level, because process pools must be able to pickle
+    the function. The reference networks ``n_start`` and ``networks[0]``
+    are read from the globals of the script, so that forked workers share
+    them with the parent process instead of receiving a pickled copy with
+    every task.
+
+    Parameters
+    ----------
+    network_path : str
+        Path to the postnetwork of the planning horizon.
+    costs : pd.DataFrame
+        Costs of the planning horizon in bn €.
+    industry_demand, energy_totals, sector_ratios, industry_production : pd.DataFrame
+        Input data of the planning horizon, see ``get_data``.
+    year : int
+        The planning horizon.
+
+    Returns
+    -------
+    pd.DataFrame
+        The variables of the planning horizon as returned by ``get_data``.
+    """
+    logger.info(f"Getting data for year {year}...")
+    if network_path == snakemake.input.networks[0]:
+        # already processed in the parent process
+        n = networks[0]
+    else:
+        model_year = int(network_path[-7:-3])
+        n = load_network(network_path)
+        n = process_postnetworks(n, n_start, model_year, snakemake, costs)
+    return get_data(
+        n,
+        industry_demand,
+        energy_totals,
+        sector_ratios,
+        industry_production,
+        costs,
+        "DE",
+        year=year,
+        n_base=networks[0],
+        version=config["version"],
+        scenario=snakemake.wildcards.run,
+    )
+
+
 if __name__ == "__main__":
     if "snakemake" not in globals():
         snakemake = mock_snakemake(
@@ -5399,9 +5607,16 @@ if __name__ == "__main__":
     ]
 
     # Load data
-    _networks = [pypsa.Network(fn) for fn in snakemake.input.networks]
+    # Only the first planning horizon is kept in memory, because the
+    # variables of later horizons are compared against it. The other
+    # networks are loaded and evaluated one at a time in get_horizon_data.
+    n_start = load_network(
+        snakemake.input.networks[0],
+        components=["Bus", "Carrier", "Line", "Link"],
+        series=[],
+    )
 
-    nhours = _networks[0].snapshot_weightings.generators.sum()
+    nhours = n_start.snapshot_weightings.generators.sum()
     nyears = nhours / 8760
 
     costs = list(
@@ -5418,13 +5633,21 @@ if __name__ == "__main__":
     modelyears = [fn[-7:-3] for fn in snakemake.input.networks]
     # Hack the transmission projects
     networks = [
-        process_postnetworks(n.copy(), _networks[0], int(my), snakemake, c)
-        for n, my, c in zip(_networks, modelyears, costs)
+        process_postnetworks(
+            load_network(snakemake.input.networks[0]),
+            n_start,
+            int(modelyears[0]),
+            snakemake,
+            costs[0],
+        )
     ]
+    # The base-year CAPEX of later horizons is computed from the annuities
+    # of the first horizon, which get_system_cost only adds to its own copy
+    add_system_cost_rows(networks[0])
 
     if "debug" == "debug":  # For debugging
         var = pd.Series()
-        idx = -1
+        idx = 0
         n = networks[idx]
         c = costs[idx]
         _industry_demand = industry_demands[idx]
@@ -5441,23 +5664,27 @@ if __name__ == "__main__":
             "nice_names": False,
         }
 
-    yearly_dfs = []
-    for i, year in enumerate(planning_horizons):
-        print(f"Getting data for year {year}...")
-        yearly_dfs.append(
-            get_data(
-                networks[i],
-                industry_demands[i],
-                energy_totals,
-                sector_ratios[i],
-                industry_production[i],
-                costs[i],
-                "DE",
-                year=year,
-                version=config["version"],
-                scenario=snakemake.wildcards.run,
-            )
+    horizons = [
+        (
+            snakemake.input.networks[i],
+            costs[i],
+            industry_demands[i],
+            energy_totals,
+            sector_ratios[i],
+            industry_production[i],
+            year,
         )
+        for i, year in enumerate(planning_horizons)
+    ]
+    processes = min(snakemake.threads, len(horizons))
+    # workers read the reference networks and snakemake, config_industry and
+    # var2unit from the globals of this script, which only forked processes
+    # inherit
+    if processes > 1 and "fork" in mp.get_all_start_methods():
+        with mp.get_context("fork").Pool(processes) as pool:
+            yearly_dfs = pool.starmap(get_horizon_data, horizons, chunksize=1)
+    else:
+        yearly_dfs = [get_horizon_data(*args) for args in horizons]
 
     df = reduce(
         lambda left, right: pd.merge(
@@ -3,7 +3,6 @@ import logging
 import geopandas as gpd
 import numpy as np
 import pandas as pd
-import pypsa
 from shapely.geometry import Point
 
 from mods import (
@@ -11,7 +10,13 @@ from mods import (
     unravel_electricity_base_load,
     unravel_gas_import_and_production,
 )
-from scripts._helpers import configure_logging, mock_snakemake, sanitize_custom_columns
+from scripts._helpers import (
+    configure_logging,
+    export_network,
+    load_network,
+    mock_snakemake,
+    sanitize_custom_columns,
+)
 from scripts.add_electricity import load_costs
 from scripts.prepare_sector_network import lossy_bidirectional_links
 
@@ -1276,7 +1281,7 @@ if __name__ == "__main__":
     configure_logging(snakemake)
     logger.info("Adding PyPSA-DE specific functionality")
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
     nhours = n.snapshot_weightings.generators.sum()
     nyears = nhours / 8760
 
@@ -1354,4 +1359,8 @@ if __name__ == "__main__":
             n, snakemake.input.austrian_transmission_capacities
         )
 
-    n.export_to_netcdf(snakemake.output.network)
+    export_network(
+        n,
+        snakemake.output.network,
+        intern_profiles=snakemake.config["run"]["intern_profiles"],
+    )
@@ -12,13 +12,12 @@ import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import pypsa
 from export_ariadne_variables import process_postnetworks
 from matplotlib.patches import Patch
 from matplotlib.ticker import FuncFormatter
 from pypsa.plot import add_legend_circles, add_legend_lines, add_legend_patches
 
-from scripts._helpers import configure_logging, mock_snakemake
+from scripts._helpers import configure_logging, load_network, mock_snakemake
 from scripts.add_electricity import load_costs
 from scripts.make_summary import assign_locations
 
@@ -2815,7 +2814,7 @@ if __name__ == "__main__":
     ).round(5)
 
     # Load data
-    _networks = [pypsa.Network(fn) for fn in snakemake.input.networks]
+    _networks = [load_network(fn) for fn in snakemake.input.networks]
     modelyears = [fn[-7:-3] for fn in snakemake.input.networks]
 
     # Hack the transmission projects
@@ -32,6 +32,7 @@ import os
 import pathlib
 import re
 import sys
+import tempfile
 from functools import partial
 from typing import Any
 
@@ -43,12 +44,15 @@ import xarray as xr
 import yaml
 from pypsa.descriptors import get_activity_mask
 from pypsa.descriptors import get_switchable_as_dense as get_as_dense
+from pypsa.optimization.optimize import OptimizationAccessor
 
-from scripts._benchmark import memory_logger
+from scripts._benchmark import memory_logger, phase_hooks
 from scripts._helpers import (
     PYPSA_V1,
     configure_logging,
+    export_network,
     get,
+    load_network,
     set_scenario_config,
     update_config_from_wildcards,
 )
@@ -56,6 +60,15 @@ from scripts._helpers import (
 logger = logging.getLogger(__name__)
 pypsa.pf.logger.setLevel(logging.WARNING)
 
+# functions marking the phases of the optimization in the memory profile
+OPTIMIZATION_PHASES = {
+    "model build": [(OptimizationAccessor, "create_model")],
+    "solver": [(linopy.Model, "solve")],
+    "solution assignment": [(OptimizationAccessor, "assign_solution")],
+    "duals assignment": [(OptimizationAccessor, "assign_duals")],
+    "post-processing": [(OptimizationAccessor, "post_processing")],
+}
+
 
 class ObjectiveValueError(Exception):
     pass
@@ -1265,6 +1278,247 @@ def check_objective_value(n: pypsa.Network, solving: dict) -> None:
             )
 
 
+# branch flows are stored as p0 in the network, but named s or p in the model
+WARM_START_ATTRIBUTE_ALIASES = {
+    "Line": {"s": "p0"},
+    "Transformer": {"s": "p0"},
+    "Link": {"p": "p0"},
+}
+
+
+def _previous_values(n_p: pypsa.Network, c: str, attr: str) -> pd.DataFrame | None:
+    """
+    Return the optimised values of a model variable from a solved network.
+
+    Parameters
+    ----------
+    n_p : pypsa.Network
+        The solved network of the previous planning horizon.
+    c : str
+        The component name, e.g. "Generator".
+    attr : str
+        The model variable attribute, e.g. "p" or "p_nom".
+
+    Returns
+    -------
+    pd.DataFrame | None
+        Time series with snapshots as index, a single row for
+        nominal attributes, or None if the attribute is not available.
+    """
+    if c not in n_p.all_components:
+        return None
+    attr = WARM_START_ATTRIBUTE_ALIASES.get(c, {}).get(attr, attr)
+    dynamic = n_p.dynamic(c)
+    if attr in dynamic and not dynamic[attr].empty:
+        return dynamic[attr]
+    static = n_p.static(c)
+    if f"{attr}_opt" in static:
+        return static[f"{attr}_opt"].to_frame().T
+    return None
+
+
+def _map_component_names(names: pd.Index, previous: pd.Index) -> pd.Index:
+    """
+    Map component names to names in the previous planning horizon.
+
+    Names are matched exactly first. Assets built in the current
+    planning horizon (e.g. "DE0 0 solar-2035") fall back to the latest
+    asset with the same name but another build year suffix (e.g.
+    "DE0 0 solar-2030").
+
+    Parameters
+    ----------
+    names : pd.Index
+        The component names in the current model.
+    previous : pd.Index
+        The component names in the previous network.
+
+    Returns
+    -------
+    pd.Index
+        The matching previous names, or NaN if there is no match.
+    """
+    year_suffix = r"-\d{4}$"
+    latest = pd.Series(
+        previous, index=previous.str.replace(year_suffix, "", regex=True)
+    )
+    latest = latest.sort_values().groupby(level=0).last()
+    fallback = names.str.replace(year_suffix, "", regex=True).map(latest)
+    return pd.Index(np.where(names.isin(previous), names, fallback))
+
+
+def map_previous_solution(n: pypsa.Network, n_p: pypsa.Network) -> pd.Series:
+    """
+    Map the previous planning horizon's solution onto the model variables.
+
+    Variables are matched by component, attribute and component name.
+    Time dependent variables are matched by snapshot position and only
+    if both networks have the same number of snapshots.
+
+    Parameters
+    ----------
+    n : pypsa.Network
+        The network with a created, but not solved, model.
+    n_p : pypsa.Network
+        The solved network of the previous planning horizon.
+
+    Returns
+    -------
+    pd.Series
+        Start values indexed by the model variable labels.
+    """
+    same_snapshots = len(n.snapshots) == len(n_p.snapshots)
+    start_values = []
+    for name, variable in n.model.variables.items():
+        c, _, attr = name.partition("-")
+        previous = _previous_values(n_p, c, attr)
+        labels = variable.labels
+        component_dims = [d for d in labels.dims if d != "snapshot"]
+        if previous is None or len(component_dims) != 1:
+            continue
+        if "snapshot" in labels.dims and not same_snapshots:
+            continue
+
+        labels = labels.transpose(..., component_dims[0]).to_pandas()
+        if isinstance(labels, pd.Series):  # nominal attributes
+            labels = labels.to_frame().T
+        names = _map_component_names(labels.columns, previous.columns)
+        values = previous.reindex(columns=names).to_numpy()
+        if "snapshot" not in variable.labels.dims:
+            values = values[-1:]
+
+        labels = labels.to_numpy()
+        mask = (labels != -1) & np.isfinite(values)
+        start_values.append(pd.Series(values[mask], index=labels[mask]))
+
+    if not start_values:
+        return pd.Series(dtype=float)
+    return pd.concat(start_values).sort_index()
+
+
+def write_warm_start_file(
+    n: pypsa.Network, start_values: pd.Series, solver_name: str, file_path: str
+) -> bool:
+    """
+    Write start values to a solution file the solver reads via linopy.
+
+    Variables are named by their labels (e.g. "x42"), as in the
+    problem files written by linopy.
+
+    Parameters
+    ----------
+    n : pypsa.Network
+        The network with a created model.
+    start_values : pd.Series
+        Start values indexed by the model variable labels.
+    solver_name : str
+        The solver name.
+    file_path : str
+        The path of the solution file.
+
+    Returns
+    -------
+    bool
+        Whether a start file was written for the solver.
+    """
+    if solver_name == "highs":
+        # HiGHS expects values for every column
+        labels = np.concatenate(
+            [v.labels.values.ravel() for _, v in n.model.variables.items()]
+        )
+        labels = np.sort(labels[labels != -1])
+        values = start_values.reindex(labels, fill_value=0.0)
+        header = (
+            "Model status\nUnknown\n\n# Primal solution values\nFeasible\n"
+            f"Objective 0\n# Columns {len(values)}\n"
+        )
+        footer = "# Rows 0\n"
+    elif solver_name == "gurobi":
+        values = start_values
+        header, footer = "# Solution start values\n", ""
+    else:
+        logger.warning(f"Warm start is not supported for solver '{solver_name}'.")
+        return False
+
+    with open(file_path, "w") as fh:
+        fh.write(header)
+        fh.writelines(f"x{label} {value}\n" for label, value in values.items())
+        fh.write(footer)
+    return True
+
+
+def optimize_with_warm_start(
+    n: pypsa.Network,
+    n_p: pypsa.Network,
+    min_coverage: float,
+    **kwargs,
+) -> tuple[str, str]:
+    """
+    Optimize the network starting from the previous horizon's solution.
+
+    Creates the model and applies the extra functionality like
+    ``n.optimize()``. Then, maps the previous solution onto the
+    model variables and passes it to the solver as a start vector.
+    Falls back to a cold start, if the share of seeded variables is
+    lower than ``min_coverage``.
+
+    Parameters
+    ----------
+    n : pypsa.Network
+        The network to optimize.
+    n_p : pypsa.Network
+        The solved network of the previous planning horizon.
+    min_coverage : float
+        The minimum share of seeded variables to use the start vector.
+    **kwargs
+        Keyword arguments as passed to ``n.optimize()``.
+
+    Returns
+    -------
+    status : str
+        Solution status
+    condition : str
+        Termination condition
+    """
+    extra_functionality = kwargs.pop("extra_functionality", None)
+    model_kwargs = kwargs.pop("model_kwargs", {})
+    n.optimize.create_model(
+        multi_investment_periods=kwargs.pop("multi_investment_periods", False),
+        transmission_losses=kwargs.pop("transmission_losses", 0),
+        linearized_unit_commitment=kwargs.pop("linearized_unit_commitment", False),
+        **model_kwargs,
+    )
+    if extra_functionality:
+        extra_functionality(n, n.snapshots)
+
+    start_values = map_previous_solution(n, n_p)
+    coverage = len(start_values) / n.model.nvars if n.model.nvars else 0.0
+    logger.info(
+        f"Warm start seeds {len(start_values)} of {n.model.nvars} variables "
+        f"({coverage:.1%}) from the previous planning horizon."
+    )
+
+    solver_dir = model_kwargs.get("solver_dir") or None
+    fd, warmstart_fn = tempfile.mkstemp(
+        suffix=".sol", prefix="warmstart-", dir=solver_dir
+    )
+    os.close(fd)
+    try:
+        if coverage < min_coverage:
+            logger.info(
+                f"Warm start coverage is below {min_coverage:.0%}. "
+                "Solving from a cold start."
+            )
+        elif write_warm_start_file(
+            n, start_values, kwargs["solver_name"], warmstart_fn
+        ):
+            kwargs["warmstart_fn"] = warmstart_fn
+        return n.optimize.solve_model(**kwargs)
+    finally:
+        if not kwargs.get("keep_files"):
+            os.remove(warmstart_fn)
+
+
 def solve_network(
     n: pypsa.Network,
     config: dict,
@@ -1272,6 +1526,7 @@ def solve_network(
     solving: dict,
     rule_name: str | None = None,
     planning_horizons: str | None = None,
+    n_p: pypsa.Network | None = None,
     **kwargs,
 ) -> None:
     """
@@ -1291,6 +1546,9 @@ def solve_network(
         Name of the snakemake rule being executed
     planning_horizons : str, optional
             The current planning horizon year or None in perfect foresight
+    n_p : pypsa.Network, optional
+        The solved network of the previous planning horizon used to
+        warm start the solver in myopic foresight
     **kwargs
         Additional keyword arguments passed to the solver
 
@@ -1349,6 +1607,11 @@ def solve_network(
         kwargs["overlap"] = cf_solving.get("overlap", 0)
         n.optimize.optimize_with_rolling_horizon(**kwargs)
         status, condition = "", ""
+    elif skip_iterations and n_p is not None:
+        warm_start = cf_solving.get("warm_start", {})
+        status, condition = optimize_with_warm_start(
+            n, n_p, min_coverage=warm_start.get("min_coverage", 0.5), **kwargs
+        )
     elif skip_iterations:
         status, condition = n.optimize(**kwargs)
     else:
@@ -1407,9 +1670,14 @@ if __name__ == "__main__":
 
     np.random.seed(solve_opts.get("seed", 123))
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
     planning_horizons = snakemake.wildcards.get("planning_horizons", None)
 
+    n_p = None
+    if snakemake.input.get("network_p"):
+        logger.info(f"Warm start from the file {snakemake.input.network_p}")
+        n_p = load_network(snakemake.input.network_p)
+
     prepare_network(
         n,
         solve_opts=snakemake.params.solving["options"],
@@ -1423,22 +1691,35 @@ if __name__ == "__main__":
         "mem_logging_frequency", 30
     )
     with memory_logger(
-        filename=getattr(snakemake.log, "memory", None), interval=logging_frequency
+        filename=getattr(snakemake.log, "memory", None),
+        interval=logging_frequency,
+        phases_filename=snakemake.log.get("memory_phases"),
     ) as mem:
-        solve_network(
-            n,
-            config=snakemake.config,
-            params=snakemake.params,
-            solving=snakemake.params.solving,
-            planning_horizons=planning_horizons,
-            rule_name=snakemake.rule,
-            log_fn=snakemake.log.solver,
-        )
+        phases = OPTIMIZATION_PHASES | {
+            "extra functionality": [(sys.modules[__name__], "extra_functionality")]
+        }
+        with phase_hooks(mem, phases):
+            solve_network(
+                n,
+                config=snakemake.config,
+                params=snakemake.params,
+                solving=snakemake.params.solving,
+                planning_horizons=planning_horizons,
+                rule_name=snakemake.rule,
+                n_p=n_p,
+                log_fn=snakemake.log.solver,
+            )
 
-    logger.info(f"Maximum memory usage: {mem.mem_usage}")
+        n.meta = dict(snakemake.config, **dict(wildcards=dict(snakemake.wildcards)))
+        with mem.phase("export"):
+            export_network(
+                n,
+                snakemake.output.network,
+                intern_profiles=snakemake.config["run"]["intern_profiles"],
+                export_profile=snakemake.params.solving["export"],
+            )
 
-    n.meta = dict(snakemake.config, **dict(wildcards=dict(snakemake.wildcards)))
-    n.export_to_netcdf(snakemake.output.network)
+    logger.info(f"Maximum memory usage: {mem.mem_usage}")
 
     with open(snakemake.output.config, "w") as file:
         yaml.dump(
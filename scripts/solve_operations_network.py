@@ -9,10 +9,10 @@ previous capacity expansion in rule :mod:`solve_network`.
 import logging
 
 import numpy as np
-import pypsa
 
 from scripts._helpers import (
     configure_logging,
+    load_network,
     set_scenario_config,
     update_config_from_wildcards,
 )
@@ -42,7 +42,7 @@ if __name__ == "__main__":
 
     np.random.seed(solve_opts.get("seed", 123))
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
 
     n.optimize.fix_optimal_capacities()
     n = prepare_network(n, solve_opts, config=snakemake.config)
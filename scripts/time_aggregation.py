@@ -12,7 +12,10 @@ rule only computes said aggregation scheme; aggregation of time-varying network
 data is done in ``prepare_sector_network.py``.
 """
 
+import hashlib
 import logging
+import os
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -28,6 +31,174 @@ from scripts._helpers import (
 
 logger = logging.getLogger(__name__)
 
+
+def get_timeseries(
+    n: pypsa.Network,
+    hourly_heat_demand_total: str | None = None,
+    solar_thermal_total: str | None = None,
+    dtype: type = float,
+) -> pd.DataFrame:
+    """
+    Collect all time-dependent data normalised by their annual maximum.
+
+    Parameters
+    ----------
+    n : pypsa.Network
+        Network with the time-varying component data.
+    hourly_heat_demand_total : str, optional
+        Path to the hourly heat demand NetCDF file.
+    solar_thermal_total : str, optional
+        Path to the solar thermal profile NetCDF file.
+    dtype : type, default float
+        Data type of the returned profiles.
+
+    Returns
+    -------
+    pd.DataFrame
+        Normalised profiles with snapshots as index and a flat integer
+        column index.
+    """
+    # sort components for a stable column order across runs
+    dfs = [
+        pnl
+        for c in n.iterate_components(sorted(n.all_components))
+        for attr, pnl in c.pnl.items()
+        if not pnl.empty and attr != "e_min_pu"
+    ]
+    for file_path in [hourly_heat_demand_total, solar_thermal_total]:
+        if file_path:
+            dfs.append(xr.open_dataset(file_path).to_dataframe().unstack(level=1))
+    df = pd.concat(dfs, axis=1, ignore_index=True)
+
+    values = df.to_numpy(dtype=dtype, copy=True)
+    annual_max = np.fmax.reduce(values, axis=0)
+    annual_max[annual_max == 0] = 1
+    values /= annual_max
+
+    return pd.DataFrame(values, index=df.index)
+
+
+def deduplicate_timeseries(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Drop identical profiles and weight the remaining ones by their count.
+
+    Many profiles are copied across nodes. Since tsam scales each profile
+    by its weight and segments with Ward linkage on squared distances,
+    weighting a unique profile with the square root of its count yields
+    the same segmentation as clustering all copies.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Normalised profiles as returned by ``get_timeseries``.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.Series]
+        The unique profiles in order of first occurrence and their weights.
+    """
+    columns = np.ascontiguousarray(df.to_numpy().T)
+    keys = columns.view(np.dtype((np.void, columns.itemsize * columns.shape[1])))
+    _, first, counts = np.unique(keys.ravel(), return_index=True, return_counts=True)
+    order = np.argsort(first)
+    df = df.iloc[:, first[order]]
+    weights = pd.Series(np.sqrt(counts[order]), index=df.columns)
+
+    logger.info(f"Deduplicated {len(columns)} profiles to {len(weights)} profiles")
+
+    return df, weights
+
+
+def get_fingerprint(
+    df: pd.DataFrame, segments: int, weights: pd.Series | None = None
+) -> str:
+    """
+    Return a hash of the normalised profiles and segmentation settings.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Normalised profiles.
+    segments : int
+        Number of segments.
+    weights : pd.Series, optional
+        Profile weights passed to tsam.
+
+    Returns
+    -------
+    str
+        The hexadecimal fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{df.shape}-{df.dtypes.iloc[0]}-{segments}".encode())
+    digest.update(pd.util.hash_pandas_object(df.index, index=False).to_numpy())
+    digest.update(np.ascontiguousarray(df.to_numpy()))
+    if weights is not None:
+        digest.update(weights.to_numpy())
+    return digest.hexdigest()
+
+
+def get_segment_durations(
+    df: pd.DataFrame,
+    segments: int,
+    solver_name: str,
+    weights: pd.Series | None = None,
+    cache_dir: str | None = None,
+) -> np.ndarray:
+    """
+    Determine the duration of representative segments with tsam.
+
+    If a cache directory is given, the segment durations are looked up by
+    the fingerprint of the profiles and stored after a cache miss, so that
+    runs with the same inputs skip the segmentation.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Normalised profiles.
+    segments : int
+        Number of segments.
+    solver_name : str
+        Solver passed to tsam.
+    weights : pd.Series, optional
+        Profile weights passed to tsam.
+    cache_dir : str, optional
+        Directory with cached segment durations.
+
+    Returns
+    -------
+    np.ndarray
+        Number of snapshots in each consecutive segment.
+    """
+    if cache_dir:
+        file_path = Path(cache_dir, f"{get_fingerprint(df, segments, weights)}.csv")
+        if file_path.exists():
+            logger.info(f"Reuse cached segmentation {file_path}")
+            return np.loadtxt(file_path, dtype=int, ndmin=1)
+
+    weight_dict = {} if weights is None else weights[weights != 1].to_dict()
+    agg = tsam.TimeSeriesAggregation(
+        df,
+        hoursPerPeriod=len(df),
+        noTypicalPeriods=1,
+        noSegments=segments,
+        segmentation=True,
+        solver=solver_name,
+        weightDict=weight_dict,
+    )
+    agg = agg.createTypicalPeriods()
+    durations = agg.index.get_level_values("Segment Duration").to_numpy(dtype=int)
+
+    if cache_dir:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # parallel runs may write the same segmentation at the same time
+        tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+        np.savetxt(tmp_path, durations, fmt="%d")
+        os.replace(tmp_path, file_path)
+
+    return durations
+
+
 if __name__ == "__main__":
     if "snakemake" not in globals():
         from scripts._helpers import mock_snakemake
@@ -92,47 +263,28 @@ if __name__ == "__main__":
     elif isinstance(resolution, str) and "seg" in resolution.lower():
         segments = int(resolution[:-3])
         logger.info(f"Use temporal segmentation with {segments} segments")
+        segmentation = snakemake.params.segmentation
 
-        # Get all time-dependent data
-        dfs = [
-            pnl
-            for c in n.iterate_components()
-            for attr, pnl in c.pnl.items()
-            if not pnl.empty and attr != "e_min_pu"
-        ]
-        if snakemake.input.hourly_heat_demand_total:
-            dfs.append(
-                xr.open_dataset(snakemake.input.hourly_heat_demand_total)
-                .to_dataframe()
-                .unstack(level=1)
-            )
-        if snakemake.input.solar_thermal_total:
-            dfs.append(
-                xr.open_dataset(snakemake.input.solar_thermal_total)
-                .to_dataframe()
-                .unstack(level=1)
-            )
-        df = pd.concat(dfs, axis=1)
-
-        # Reset columns to flat index
-        df = df.T.reset_index(drop=True).T
-
-        # Normalise all time-dependent data
-        annual_max = df.max().replace(0, 1)
-        df = df.div(annual_max, level=0)
-
-        # Get representative segments
-        agg = tsam.TimeSeriesAggregation(
-            df,
-            hoursPerPeriod=len(df),
-            noTypicalPeriods=1,
-            noSegments=segments,
-            segmentation=True,
-            solver=snakemake.params.solver_name,
+        timeseries = get_timeseries(
+            n,
+            snakemake.input.hourly_heat_demand_total,
+            snakemake.input.solar_thermal_total,
+            dtype=np.float32 if segmentation["deduplicate"] else float,
+        )
+        weights = None
+        cache_dir = (
+            snakemake.params.segmentation_cache if segmentation["cache"] else None
         )
-        agg = agg.createTypicalPeriods()
+        if segmentation["deduplicate"]:
+            timeseries, weights = deduplicate_timeseries(timeseries)
 
-        weightings = agg.index.get_level_values("Segment Duration")
+        weightings = get_segment_durations(
+            timeseries,
+            segments,
+            snakemake.params.solver_name,
+            weights=weights,
+            cache_dir=cache_dir,
+        )
         offsets = np.insert(np.cumsum(weightings[:-1]), 0, 0)
         snapshot_weightings = n.snapshot_weightings.loc[n.snapshots[offsets]].mul(
             weightings, axis=0
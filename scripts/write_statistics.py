@@ -6,10 +6,9 @@
 import logging
 
 import pandas as pd
-import pypsa
 from pypsa.statistics import get_carrier, get_country_and_carrier
 
-from scripts._helpers import configure_logging
+from scripts._helpers import configure_logging, load_network
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +43,7 @@ if __name__ == "__main__":
     configure_logging(snakemake)
     config = snakemake.config
 
-    n = pypsa.Network(snakemake.input.network)
+    n = load_network(snakemake.input.network)
     kwargs = {"nice_names": False}
 
     wildcards = dict(snakemake.wildcards)
@@ -29,6 +29,50 @@ def ac_dc_network():
     return pypsa.examples.ac_dc_meshed(from_master=True)
 
 
+@pytest.fixture(scope="function")
+def dispatch_network():
+    """Produce a network with power, heat and gas buses and a fixed dispatch."""
+    n = pypsa.Network()
+    n.set_snapshots(range(2))
+    n.add(
+        "Bus",
+        ["AT0 0", "AT0 0 heat", "AT0 0 gas"],
+        carrier=["AC", "heat", "gas"],
+        location="AT",
+    )
+    n.add(
+        "Generator",
+        ["AT0 0 solar", "AT0 0 wind", "AT0 0 gas"],
+        bus=["AT0 0", "AT0 0", "AT0 0 gas"],
+        carrier=["solar", "wind", "gas"],
+    )
+    n.add(
+        "Load", ["AT0 0 el", "AT0 0 heat"], bus=["AT0 0", "AT0 0 heat"], carrier="load"
+    )
+    n.add("Link", "AT0 0 hp", bus0="AT0 0", bus1="AT0 0 heat", carrier="heat pump")
+    n.add(
+        "Link",
+        "AT0 0 CHP",
+        bus0="AT0 0 gas",
+        bus1="AT0 0",
+        bus2="AT0 0 heat",
+        carrier="CHP",
+    )
+    n.add("Store", "AT0 0 battery", bus="AT0 0", carrier="battery")
+    n.generators_t.p["AT0 0 solar"] = [3.0, 1.0]
+    n.generators_t.p["AT0 0 wind"] = [2.0, 4.0]
+    n.generators_t.p["AT0 0 gas"] = [2.0, 0.0]
+    n.links_t.p0["AT0 0 hp"] = [1.0, 2.0]
+    n.links_t.p1["AT0 0 hp"] = [-3.0, -6.0]
+    n.links_t.p0["AT0 0 CHP"] = [2.0, 0.0]
+    n.links_t.p1["AT0 0 CHP"] = [-1.0, 0.0]
+    n.links_t.p2["AT0 0 CHP"] = [-0.5, 0.0]
+    n.stores_t.p["AT0 0 battery"] = [-1.0, 1.0]
+    n.loads_t.p["AT0 0 el"] = [5.0, 4.0]
+    n.loads_t.p["AT0 0 heat"] = [3.5, 6.0]
+    return n
+
+
 @pytest.fixture(scope="session")
 def config():
     path_config = pathlib.Path(pathlib.Path.cwd(), "config", "config.default.yaml")
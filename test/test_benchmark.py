@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the phase-aware memory logging in scripts/_benchmark.py.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from scripts._benchmark import _get_peak_memory, memory_logger, phase_hooks
+
+
+class Model:
+    def build(self):
+        self.data = np.ones(1_000_000)
+
+    def solve(self):
+        # a peak between two measurements
+        return np.ones(50_000_000).sum()
+
+
+def test_memory_logger_phases(tmp_path):
+    model = Model()
+    build, solve = Model.build, Model.solve
+    phases_fn = tmp_path / "memory.json"
+
+    with memory_logger(
+        filename=tmp_path / "memory.log", interval=60, phases_filename=phases_fn
+    ) as mem:
+        with phase_hooks(
+            mem, {"build": [(Model, "build")], "solve": [(Model, "solve")]}
+        ):
+            for _ in range(2):
+                model.build()
+                model.solve()
+        with mem.phase("export"):
+            pass
+
+    assert Model.build is build and Model.solve is solve
+    assert [p["name"] for p in mem.phases] == ["build", "solve"] * 2 + ["export"]
+    assert all(p["duration"] >= 0 for p in mem.phases)
+
+    with open(phases_fn) as f:
+        summary = json.load(f)
+    phases = {p["name"]: p for p in summary["phases"]}
+    assert list(phases) == ["build", "solve", "export"]
+    assert phases["solve"]["calls"] == 2
+    assert summary["peak"] == max(p["peak"] for p in mem.phases)
+    assert summary["peak"] > 0
+
+
+def test_memory_logger_phases_on_failure(tmp_path):
+    phases_fn = tmp_path / "memory.json"
+
+    with pytest.raises(ValueError):
+        with memory_logger(interval=60, phases_filename=phases_fn) as mem:
+            mem.set_phase("load")
+            mem.set_phase("build")
+            raise ValueError("build failed")
+
+    assert [p["name"] for p in mem.phases] == ["load", "build"]
+    with open(phases_fn) as f:
+        summary = json.load(f)
+    assert [p["name"] for p in summary["phases"]] == ["load", "build"]
+
+
+@pytest.mark.skipif(
+    _get_peak_memory(os.getpid()) is None, reason="requires /proc/<pid>/status"
+)
+def test_memory_logger_keeps_high_water_mark(tmp_path):
+    np.ones(20_000_000).sum()  # raise the high-water mark
+    peak = _get_peak_memory(os.getpid())
+
+    with memory_logger(interval=0.01) as mem:
+        for name in ["build", "solve", "export"]:
+            with mem.phase(name):
+                pass
+
+    assert _get_peak_memory(os.getpid()) >= peak
@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the resource classes, average distances and cached conversions in
+scripts/build_renewable_profiles.py.
+"""
+
+import atlite
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+import xarray as xr
+from atlite.gis import ExclusionContainer
+
+from scripts.build_renewable_profiles import (
+    convert_with_cache,
+    get_average_distance,
+    get_class_masks,
+    get_class_regions,
+    get_distance_matrix,
+    get_indicator_matrix,
+)
+
+
+@pytest.fixture
+def cutout(tmp_path):
+    ds = xr.Dataset(
+        coords={
+            "x": np.arange(5, 10, 0.25),
+            "y": np.arange(45, 49, 0.25),
+            "time": pd.date_range("2013-01-01", periods=1),
+        },
+        attrs={"module": "era5", "dx": 0.25, "dy": 0.25},
+    )
+    return atlite.Cutout(tmp_path / "cutout.nc", data=ds)
+
+
+@pytest.fixture
+def regions():
+    return gpd.GeoSeries(
+        [shapely.Point(6, 46).buffer(0.9), shapely.box(7.1, 45.3, 9.6, 48.2)],
+        index=pd.Index(["DE0 0", "DE0 1"], name="bus"),
+        crs=4326,
+    )
+
+
+def test_indicator_matrix(cutout, regions):
+    expected = np.ceil(cutout.availabilitymatrix(regions, ExclusionContainer()))
+    expected = expected.values.reshape(len(regions), -1)
+
+    indicator = get_indicator_matrix(cutout, regions, chunksize=1)
+
+    assert indicator.shape == expected.shape
+    np.testing.assert_array_equal(indicator.toarray(), expected)
+
+
+def test_class_masks_and_regions(cutout, regions):
+    nbins = 3
+    indicator = cutout.indicatormatrix(regions).tocsr()
+    capacity_factor = np.random.default_rng(0).random(indicator.shape[1])
+
+    class_masks = get_class_masks(capacity_factor, indicator, nbins)
+
+    assert class_masks.shape == (len(regions) * nbins, indicator.shape[1])
+    # every touched cell falls into exactly one class of its region
+    per_bus = class_masks.toarray().reshape(len(regions), nbins, -1).sum(axis=1)
+    np.testing.assert_array_equal(per_bus, indicator.toarray() > 0)
+    # classes are ordered by capacity factor
+    for i in range(len(regions)):
+        cf = [capacity_factor[class_masks[i * nbins + b].indices] for b in range(nbins)]
+        assert cf[0].max() < cf[1].min() and cf[1].max() < cf[2].min()
+
+    class_regions = get_class_regions(class_masks, regions, nbins, cutout)
+
+    assert class_regions.index.names == ["bus", "bin"]
+    assert len(class_regions) == len(regions) * nbins
+    for bus, region in regions.items():
+        union = class_regions.loc[bus].union_all()
+        assert union.symmetric_difference(region).area == pytest.approx(0, abs=1e-9)
+    grid = cutout.grid
+    for (bus, bin_id), geometry in class_regions.items():
+        i = regions.index.get_loc(bus) * nbins + bin_id
+        cells = grid.iloc[class_masks[i].indices].intersection(regions[bus])
+        assert geometry.area == pytest.approx(cells.union_all().area)
+
+
+def test_average_distance(tmp_path, cutout, regions):
+    nbins = 2
+    indicator = cutout.indicatormatrix(regions).tocsr()
+    capacity_factor = np.random.default_rng(0).random(indicator.shape[1])
+    class_masks = get_class_masks(capacity_factor, indicator, nbins)
+    layoutmatrix = class_masks.multiply(capacity_factor).tocsr()
+    coords = cutout.grid.representative_point().to_crs(3035)
+    points = regions.representative_point().to_crs(3035)
+
+    distances = get_distance_matrix(coords, points, indicator, cache_dir=tmp_path)
+    cached = get_distance_matrix(coords, points, indicator, cache_dir=tmp_path)
+
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    assert (cached != distances).nnz == 0
+    average_distance = get_average_distance(layoutmatrix, distances, nbins)
+    for i, (bus, point) in enumerate(points.items()):
+        for bin_id in range(nbins):
+            row = layoutmatrix[i * nbins + bin_id]
+            expected = coords.iloc[row.indices].distance(point).div(1e3)
+            expected = np.average(expected, weights=row.data)
+            assert average_distance[i * nbins + bin_id] == pytest.approx(expected)
+
+
+def test_convert_with_cache(tmp_path):
+    rng = np.random.default_rng(0)
+    x, y = np.arange(5, 6, 0.25), np.arange(45, 46, 0.25)
+    shape = (24, len(y), len(x))
+    ds = xr.Dataset(
+        {
+            "wnd100m": (("time", "y", "x"), 25 * rng.random(shape, dtype="float32")),
+            "roughness": (("y", "x"), 0.01 + rng.random(shape[1:], dtype="float32")),
+        },
+        coords={
+            "time": pd.date_range("2013-01-01", periods=24, freq="h"),
+            "x": x,
+            "y": y,
+            "lon": ("x", x),
+            "lat": ("y", y),
+        },
+        attrs={"module": "era5", "dx": 0.25, "dy": 0.25},
+    )
+    fn = str(tmp_path / "cutout.nc")
+    ds.to_netcdf(fn)
+    cutout = atlite.Cutout(fn)
+    resource = {"turbine": "Vestas_V112_3MW", "add_cutout_windspeed": True}
+
+    expected = cutout.wind(capacity_factor=True, **resource)
+    for _ in range(2):
+        result = convert_with_cache(
+            cutout, [fn], "wind", capacity_factor=True, **resource
+        )
+        xr.testing.assert_allclose(result, expected)
+
+    assert len(list((tmp_path / "cutout_conversions").glob("wind_speed_*.nc"))) == 1
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+from evals.cache import StatisticsCache
+
+
+@pytest.fixture
+def network_file(tmp_path):
+    """Produce a fake network file to hash."""
+    file_path = tmp_path / "base_s_adm__none_2030.nc"
+    file_path.write_bytes(b"network")
+    return file_path
+
+
+@pytest.mark.parametrize(
+    "statistic",
+    [
+        pd.Series(
+            [1.0, 2.0],
+            index=pd.MultiIndex.from_tuples(
+                [("AT", "gas"), ("DE", "H2")], names=["location", "carrier"]
+            ),
+            name="supply",
+        ),
+        pd.DataFrame(
+            [[1.0, 2.0]],
+            index=pd.Index(["AT"], name="location"),
+            columns=pd.date_range("2030", periods=2, freq="h", name="snapshot"),
+        ),
+    ],
+)
+def test_statistics_cache_roundtrip(tmp_path, network_file, statistic):
+    statistic.attrs["unit"] = "MWh"
+    cache = StatisticsCache(tmp_path / "cache")
+    key = cache.key(network_file, "supply", {"groupby": ["location", "carrier"]})
+    assert cache.get(key) is None
+
+    cache.put(key, statistic)
+    cached = cache.get(key)
+    if isinstance(statistic, pd.Series):
+        pd.testing.assert_series_equal(cached, statistic)
+    else:
+        pd.testing.assert_frame_equal(cached, statistic, check_freq=False)
+    assert cached.attrs == {"unit": "MWh"}
+
+
+def test_statistics_cache_key(tmp_path, network_file):
+    cache = StatisticsCache(tmp_path / "cache")
+    key = cache.key(network_file, "supply", {"a": 1, "b": {"x", "y"}})
+    assert key == cache.key(network_file, "supply", {"b": {"y", "x"}, "a": 1})
+    assert key != cache.key(network_file, "withdrawal", {"a": 1, "b": {"x", "y"}})
+
+    network_file.write_bytes(b"modified network")
+    assert key != cache.key(network_file, "supply", {"a": 1, "b": {"x", "y"}})
+
+
+def test_statistics_cache_eviction(tmp_path, network_file):
+    cache = StatisticsCache(tmp_path / "cache", max_size=0)
+    statistic = pd.Series([1.0], index=pd.Index(["AT"], name="location"))
+    cache.put(cache.key(network_file, "supply", {}), statistic)
+    assert cache.size() == 0
+
+    cache.max_size = 1
+    cache.put(cache.key(network_file, "supply", {}), statistic)
+    assert cache.size() > 0
+    assert cache.clear() == 1
+    assert cache.size() == 0
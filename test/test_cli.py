@@ -0,0 +1,101 @@
+import logging
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+import evals.fileio
+import evals.views
+from evals.cache import StatisticsCache, get_cache_directory
+from evals.cli import cli, run_eval
+from evals.fileio import Exporter
+from evals.statistic import STATISTICS_MEMO
+
+
+class UnpicklableError(Exception):
+    """An exception that cannot be sent between processes."""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.callback = lambda: None
+
+
+def view_passing(result_path, networks, config):
+    pass
+
+
+def view_failing(result_path, networks, config):
+    raise ValueError("view failed")
+
+
+def view_unpicklable(result_path, networks, config):
+    raise UnpicklableError("view failed")
+
+
+@pytest.fixture
+def views(monkeypatch):
+    """Register fake views and skip loading networks and view configs."""
+    functions = [view_passing, view_failing, view_unpicklable]
+    for func in functions:
+        monkeypatch.setattr(evals.views, func.__name__, func, raising=False)
+    monkeypatch.setattr(evals.views, "__all__", [f.__name__ for f in functions])
+    monkeypatch.setattr(evals.fileio, "read_networks", lambda *args, **kwargs: {})
+    monkeypatch.setattr(evals.fileio, "read_views_config", lambda *args: {})
+    monkeypatch.setattr(STATISTICS_MEMO, "max_size", STATISTICS_MEMO.max_size)
+    monkeypatch.setattr(Exporter, "plot_processes", Exporter.plot_processes)
+
+
+def invoke(tmp_path, jobs, *args):
+    names = ["-n", "view_passing", "-n", "view_failing"]
+    return CliRunner().invoke(
+        run_eval, [str(tmp_path), *names, "--jobs", str(jobs), *args]
+    )
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_eval_jobs(tmp_path, views, caplog, jobs):
+    with caplog.at_level(logging.INFO, logger="evals.cli"):
+        result = invoke(tmp_path, jobs)
+
+    assert result.exit_code == 1
+    assert "Finished view_passing." in caplog.messages
+    assert "Finished view_failing." in caplog.messages
+    summary = caplog.messages[-1]
+    assert "Number of Errors: 1 ['view_failing']" in summary
+    assert "view_passing" in summary.split("Timings per evaluation:")[1]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_eval_jobs_fail_fast(tmp_path, views, jobs):
+    result = invoke(tmp_path, jobs, "--fail_fast", "true")
+
+    assert result.exit_code == 1
+    assert isinstance(result.exception, ValueError)
+    assert str(result.exception) == "view failed"
+
+
+def test_run_eval_jobs_unpicklable_error(tmp_path, views):
+    names = ["-n", "view_passing", "-n", "view_unpicklable"]
+    args = [str(tmp_path), *names, "--jobs", "2", "--fail_fast", "true"]
+    result = CliRunner().invoke(run_eval, args)
+
+    assert result.exit_code == 1
+    assert isinstance(result.exception, RuntimeError)
+    assert str(result.exception) == "UnpicklableError: view failed"
+
+
+def test_cli_commands(tmp_path, views, caplog):
+    runner = CliRunner()
+    with caplog.at_level(logging.INFO, logger="evals.cli"):
+        result = runner.invoke(cli, ["run_eval", str(tmp_path), "-n", "view_passing"])
+
+    assert result.exit_code == 0
+    assert "Finished view_passing." in caplog.messages
+
+    cache = StatisticsCache(get_cache_directory(tmp_path))
+    cache.put("key", pd.Series([1.0], index=pd.Index(["AT"], name="location")))
+    assert cache.size() > 0
+    result = runner.invoke(cli, ["clear_cache", str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert cache.size() == 0
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the tiled availability computation in
+scripts/determine_availability_matrix.py.
+"""
+
+import atlite
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import rasterio
+import shapely
+import xarray as xr
+from rasterio.transform import Affine
+
+from scripts.determine_availability_matrix import compute_availability, get_tile_size
+
+RES = 1000
+
+
+@pytest.fixture
+def cutout(tmp_path):
+    ds = xr.Dataset(
+        coords={
+            "x": np.arange(5, 8, 0.25),
+            "y": np.arange(45, 47, 0.25),
+            "time": pd.date_range("2013-01-01", periods=1),
+        },
+        attrs={"module": "era5", "dx": 0.25, "dy": 0.25},
+    )
+    return atlite.Cutout(tmp_path / "cutout.nc", data=ds)
+
+
+@pytest.fixture
+def raster(tmp_path):
+    bounds = gpd.GeoSeries([shapely.box(4.5, 44.5, 8.5, 47.5)], crs=4326)
+    left, bottom, right, top = bounds.to_crs(3035).total_bounds // RES * RES
+    height, width = int((top - bottom) // RES), int((right - left) // RES)
+    rng = np.random.default_rng(0)
+    data = rng.integers(1, 4, (height // 4 + 1, width // 4 + 1), dtype="uint8")
+    data = np.kron(data, np.ones((4, 4), dtype="uint8"))[:height, :width]
+    fn = tmp_path / "landcover.tif"
+    with rasterio.open(
+        fn,
+        "w",
+        driver="GTiff",
+        height=height,
+        width=width,
+        count=1,
+        dtype="uint8",
+        crs="EPSG:3035",
+        transform=Affine(RES, 0, left, 0, -RES, top),
+        nodata=0,
+    ) as dst:
+        dst.write(data, 1)
+    return str(fn)
+
+
+def get_excluder(raster):
+    excluder = atlite.ExclusionContainer(crs=3035, res=RES)
+    excluder.add_raster(raster, codes=[1], invert=True)
+    excluder.add_raster(raster, codes=[3], buffer=2 * RES)
+    return excluder
+
+
+def test_compute_availability(tmp_path, cutout, raster):
+    regions = gpd.GeoSeries(
+        [shapely.Point(6, 46).buffer(0.7), shapely.box(6.6, 45.2, 7.9, 46.8)],
+        index=pd.Index(["DE0 0", "DE0 1"], name="bus"),
+        crs=4326,
+    )
+    expected = cutout.availabilitymatrix(regions, get_excluder(raster))
+    expected = expected.values.reshape(len(regions), -1)
+
+    # a tiny memory budget forces tiles of single grid cells
+    excluder = get_excluder(raster)
+    assert get_tile_size(cutout, excluder, mem_mb=0.1) == 1
+    checkpoints = tmp_path / "checkpoints"
+    availability = compute_availability(
+        cutout, regions, excluder, mem_mb=0.1, checkpoint_dir=checkpoints
+    )
+
+    assert availability.shape == expected.shape
+    # up to the resampling tolerance of GDAL on the different windows
+    np.testing.assert_allclose(availability.toarray(), expected, atol=5e-3)
+    assert len(list(checkpoints.glob("*.npz"))) == 2
+
+    # unchanged regions are read from the checkpoints
+    regions = pd.concat(
+        [
+            regions,
+            gpd.GeoSeries([shapely.Point(5.5, 45.5).buffer(0.2)], ["DE0 2"], crs=4326),
+        ]
+    )
+    resumed = compute_availability(
+        cutout, regions, get_excluder(raster), mem_mb=0.1, checkpoint_dir=checkpoints
+    )
+    assert len(list(checkpoints.glob("*.npz"))) == 3
+    assert (resumed[:2] != availability).nnz == 0
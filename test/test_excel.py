@@ -0,0 +1,67 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from evals.configs import ExcelConfig
+from evals.excel import export_excel_countries, export_excel_regions_at
+
+VIEW_CONFIG = {"categories": {"solar": "Solar", "gas boiler": "Gas"}, "name": "Cap"}
+
+
+@pytest.fixture
+def metric():
+    """Return a small capacity metric for national and regional nodes."""
+    idx = pd.MultiIndex.from_product(
+        [
+            ["2030", "2040"],
+            ["Austria", "Germany", "Lower Austria (AT)", "Vienna (AT)"],
+            ["solar", "gas boiler"],
+            ["AC"],
+        ],
+        names=["year", "location", "carrier", "bus_carrier"],
+    )
+    df = pd.DataFrame({"Capacity (GW)": range(len(idx))}, index=idx, dtype=float)
+    df.columns.name = "metric"
+    df.attrs = {"name": "Capacity", "unit": "GW"}
+    return df * 1.00001
+
+
+def _write(tmp_path, export_function, df, streaming):
+    cfg = ExcelConfig(streaming=streaming)
+    file_path = tmp_path / f"{export_function.__name__}_{streaming}.xlsx"
+    if streaming:
+        engine_kwargs = {"options": {"constant_memory": True}}
+        writer = pd.ExcelWriter(file_path, "xlsxwriter", engine_kwargs=engine_kwargs)
+    else:
+        writer = pd.ExcelWriter(file_path, engine="openpyxl")
+    with writer:
+        export_function(df, writer, cfg, VIEW_CONFIG)
+    return openpyxl.load_workbook(file_path)
+
+
+@pytest.mark.parametrize(
+    "export_function", [export_excel_countries, export_excel_regions_at]
+)
+def test_streaming_excel_layout(tmp_path, metric, export_function):
+    expected = _write(tmp_path, export_function, metric, streaming=False)
+    result = _write(tmp_path, export_function, metric, streaming=True)
+
+    assert result.sheetnames == expected.sheetnames
+    for sheet_name in expected.sheetnames:
+        if sheet_name == "Categories":
+            continue
+        ws_expected, ws_result = expected[sheet_name], result[sheet_name]
+        assert list(ws_result.values) == list(ws_expected.values)
+        assert set(ws_result.merged_cells.ranges) == set(
+            ws_expected.merged_cells.ranges
+        )
+        assert round(ws_result.column_dimensions["A"].width) >= round(
+            ws_expected.column_dimensions["A"].width
+        )
+        assert [c.anchor._from.row for c in ws_result._charts] == [
+            c.anchor._from.row for c in ws_expected._charts
+        ]
+        for chart_result, chart_expected in zip(ws_result._charts, ws_expected._charts):
+            assert [s.val.numRef.f.replace("'", "") for s in chart_result.series] == [
+                s.val.numRef.f.replace("'", "") for s in chart_expected.series
+            ]
@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the statistics context in scripts/pypsa-de/export_ariadne_variables.py.
+"""
+
+import importlib.util
+import pathlib
+
+import pandas as pd
+import pytest
+
+path = (
+    pathlib.Path(__file__).parents[1] / "scripts/pypsa-de/export_ariadne_variables.py"
+)
+spec = importlib.util.spec_from_file_location("export_ariadne_variables", path)
+export_ariadne_variables = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(export_ariadne_variables)
+
+
+def assert_statistics_equal(result, expected):
+    assert type(result) is type(expected)
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(result.sort_index(), expected.sort_index())
+    else:
+        pd.testing.assert_series_equal(result.sort_index(), expected.sort_index())
+
+
+@pytest.mark.parametrize("direction", ["supply", "withdrawal"])
+@pytest.mark.parametrize("drop_zero", [None, True, False])
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        # argument combinations of the export
+        {"groupby": ["name", "bus", "carrier"], "at_port": True, "nice_names": False},
+        {"groupby": ["bus", "carrier"], "at_port": True, "nice_names": False},
+        {"groupby": ["name", "bus", "carrier"], "nice_names": False},
+    ],
+)
+@pytest.mark.parametrize("bus_carrier", ["AC", ["AC", "heat"], "gas"])
+def test_statistics_context(
+    dispatch_network, direction, drop_zero, kwargs, bus_carrier
+):
+    n = dispatch_network
+    context = export_ariadne_variables.StatisticsContext(n)
+
+    result = getattr(context, direction)(
+        bus_carrier=bus_carrier, drop_zero=drop_zero, **kwargs
+    )
+    expected = getattr(n.statistics, direction)(
+        bus_carrier=bus_carrier, drop_zero=drop_zero, **kwargs
+    )
+
+    assert direction in context.balances
+    assert_statistics_equal(result, expected)
+
+
+@pytest.mark.parametrize("direction", ["supply", "withdrawal"])
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"groupby": ["name", "bus", "carrier"], "aggregate_time": False},
+        {"groupby": ["bus", "carrier"], "at_port": True, "nice_names": False},
+        {"groupby": "carrier", "bus_carrier": "AC", "nice_names": False},
+        {"comps": "Link", "groupby": ["bus", "carrier"], "bus_carrier": "AC"},
+    ],
+)
+def test_statistics_context_fallback(dispatch_network, direction, kwargs):
+    n = dispatch_network
+    if "aggregate_time" in kwargs:
+        kwargs["bus_carrier"] = "AC"
+    context = export_ariadne_variables.StatisticsContext(n)
+
+    result = getattr(context, direction)(**kwargs)
+    expected = getattr(n.statistics, direction)(**kwargs)
+
+    assert context.balances == {}
+    assert_statistics_equal(result, expected)
@@ -0,0 +1,141 @@
+import multiprocessing as mp
+import re
+
+import pandas as pd
+import pypsa
+import pytest
+
+from evals.fileio import (
+    Exporter,
+    NetworkCollection,
+    read_columnar,
+    read_networks,
+    write_columnar,
+)
+
+
+@pytest.fixture(scope="module")
+def result_path(tmp_path_factory):
+    """Write small networks for three planning horizons."""
+    result_path = tmp_path_factory.mktemp("results")
+    network_path = result_path / "networks"
+    network_path.mkdir()
+    for year in ("2030", "2040", "2050"):
+        n = pypsa.Network()
+        n.add("Bus", "AT0 0", location="AT")
+        n.export_to_netcdf(network_path / f"base_s_adm__none_{year}.nc")
+    return result_path
+
+
+def test_read_networks_lazy(result_path):
+    networks = read_networks(result_path)
+    assert isinstance(networks, NetworkCollection)
+    assert sorted(networks) == ["2030", "2040", "2050"]
+    assert not any(networks.is_loaded(year) for year in networks)
+
+    n = networks["2040"]
+    assert n.year == "2040"
+    assert networks.is_loaded("2040")
+    assert not networks.is_loaded("2030")
+    assert networks["2040"] is n
+    assert next(reversed(networks)) == list(networks)[-1]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_read_networks_prefetch(result_path, processes):
+    networks = read_networks(result_path, prefetch=True, processes=processes)
+    assert all(networks.is_loaded(year) for year in networks)
+    for year, n in networks.items():
+        assert n.year == year
+        assert n.name == f"PyPSA-AT Network {year}"
+        assert "AT0 0" in n.buses.index
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+@pytest.mark.parametrize(
+    "columns",
+    [
+        pd.Index(["Capacity (GW)"], name="metric"),
+        pd.date_range("2030-01-01", periods=3, freq="h", name="snapshots"),
+    ],
+)
+def test_columnar_roundtrip(tmp_path, file_format, columns):
+    idx = pd.MultiIndex.from_tuples(
+        [("2030", "Austria", "solar", "AC"), ("2040", "Germany", "gas", "CH4")],
+        names=["year", "location", "carrier", "bus_carrier"],
+    )
+    df = pd.DataFrame(1.5, index=idx, columns=columns)
+    df.attrs = {"name": "Capacity", "unit": "GW"}
+
+    file_path = tmp_path / f"metric.{file_format}"
+    write_columnar(df, file_path, file_format)
+    result = read_columnar(file_path)
+
+    assert all(
+        isinstance(lvl.dtype, pd.CategoricalDtype) for lvl in result.index.levels
+    )
+    pd.testing.assert_frame_equal(
+        result, df, check_index_type=False, check_categorical=False
+    )
+    assert result.attrs == df.attrs
+
+
+def export_plotly(exporter, output_path):
+    (output_path / "HTML").mkdir(parents=True)
+    (output_path / "JSON").mkdir()
+    exporter.export_plotly(output_path)
+
+
+def read_charts(output_path):
+    """Read the written files with the random plotly div ids masked."""
+    uuid = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+    return {
+        p.relative_to(output_path): uuid.sub("", p.read_text(encoding="utf-8"))
+        for p in output_path.rglob("*")
+        if p.is_file()
+    }
+
+
+@pytest.fixture
+def exporter():
+    """An exporter with capacities for three countries."""
+    from evals.plots import ESMBarChart
+
+    idx = pd.MultiIndex.from_product(
+        [["2030", "2040"], ["AT0 0", "DE0 0", "FR0 0"], ["solar", "wind"], ["AC"]],
+        names=["year", "location", "carrier", "bus_carrier"],
+    )
+    statistic = pd.Series(range(1, len(idx) + 1), index=idx, dtype=float)
+    statistic.attrs = {"name": "Capacity", "unit": "GW"}
+    view_config = {
+        "name": "Capacity",
+        "unit": "GW",
+        "file_name": "capacity_{location}",
+        "cutoff": 0.0001,
+        "legend_order": ["Solar", "Wind"],
+        "categories": {"solar": "Solar", "wind": "Wind"},
+    }
+    exporter = Exporter([statistic], view_config, keep_regions=("AT", "DE", "FR"))
+    exporter.defaults.plotly.chart = ESMBarChart
+    return exporter
+
+
+def test_export_plotly_in_pool(tmp_path, exporter):
+    export_plotly(exporter, tmp_path / "serial")
+    exporter.plot_processes = 2
+    export_plotly(exporter, tmp_path / "pool")
+
+    expected = read_charts(tmp_path / "serial")
+    assert len([p for p in expected if p.suffix == ".html"]) > 1
+    assert len([p for p in expected if p.suffix == ".js"]) == 1
+    assert read_charts(tmp_path / "pool") == expected
+
+
+def test_export_plotly_in_daemonic_worker(tmp_path, exporter):
+    export_plotly(exporter, tmp_path / "serial")
+    exporter.plot_processes = 2
+    # parallel evaluations render charts in daemonic pool workers
+    with mp.get_context("fork").Pool(1) as pool:
+        pool.apply(export_plotly, (exporter, tmp_path / "worker"))
+
+    assert read_charts(tmp_path / "worker") == read_charts(tmp_path / "serial")
@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the network and availability matrix input and output helpers in
+scripts/_helpers.py.
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+import xarray as xr
+
+from scripts._helpers import (
+    INTERNED_PREFIX,
+    export_network,
+    load_availability_matrix,
+    load_network,
+    to_sparse_availability,
+)
+
+
+@pytest.fixture
+def network():
+    snapshots = pd.date_range("2019-01-01", periods=24, freq="h")
+    profile = np.linspace(0, 1, len(snapshots))
+    loads = ["DE0 0 residential heat", "DE0 0 services heat", "AT0 0 heat"]
+    p_set = pd.DataFrame(
+        np.column_stack([profile, profile, profile[::-1]]), snapshots, loads
+    )
+    n = pypsa.Network(snapshots=snapshots)
+    n.add("Bus", ["DE0 0", "AT0 0"])
+    n.add("Load", loads, bus=["DE0 0", "DE0 0", "AT0 0"], p_set=p_set)
+    n.add("Generator", "DE0 0 solar", bus="DE0 0", p_max_pu=profile)
+    return n
+
+
+@pytest.mark.parametrize("intern_profiles", [False, True])
+def test_export_network_roundtrip(tmp_path, network, intern_profiles):
+    file_path = tmp_path / "network.nc"
+
+    export_network(network, file_path, intern_profiles=intern_profiles)
+    result = load_network(file_path)
+
+    pd.testing.assert_frame_equal(
+        result.loads_t.p_set, network.loads_t.p_set, check_names=False, check_freq=False
+    )
+    pd.testing.assert_frame_equal(
+        result.generators_t.p_max_pu,
+        network.generators_t.p_max_pu,
+        check_names=False,
+        check_freq=False,
+    )
+
+
+def test_export_network_interns_duplicates(tmp_path, network):
+    file_path = tmp_path / "network.nc"
+
+    export_network(network, file_path, intern_profiles=True)
+
+    with xr.open_dataset(file_path) as ds:
+        assert ds["loads_t_p_set"].shape == (24, 2)
+        assert ds[INTERNED_PREFIX + "loads_t_p_set"].values.tolist() == [
+            "DE0 0 residential heat",
+            "DE0 0 residential heat",
+            "AT0 0 heat",
+        ]
+        assert INTERNED_PREFIX + "generators_t_p_max_pu" not in ds
+
+
+def test_export_network_profile(tmp_path, network):
+    network.generators_t.p = network.generators_t.p_max_pu * 2
+    network.generators_t.mu_upper = network.generators_t.p_max_pu
+    export_profile = {
+        "float32": True,
+        "compression": {"zlib": True, "complevel": 1},
+        "chunks": {"snapshots": 6},
+        "skip": ["*_t_mu_*"],
+    }
+    file_path = tmp_path / "network.nc"
+
+    export_network(network, file_path, export_profile=export_profile)
+
+    with xr.open_dataset(file_path) as ds:
+        assert ds["generators_t_p"].dtype == np.float32
+        assert ds["generators_t_p_max_pu"].dtype == np.float64
+        assert "generators_t_mu_upper" not in ds
+        assert ds["loads_t_p_set"].encoding["chunksizes"] == (6, 3)
+    result = load_network(file_path)
+    np.testing.assert_allclose(result.generators_t.p, network.generators_t.p)
+
+
+@pytest.mark.parametrize("intern_profiles", [False, True])
+def test_load_network_selection(tmp_path, network, intern_profiles):
+    network.generators_t.p = network.generators_t.p_max_pu * 2
+    file_path = tmp_path / "network.nc"
+    export_network(network, file_path, intern_profiles=intern_profiles)
+
+    result = load_network(file_path, components=["Bus", "Generator"], series=["p"])
+
+    assert result.buses.index.equals(network.buses.index)
+    assert result.loads.empty
+    assert result.generators_t.p_max_pu.empty
+    pd.testing.assert_frame_equal(
+        result.generators_t.p,
+        network.generators_t.p,
+        check_names=False,
+        check_freq=False,
+    )
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_load_availability_matrix(tmp_path, sparse):
+    rng = np.random.default_rng(0)
+    values = rng.random((3, 4, 5)) * (rng.random((3, 4, 5)) < 0.3)
+    availability = xr.DataArray(
+        values,
+        {"bus": ["DE0 0", "DE0 1", "AT0 0"], "y": np.arange(4.0), "x": np.arange(5.0)},
+        ("bus", "y", "x"),
+    )
+    file_path = tmp_path / "availability.nc"
+    if sparse:
+        availability = to_sparse_availability(availability)
+    availability.to_netcdf(file_path)
+
+    matrix, buses = load_availability_matrix(file_path)
+
+    assert buses.tolist() == ["DE0 0", "DE0 1", "AT0 0"]
+    assert matrix.shape == (3, 20)
+    np.testing.assert_array_equal(matrix.toarray(), values.reshape(3, -1))
+    if sparse:
+        assert matrix.nnz == np.count_nonzero(values)
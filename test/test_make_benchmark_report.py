@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the benchmark report in scripts/make_benchmark_report.py.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from scripts.make_benchmark_report import (
+    build_table,
+    get_critical_path,
+    get_sizing,
+    to_html,
+)
+
+HEADER = (
+    "s\th:m:s\tmax_rss\tmax_vms\tmax_uss\tmax_pss\tio_in\tio_out\tmean_load\tcpu_time"
+)
+EXTENDED = "\tjobid\trule_name\twildcards\tparams\tthreads\tcpu_usage\tresources\tinput_size_mb"
+
+
+@pytest.fixture
+def benchmarks(tmp_path):
+    def write(name, end, s, max_rss, cpu_time, extended=None):
+        fn = tmp_path / name
+        row = f"{s}\t-\t{max_rss}\t0\t0\t0\t0\t0\t0\t{cpu_time}"
+        if extended is None:
+            fn.write_text(f"{HEADER}\n{row}\n")
+        else:
+            fn.write_text(f"{HEADER}{EXTENDED}\n{row}\t{extended}\n")
+        os.utime(fn, (end, end))
+        return str(fn)
+
+    memory = tmp_path / "solve_memory.log"
+    memory.write_text("MEM 100.0 0.0\nMEM 9000.0 1.0\nMEM 200.0 2.0\n")
+    return {
+        write("build", 100, 100, 500, 100): {"rule": "build", "wildcards": {}},
+        write(
+            "prepare_2030",
+            220,
+            100,
+            3000,
+            100,
+            "1\tprepare\t{'year': '2030'}\t{}\t4\t0\t{'mem_mb': 10000}\t{}",
+        ): {"rule": "prepare", "wildcards": {"year": "2030"}},
+        write(
+            "solve_2030",
+            1000,
+            700,
+            8000,
+            2800,
+            "2\tsolve\t{'year': '2030'}\t{}\t4\t0\t{'mem_mb': 8000}\t{}",
+        ): {"rule": "solve", "wildcards": {"year": "2030"}, "memory": str(memory)},
+        write("plot", 150, 20, 100, 20): {"rule": "plot", "wildcards": {}},
+    }
+
+
+def test_build_table(benchmarks):
+    df = build_table(benchmarks)
+
+    assert df["rule"].tolist() == ["build", "prepare", "plot", "solve"]
+    solve = df.set_index("rule").loc["solve"]
+    assert solve["wildcards"] == "year=2030"
+    assert solve["memory_log_max"] == 9000.0
+    assert solve["cpu_efficiency"] == 1.0
+    assert solve["memory_usage"] == 9000.0 / 8000
+    assert np.isnan(df.set_index("rule").at["build", "threads"])
+
+    critical_path = get_critical_path(df)
+    assert critical_path["rule"].tolist() == ["build", "prepare", "solve"]
+
+    sizing = get_sizing(df)
+    assert sizing.at["solve", "assessment"] == "memory undersized"
+    assert sizing.at["solve", "suggested_mem_mb"] == 10800
+    assert sizing.at["prepare", "assessment"] == "memory oversized, threads oversized"
+    assert sizing.at["prepare", "suggested_threads"] == 1
+    assert sizing.at["build", "assessment"] == ""
+
+    html = to_html(df, sizing, critical_path, "Benchmarks")
+    assert "<h2>Critical path</h2>" in html
@@ -0,0 +1,44 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the temporal aggregation in scripts/prepare_sector_network.py.
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+
+from scripts.prepare_sector_network import set_temporal_aggregation
+
+
+def test_set_temporal_aggregation(tmp_path):
+    snapshots = pd.date_range("2019-01-01", periods=8, freq="h")
+    n = pypsa.Network(snapshots=snapshots)
+    n.add("Bus", "bus")
+    p_max_pu = pd.DataFrame(
+        {"g1": [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, np.nan], "g2": 1.0},
+        index=snapshots,
+    )
+    n.add("Generator", ["g1", "g2"], bus="bus", p_max_pu=p_max_pu)
+    e_max_pu = pd.Series([1.0, 0.5, 0.8, 0.9, 0.2, 1.0, 0.7, 0.6], index=snapshots)
+    n.add("Store", "s", bus="bus", e_max_pu=e_max_pu, e_min_pu=e_max_pu / 2)
+
+    weightings = pd.DataFrame(
+        {"objective": [3.0, 1.0, 4.0], "stores": [3.0, 1.0, 4.0]},
+        index=pd.Index(snapshots[[0, 3, 4]], name="snapshot"),
+    )
+    weightings["generators"] = weightings["objective"]
+    file_path = tmp_path / "snapshot_weightings.csv"
+    weightings.to_csv(file_path)
+
+    result = set_temporal_aggregation(n, "custom", file_path)
+
+    assert result is n
+    assert n.snapshots.equals(weightings.index)
+    pd.testing.assert_frame_equal(n.snapshot_weightings, weightings)
+    np.testing.assert_allclose(n.generators_t.p_max_pu["g1"], [1.0, 3.0, 5.0])
+    np.testing.assert_allclose(n.generators_t.p_max_pu["g2"], [1.0, 1.0, 1.0])
+    np.testing.assert_allclose(n.stores_t.e_max_pu["s"], [0.5, 0.9, 0.2])
+    np.testing.assert_allclose(n.stores_t.e_min_pu["s"], [0.5, 0.45, 0.5])
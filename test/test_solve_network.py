@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the warm start functionalities of scripts/solve_network.py.
+"""
+
+import pandas as pd
+import pypsa
+import pytest
+
+from scripts.solve_network import (
+    _map_component_names,
+    map_previous_solution,
+    write_warm_start_file,
+)
+
+
+def _network(year):
+    n = pypsa.Network()
+    n.set_snapshots(pd.date_range(f"{year}-01-01", periods=3, freq="h"))
+    n.add("Bus", ["DE0 0", "AT0 0"], carrier="AC")
+    n.add("Load", "DE0 0 load", bus="DE0 0", p_set=5.0)
+    n.add(
+        "Generator",
+        [f"DE0 0 solar-{year}", f"AT0 0 gas-{year}"],
+        bus=["DE0 0", "AT0 0"],
+        p_nom_extendable=True,
+        capital_cost=1.0,
+    )
+    n.add("Link", "AT0 0-DE0 0", bus0="AT0 0", bus1="DE0 0", p_nom=10.0)
+    return n
+
+
+def test_map_component_names():
+    previous = pd.Index(["DE0 0 solar-2025", "DE0 0 solar-2030", "AT0 0 line"])
+    names = pd.Index(["DE0 0 solar-2030", "DE0 0 solar-2035", "AT0 0 line", "new"])
+
+    result = _map_component_names(names, previous)
+
+    expected = ["DE0 0 solar-2030", "DE0 0 solar-2030", "AT0 0 line"]
+    assert result[:3].tolist() == expected
+    assert pd.isna(result[3])
+
+
+def test_map_previous_solution(tmp_path):
+    n_p = _network(2030)
+    n_p.generators["p_nom_opt"] = [4.0, 2.0]
+    n_p.generators_t.p = pd.DataFrame(
+        [[1.0, 2.0]] * 3, index=n_p.snapshots, columns=n_p.generators.index
+    )
+    n_p.links_t.p0 = pd.DataFrame(
+        [[3.0]] * 3, index=n_p.snapshots, columns=n_p.links.index
+    )
+
+    n = _network(2035)
+    n.optimize.create_model()
+    start_values = map_previous_solution(n, n_p)
+
+    assert len(start_values) == n.model.nvars
+    p_nom = n.model.variables["Generator-p_nom"].labels.to_pandas()
+    assert start_values[p_nom["DE0 0 solar-2035"]] == 4.0
+    link_p = n.model.variables["Link-p"].labels.to_pandas()
+    assert (start_values[link_p["AT0 0-DE0 0"]] == 3.0).all()
+
+    file_path = tmp_path / "start.sol"
+    assert write_warm_start_file(n, start_values, "highs", file_path)
+    assert f"# Columns {n.model.nvars}" in file_path.read_text()
+    assert not write_warm_start_file(n, start_values, "glpk", file_path)
+
+
+@pytest.mark.parametrize("periods", [2, 4])
+def test_map_previous_solution_skips_other_snapshots(periods):
+    n_p = _network(2030)
+    n_p.set_snapshots(pd.date_range("2030-01-01", periods=periods, freq="h"))
+    n_p.generators["p_nom_opt"] = [4.0, 2.0]
+
+    n = _network(2035)
+    n.optimize.create_model()
+    start_values = map_previous_solution(n, n_p)
+
+    assert len(start_values) == 2  # only the nominal capacities
@@ -0,0 +1,115 @@
+import pandas as pd
+import pypsa
+import pytest
+
+from evals.statistic import (
+    STATISTICS_MEMO,
+    ESMStatistics,
+    StatisticsMemo,
+    get_location,
+)
+
+
+@pytest.fixture
+def eu_network():
+    """Produce a network with branches connected to EU buses."""
+    n = pypsa.Network()
+    n.add("Bus", ["AT0 0", "DE0 0", "EU"], location=["AT", "DE", "EU"])
+    n.add(
+        "Link",
+        ["AT-DE", "EU-AT", "DE-EU", "EU-EU"],
+        bus0=["AT0 0", "EU", "DE0 0", "EU"],
+        bus1=["DE0 0", "AT0 0", "EU", "EU"],
+    )
+    return n
+
+
+def test_get_location(eu_network):
+    location = get_location(eu_network, "Link")
+    expected = pd.Series(
+        ["AT", "AT", "DE", "EU"],
+        index=pd.Index(["AT-DE", "EU-AT", "DE-EU", "EU-EU"], name="Link"),
+        name="location",
+        dtype=object,
+    )
+    pd.testing.assert_series_equal(location, expected)
+
+    no_avoid = get_location(eu_network, "Link", "0", avoid_eu_locations=False)
+    assert no_avoid.tolist() == ["AT", "EU", "DE", "EU"]
+
+
+def test_get_location_cache_invalidation(eu_network):
+    get_location(eu_network, "Link")
+    eu_network.add("Link", "EU-DE", bus0="EU", bus1="DE0 0")
+    assert get_location(eu_network, "Link")["EU-DE"] == "DE"
+
+    # replaced frames of the same shape, which may reuse the old address
+    buses = eu_network.static("Bus").copy()
+    buses["location"] = ["DE", "AT", "EU"]
+    eu_network.components["Bus"].static = None
+    eu_network.components["Bus"].static = buses.copy()
+    assert get_location(eu_network, "Link")["AT-DE"] == "DE"
+
+
+@pytest.fixture
+def statistic():
+    """Produce a statistic with a known memory footprint."""
+    return pd.Series(
+        [1.0] * 2**16, index=pd.RangeIndex(2**16, name="location")
+    )  # 0.5 MB values + index
+
+
+def test_statistics_memo_lru(statistic):
+    memo = StatisticsMemo(max_size=1)
+    memo.put(("a", "supply"), statistic)
+    assert memo.get(("a", "supply")) is statistic
+
+    memo.put(("b", "supply"), statistic)
+    assert memo.get(("a", "supply")) is None  # evicted
+    assert memo.get(("b", "supply")) is statistic
+
+
+def test_statistics_memo_disabled_and_clear(statistic):
+    memo = StatisticsMemo(max_size=0)
+    memo.put(("a", "supply"), statistic)
+    assert memo.get(("a", "supply")) is None
+
+    memo.max_size = 10
+    memo.put(("a", "supply"), statistic)
+    memo.put(("b", "supply"), statistic)
+    memo.clear("a")
+    assert memo.get(("a", "supply")) is None
+    assert memo.get(("b", "supply")) is statistic
+    memo.clear()
+    assert memo.get(("b", "supply")) is None
+
+
+@pytest.mark.parametrize("statistic", ["supply", "withdrawal", "energy_balance"])
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"bus_carrier": "AC"},
+        {"comps": "Generator"},
+        {"comps": ["Link", "Load"], "bus_carrier": ["AC"]},
+        {"carrier": "heat pump"},
+    ],
+)
+def test_memoized_statistics(tmp_path, dispatch_network, statistic, filters):
+    kwargs = {
+        "groupby": ["location", "carrier", "bus_carrier"],
+        "aggregate_time": "sum",
+    }
+    func = getattr(ESMStatistics(dispatch_network, tmp_path), statistic)
+    max_size = STATISTICS_MEMO.max_size
+    try:
+        STATISTICS_MEMO.max_size = 0
+        expected = func(**kwargs, **filters)
+        STATISTICS_MEMO.max_size = 10
+        func(**kwargs)  # memoize the unfiltered statistic
+        result = func(**kwargs, **filters)
+    finally:
+        STATISTICS_MEMO.max_size = max_size
+        STATISTICS_MEMO.clear()
+
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index())
+    assert result.attrs == expected.attrs
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: Contributors to PyPSA-Eur <https://github.com/pypsa/pypsa-eur>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Tests the temporal segmentation in scripts/time_aggregation.py.
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+import scripts.time_aggregation as time_aggregation
+from scripts.time_aggregation import (
+    deduplicate_timeseries,
+    get_segment_durations,
+    get_timeseries,
+)
+
+
+@pytest.fixture
+def network():
+    snapshots = pd.date_range("2019-01-01", periods=96, freq="h")
+    rng = np.random.default_rng(0)
+    profiles = rng.random((len(snapshots), 3))
+    n = pypsa.Network(snapshots=snapshots)
+    n.add("Bus", "bus")
+    generators = ["g0", "g1", "g2", "g3", "g4"]
+    p_max_pu = pd.DataFrame(profiles[:, [0, 1, 0, 2, 0]], snapshots, generators)
+    n.add("Generator", generators, bus="bus", p_max_pu=p_max_pu)
+    n.add("Load", "load", bus="bus", p_set=pd.Series(profiles[:, 1], snapshots))
+    return n
+
+
+def test_deduplicate_timeseries(network):
+    df = get_timeseries(network, dtype=np.float32)
+
+    result, weights = deduplicate_timeseries(df)
+
+    assert df.shape == (96, 6)
+    assert df.dtypes.eq(np.float32).all()
+    assert result.columns.tolist() == [0, 1, 3]
+    np.testing.assert_allclose(weights, np.sqrt([3, 2, 1]))
+
+
+def test_get_segment_durations(network, tmp_path, monkeypatch):
+    expected = get_segment_durations(get_timeseries(network), 10, "highs")
+    df, weights = deduplicate_timeseries(get_timeseries(network, dtype=np.float32))
+
+    result = get_segment_durations(df, 10, "highs", weights, cache_dir=tmp_path)
+
+    np.testing.assert_array_equal(result, expected)
+    assert result.sum() == 96
+    assert len(list(tmp_path.glob("*.csv"))) == 1
+
+    monkeypatch.delattr(time_aggregation.tsam, "TimeSeriesAggregation")
+    cached = get_segment_durations(df, 10, "highs", weights, cache_dir=tmp_path)
+    np.testing.assert_array_equal(cached, expected)
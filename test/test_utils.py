@@ -6,7 +6,9 @@ from evals.constants import DataModel
 from evals.plots._base import ESMChart
 from evals.plots.timeseries import ESMTimeSeriesChart
 from evals.utils import (
+    add_grid_lines,
     aggregate_locations,
+    align_edge_directions,
     apply_cutoff,
     calculate_cost_annuity,
     expand_to_time_series,
@@ -1261,3 +1263,80 @@ def test_verify_metric_format(df, expected):
 def test_prettify_numer(x, expected):
     result = prettify_number(x)
     assert result == expected
+
+
+def test_align_edge_directions():
+    idx = pd.MultiIndex.from_tuples(
+        [
+            ("IT0 0", "FR0 0", "DC"),
+            ("FR0 0", "IT0 0", "AC"),
+            ("AT0 0", "DE0 0", "AC"),
+            ("DE0 0", "DE0 0", "AC"),
+        ],
+        names=["bus0", "bus1", "carrier"],
+    )
+    ser = pd.Series([1.0, 2.0, 3.0, 4.0], index=idx)
+    ser.attrs["unit"] = "MW"
+
+    result = align_edge_directions(ser)
+
+    expected_idx = pd.MultiIndex.from_tuples(
+        [
+            ("FR0 0", "IT0 0", "DC"),
+            ("FR0 0", "IT0 0", "AC"),
+            ("AT0 0", "DE0 0", "AC"),
+            ("DE0 0", "DE0 0", "AC"),
+        ],
+        names=["bus0", "bus1", "carrier"],
+    )
+    pd.testing.assert_series_equal(result, ser.set_axis(expected_idx))
+    assert result.attrs == {"unit": "MW"}
+
+
+def test_align_edge_directions_large_grid():
+    """Every bus pair has one direction in a 200 node grid."""
+    rng = np.random.default_rng(0)
+    nodes = np.array([f"DE{i} 0" for i in range(200)])
+    bus0 = rng.integers(0, 200, 2000)
+    bus1 = (bus0 + rng.integers(1, 8, 2000)) % 200
+    idx = pd.MultiIndex.from_arrays(
+        [nodes[bus0], nodes[bus1], np.where(bus0 % 2, "AC", "DC")],
+        names=["bus0", "bus1", "carrier"],
+    ).drop_duplicates()
+    df = pd.DataFrame({"value": rng.random(len(idx))}, index=idx)
+
+    result = align_edge_directions(df)
+
+    pairs = result.index.droplevel("carrier").unique()
+    reversed_pairs = pairs.swaplevel()
+    assert not pairs.isin(reversed_pairs).any()
+    pd.testing.assert_series_equal(
+        result["value"].sort_values(), df["value"].sort_values()
+    )
+
+
+def test_add_grid_lines():
+    buses = pd.DataFrame(
+        {
+            "x": [16.4, 11.6, 0.0],
+            "y": [48.2, 48.1, 0.0],
+            "carrier": ["AC", "AC", "H2"],
+        },
+        index=pd.Index(["AT0 0", "DE0 0", "AT0 0 H2"], name="Bus"),
+    )
+    idx = pd.MultiIndex.from_tuples(
+        [("AT0 0", "DE0 0", "AC"), ("DE0 0 ", "AT0 0", "DC")],
+        names=["bus0", "bus1", "carrier"],
+    )
+    ser = pd.Series([1.0, 2.0], index=idx, name="Capacity (MW)")
+
+    result = add_grid_lines(buses, ser)
+
+    assert result["line"].tolist() == [
+        [[48.2, 16.4], [48.1, 11.6]],
+        [[48.1, 11.6], [48.2, 16.4]],
+    ]
+    assert result["Capacity (MW)"].tolist() == [1.0, 2.0]
+
+    with pytest.raises(KeyError, match="AT0 0 H2"):
+        add_grid_lines(buses, ser.rename({"DE0 0": "AT0 0 H2"}, level="bus1"))